@@ -0,0 +1,25 @@
+from fastapi import Request
+
+import database
+
+_READ_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+async def unit_of_work(request: Request):
+    """
+    Run the whole request in one database transaction.
+    Every repository call made by the handler shares the connection and snapshot;
+    the transaction commits once when the handler returns and rolls back if it raises.
+    Write requests hold the database writer from their first statement on.
+    """
+    uow = database.UnitOfWork(write=request.method not in _READ_METHODS)
+    token = database.current_unit_of_work.set(uow)
+    try:
+        yield uow
+    except BaseException:
+        await database.close_unit_of_work(uow, False)
+        raise
+    else:
+        await database.close_unit_of_work(uow, True)
+    finally:
+        database.current_unit_of_work.reset(token)
@@ -0,0 +1,18 @@
+from fastapi import Request, Response
+
+
+def headers(etag: str) -> dict[str, str]:
+    # no-cache: browsers may keep the body but must revalidate it on every use
+    return {"ETag": etag, "Cache-Control": "no-cache"}
+
+
+def not_modified(request: Request, etag: str) -> Response | None:
+    """A 304 Not Modified if the client's If-None-Match already names `etag`, else None."""
+    header = request.headers.get("if-none-match")
+    if header is None:
+        return None
+    # If-None-Match uses the weak comparison: W/"x" matches "x"
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    if etag in candidates or "*" in candidates:
+        return Response(status_code=304, headers=headers(etag))
+    return None
@@ -1,4 +1,5 @@
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from services import material_service
 from models.material import FabricSearchResult
@@ -11,6 +12,11 @@ class FabricSearchRequest(BaseModel):
     source: str  # "tonitex" | "fabricville" | "spool_of_thread" | "fine_fabrics_canada" | "the_fabric_club" | "cleanersupply"
 
 
+class FabricSearchAllRequest(BaseModel):
+    query: str
+    sources: list[str] | None = None  # every store when omitted
+
+
 @router.get("/sources")
 def list_sources():
     """List all available fabric/accessories store sources."""
@@ -27,3 +33,20 @@ def search_fabrics(req: FabricSearchRequest):
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as exc:
         raise HTTPException(status_code=502, detail=str(exc))
+
+
+@router.post("/search-all")
+async def search_all_fabrics(req: FabricSearchAllRequest):
+    """
+    Search every store concurrently, streamed as NDJSON with one line per store as
+    soon as it answers: {"source", "status": "ok", "results": [...]}, or a
+    "timeout"/"error" status with an "error" message. A slow store never holds
+    back the others.
+    """
+    if not req.query.strip():
+        raise HTTPException(status_code=400, detail="Query cannot be empty")
+    try:
+        lines = material_service.search_all(req.query, req.sources)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return StreamingResponse(lines, media_type="application/x-ndjson")
@@ -1,30 +1,35 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
 from services import measurements_service
-from models.measurement import GlobalMeasurementSetCreate, GlobalMeasurementSet
+from models.measurement import GlobalMeasurementSetCreate, GlobalMeasurementSet, MeasurementField
 
 router = APIRouter()
 
 
 @router.get("/", response_model=list[GlobalMeasurementSet])
-def list_global_sets():
-    return measurements_service.list_global_sets()
+async def list_global_sets(
+    field: MeasurementField | None = Query(default=None, description="Only sets with this measurement"),
+    min_value: float | None = None,
+    max_value: float | None = None,
+):
+    """Global measurement sets; with `field`, only those whose value is within [min_value, max_value]."""
+    return await measurements_service.list_global_sets(field, min_value, max_value)
 
 
 @router.post("/", response_model=GlobalMeasurementSet, status_code=201)
-def create_global_set(data: GlobalMeasurementSetCreate):
+async def create_global_set(data: GlobalMeasurementSetCreate):
     measurements = data.measurements.model_dump(exclude_none=True)
-    return measurements_service.add_global_set(data.name, measurements)
+    return await measurements_service.add_global_set(data.name, measurements)
 
 
 @router.patch("/{ms_id}", response_model=GlobalMeasurementSet)
-def update_global_set(ms_id: int, data: GlobalMeasurementSetCreate):
+async def update_global_set(ms_id: int, data: GlobalMeasurementSetCreate):
     measurements = data.measurements.model_dump(exclude_none=True)
-    result = measurements_service.update_global_set(ms_id, data.name, measurements)
+    result = await measurements_service.update_global_set(ms_id, data.name, measurements)
     if not result:
         raise HTTPException(status_code=404, detail="Measurement set not found")
     return result
 
 
 @router.delete("/{ms_id}", status_code=204)
-def delete_global_set(ms_id: int):
-    measurements_service.delete_global_set(ms_id)
+async def delete_global_set(ms_id: int):
+    await measurements_service.delete_global_set(ms_id)
@@ -1,19 +1,13 @@
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
-from scrapers.patterns import simplicity_scraper, mood_scraper, black_snail_scraper, truly_victorian_scraper, laughing_moon_scraper
+from scrapers.patterns import simplicity_scraper, mood_scraper, black_snail_scraper, truly_victorian_scraper
 from scrapers.patterns import generic_scraper
-from models.pattern import PatternSearchResult, PatternDetail
+from models.pattern import PatternSearchResult, PatternDetail, FederatedPatternSearch
+from services import pattern_search_service
+from services.pattern_search_service import SCRAPERS
 
 router = APIRouter()
 
-SCRAPERS = {
-    "simplicity": simplicity_scraper,
-    "mood": mood_scraper,
-    "black_snail": black_snail_scraper,
-    "truly_victorian": truly_victorian_scraper,
-    "laughing_moon": laughing_moon_scraper,
-}
-
 DETAIL_HOSTS = {
     "simplicity.com": simplicity_scraper,
     "blog.moodfabrics.com": mood_scraper,
@@ -35,6 +29,11 @@ class PatternSearchRequest(BaseModel):
     source: str = "simplicity"  # "simplicity" | "mood" | "black_snail" | "truly_victorian"
 
 
+class FederatedPatternSearchRequest(BaseModel):
+    query: str
+    sources: list[str] | None = None  # every source when omitted
+
+
 class FromUrlRequest(BaseModel):
     url: str
 
@@ -47,11 +46,26 @@ def pattern_search(req: PatternSearchRequest):
     if not scraper:
         raise HTTPException(status_code=400, detail=f"Unknown source '{req.source}'. Valid: {list(SCRAPERS)}")
     try:
-        return scraper.search_patterns(req.query)
+        return pattern_search_service.search_source(req.source, req.query)
     except Exception as exc:
         raise HTTPException(status_code=502, detail=str(exc))
 
 
+@router.post("/search/federated", response_model=FederatedPatternSearch)
+async def federated_pattern_search(req: FederatedPatternSearchRequest):
+    """
+    Search every pattern source in parallel within one latency budget. Results come
+    back merged, deduplicated and ranked; `sources` reports each source's status,
+    time taken and whether a hedged retry was sent.
+    """
+    if not req.query.strip():
+        raise HTTPException(status_code=400, detail="Query cannot be empty")
+    try:
+        return await pattern_search_service.search(req.query, req.sources)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
 @router.get("/detail", response_model=PatternDetail)
 def pattern_detail(url: str):
     for host, scraper in DETAIL_HOSTS.items():
@@ -1,75 +1,136 @@
-from fastapi import APIRouter, HTTPException
-from services import project_service, measurements_service
+from typing import Literal
+
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from api import etags
+from services import project_events, project_service
 from models.project import (
     ProjectCreate,
     ProjectUpdate,
+    ProjectClone,
     ProjectStatusUpdate,
     Project,
     ProjectDetail,
-    ProjectPattern,
-    ProjectMaterial,
-    ChecklistItem,
-    ProjectMeasurementSet,
-    GlobalMeasurementSet,
-    ProjectProgressImage,
+    ProjectBatch,
+    ProjectBatchResult,
 )
 
 router = APIRouter()
 
 
 @router.get("/", response_model=list[Project])
-def list_projects():
-    return project_service.list_projects()
+async def list_projects(
+    response: Response,
+    limit: int | None = Query(default=None, ge=1, le=500),
+    cursor: str | None = None,
+    order: Literal["desc", "asc"] = "desc",
+    status: str | None = None,
+    over_budget: bool | None = Query(default=None, description="Only projects with a budget that are (true) or are not (false) over it"),
+    min_budget: float | None = None,
+    max_budget: float | None = None,
+):
+    """
+    Projects ordered by creation date. Pass `limit` to paginate: the next page's
+    cursor comes back in the X-Next-Cursor header, the filtered total in X-Total-Count.
+    """
+    try:
+        page = await project_service.list_projects(
+            limit, cursor, order == "asc", status, over_budget, min_budget, max_budget
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    response.headers["X-Total-Count"] = str(page["total"])
+    if page["next_cursor"]:
+        response.headers["X-Next-Cursor"] = page["next_cursor"]
+    return page["items"]
 
 
 @router.get("/{project_id}", response_model=ProjectDetail)
-def get_project(project_id: int):
-    project = project_service.get_project(project_id)
-    if not project:
+async def get_project(project_id: int, request: Request):
+    etag = project_service.etag(project_id, "detail")
+    if (cached := etags.not_modified(request, etag)) is not None:
+        return cached
+    # The repository returns the aggregate already shaped and serialized as
+    # ProjectDetail, so skip model validation and send it as-is.
+    detail = await project_service.get_project_detail(project_id)
+    if detail is None:
         raise HTTPException(status_code=404, detail="Project not found")
-    return ProjectDetail.model_validate(
-        {
-            **project,
-            "patterns": project_service.get_saved_patterns(project_id),
-            "materials": project_service.get_materials(project_id),
-            "checklist": project_service.get_checklist(project_id),
-            "measurement_sets": project_service.get_measurement_sets(project_id),
-            "global_measurement_sets": measurements_service.get_for_project(project_id),
-            "progress_images": project_service.get_progress_images(project_id),
-        }
+    return Response(content=detail, media_type="application/json", headers=etags.headers(etag))
+
+
+@router.get("/{project_id}/events")
+async def project_events_stream(project_id: int):
+    """
+    Server-Sent Events for every committed write to the project: a `change` event
+    like {"op": "toggle_checklist_item", "project_id": 1, "id": 4} per write, or a
+    single `resync` event when the client fell too far behind and should refetch.
+    """
+    if not await project_service.get_project(project_id):
+        raise HTTPException(status_code=404, detail="Project not found")
+    return StreamingResponse(
+        project_events.stream(project_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
 
 
 @router.post("/", response_model=dict)
-def create_project(data: ProjectCreate):
-    created = project_service.create_project(data.name, data.description, data.budget)
-    if data.global_measurement_set_ids:
-        measurements_service.link_to_project(created["id"], data.global_measurement_set_ids)
+async def create_project(data: ProjectCreate):
+    created = await project_service.create_project(data.name, data.description, data.budget)
+    await project_service.link_global_measurement_sets(created["id"], data.global_measurement_set_ids)
     return created
 
 
+@router.post("/{project_id}/clone", response_model=Project, status_code=201)
+async def clone_project(project_id: int, data: ProjectClone | None = None):
+    """Deep copy of a project, e.g. to reuse it as a template; uploaded files are shared, not copied."""
+    data = data or ProjectClone()
+    clone = await project_service.clone_project(project_id, data.name, data.reset_progress)
+    if clone is None:
+        raise HTTPException(status_code=404, detail="Project not found")
+    return clone
+
+
 @router.patch("/{project_id}", response_model=Project)
-def update_project(project_id: int, data: ProjectUpdate):
-    if not project_service.get_project(project_id):
+async def update_project(project_id: int, data: ProjectUpdate):
+    project = await project_service.update_project(project_id, data.name, data.description, data.budget)
+    if not project:
         raise HTTPException(status_code=404, detail="Project not found")
-    return project_service.update_project(project_id, data.name, data.description, data.budget)
+    return project
 
 
 @router.patch("/{project_id}/status", response_model=Project)
-def update_project_status(project_id: int, data: ProjectStatusUpdate):
-    if not project_service.get_project(project_id):
+async def update_project_status(project_id: int, data: ProjectStatusUpdate):
+    project = await project_service.update_project_status(project_id, data.status)
+    if not project:
         raise HTTPException(status_code=404, detail="Project not found")
-    return project_service.update_project_status(project_id, data.status)
+    return project
 
 
 @router.delete("/{project_id}")
-def delete_project(project_id: int):
-    project_service.delete_project(project_id)
+async def delete_project(project_id: int):
+    await project_service.delete_project(project_id)
     return {"deleted": project_id}
 
 
 @router.delete("/{project_id}/global-measurement-sets/{global_ms_id}", status_code=204)
-def unlink_global_measurement_set(project_id: int, global_ms_id: int):
-    if not project_service.get_project(project_id):
+async def unlink_global_measurement_set(project_id: int, global_ms_id: int):
+    if not await project_service.get_project(project_id):
+        raise HTTPException(status_code=404, detail="Project not found")
+    await project_service.unlink_global_measurement_set(project_id, global_ms_id)
+
+
+@router.post("/{project_id}/batch", response_model=ProjectBatchResult)
+async def apply_batch(project_id: int, data: ProjectBatch):
+    """
+    Add, edit or delete materials, checklist items, patterns and measurement sets in
+    one request and one transaction: either every operation applies or none does.
+    """
+    operations = [op.model_dump() for op in data.operations]
+    try:
+        results = await project_service.apply_batch(project_id, operations)
+    except LookupError as exc:
+        raise HTTPException(status_code=404, detail=str(exc))
+    if results is None:
         raise HTTPException(status_code=404, detail="Project not found")
-    measurements_service.unlink_from_project(project_id, global_ms_id)
+    return {"results": results}
@@ -1,38 +1,43 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
 from services import project_service
-from models.project import ProjectMeasurementSetCreate, ProjectMeasurementSet
+from models.project import MeasurementField, ProjectMeasurementSetCreate, ProjectMeasurementSet
 
 router = APIRouter()
 
 
 @router.get("/{project_id}/measurement-sets", response_model=list[ProjectMeasurementSet])
-def list_measurement_sets(project_id: int):
-    if not project_service.get_project(project_id):
+async def list_measurement_sets(
+    project_id: int,
+    field: MeasurementField | None = Query(default=None, description="Only sets with this measurement"),
+    min_value: float | None = None,
+    max_value: float | None = None,
+):
+    """A project's measurement sets; with `field`, only those whose value is within [min_value, max_value]."""
+    if not await project_service.get_project(project_id):
         raise HTTPException(status_code=404, detail="Project not found")
-    return project_service.get_measurement_sets(project_id)
+    return await project_service.get_measurement_sets(project_id, field, min_value, max_value)
 
 
 @router.post("/{project_id}/measurement-sets", response_model=ProjectMeasurementSet, status_code=201)
-def create_measurement_set(project_id: int, data: ProjectMeasurementSetCreate):
-    if not project_service.get_project(project_id):
-        raise HTTPException(status_code=404, detail="Project not found")
+async def create_measurement_set(project_id: int, data: ProjectMeasurementSetCreate):
     measurements = data.measurements.model_dump(exclude_none=True)
-    return project_service.add_measurement_set(project_id, data.name, measurements)
+    result = await project_service.add_measurement_set(project_id, data.name, measurements)
+    if not result:
+        raise HTTPException(status_code=404, detail="Project not found")
+    return result
 
 
 @router.patch("/{project_id}/measurement-sets/{ms_id}", response_model=ProjectMeasurementSet)
-def update_measurement_set(project_id: int, ms_id: int, data: ProjectMeasurementSetCreate):
-    if not project_service.get_project(project_id):
-        raise HTTPException(status_code=404, detail="Project not found")
+async def update_measurement_set(project_id: int, ms_id: int, data: ProjectMeasurementSetCreate):
     measurements = data.measurements.model_dump(exclude_none=True)
-    result = project_service.update_measurement_set(ms_id, project_id, data.name, measurements)
+    result = await project_service.update_measurement_set(ms_id, project_id, data.name, measurements)
     if not result:
         raise HTTPException(status_code=404, detail="Measurement set not found")
     return result
 
 
 @router.delete("/{project_id}/measurement-sets/{ms_id}", status_code=204)
-def delete_measurement_set(project_id: int, ms_id: int):
-    if not project_service.get_project(project_id):
+async def delete_measurement_set(project_id: int, ms_id: int):
+    if not await project_service.get_project(project_id):
         raise HTTPException(status_code=404, detail="Project not found")
-    project_service.delete_measurement_set(ms_id, project_id)
+    await project_service.delete_measurement_set(ms_id, project_id)
@@ -1,7 +1,6 @@
-import os
-import uuid
-
-from fastapi import APIRouter, HTTPException, UploadFile, File, Form
+from fastapi import APIRouter, HTTPException, Request, Response, UploadFile, File, Form
+from starlette.concurrency import run_in_threadpool
+from api import etags, uploads
 from services import project_service, llm_service
 from services import pattern_generator
 from models.project import (
@@ -12,23 +11,20 @@ from models.project import (
     AIPatternRequest,
 )
 
-UPLOADS_DIR = os.getenv("UPLOADS_DIR", "uploads")
-
 router = APIRouter()
 
 
 @router.post("/{project_id}/patterns/generate-ai", response_model=list[ProjectPattern])
-def generate_pattern_ai(project_id: int, req: AIPatternRequest):
-    if not project_service.get_project(project_id):
-        raise HTTPException(status_code=404, detail="Project not found")
+async def generate_pattern_ai(project_id: int, req: AIPatternRequest):
+    # No existence check up front: it would hold the request's write lock through generation
     try:
-        spec = llm_service.generate_pattern_spec(req.prompt, req.measurements)
-        result = pattern_generator.generate_from_spec(spec)
+        spec = await run_in_threadpool(llm_service.generate_pattern_spec, req.prompt, req.measurements)
+        result = await run_in_threadpool(pattern_generator.generate_from_spec, spec)
     except ValueError as exc:
         raise HTTPException(status_code=422, detail=str(exc))
     except Exception as exc:
         raise HTTPException(status_code=500, detail=str(exc))
-    saved = project_service.save_pattern(
+    saved = await project_service.save_pattern(
         project_id,
         source="generated",
         title=result["title"],
@@ -36,22 +32,23 @@ def generate_pattern_ai(project_id: int, req: AIPatternRequest):
         image_url=None,
         price=None,
     )
-    patterns = project_service.get_saved_patterns(project_id)
-    return [p for p in patterns if p["id"] == saved["id"]]
+    if not saved:
+        raise HTTPException(status_code=404, detail="Project not found")
+    return [saved]
 
 
 @router.post("/{project_id}/patterns/generate", response_model=list[ProjectPattern])
-def generate_pattern(project_id: int, req: GeneratePatternRequest):
-    if not project_service.get_project(project_id):
-        raise HTTPException(status_code=404, detail="Project not found")
+async def generate_pattern(project_id: int, req: GeneratePatternRequest):
     if req.garment_type == "skirt":
         try:
-            result = pattern_generator.generate_skirt(req.measurements.model_dump(), req.style_params.model_dump())
+            result = await run_in_threadpool(
+                pattern_generator.generate_skirt, req.measurements.model_dump(), req.style_params.model_dump()
+            )
         except Exception as exc:
             raise HTTPException(status_code=500, detail=str(exc))
     else:
         raise HTTPException(status_code=400, detail=f"Unsupported garment type: {req.garment_type}")
-    saved = project_service.save_pattern(
+    saved = await project_service.save_pattern(
         project_id,
         source="generated",
         title=result["title"],
@@ -59,33 +56,41 @@ def generate_pattern(project_id: int, req: GeneratePatternRequest):
         image_url=None,
         price=None,
     )
-    patterns = project_service.get_saved_patterns(project_id)
-    return [p for p in patterns if p["id"] == saved["id"]]
+    if not saved:
+        raise HTTPException(status_code=404, detail="Project not found")
+    return [saved]
 
 
 @router.get("/{project_id}/patterns", response_model=list[ProjectPattern])
-def get_saved_patterns(project_id: int):
-    return project_service.get_saved_patterns(project_id)
+async def get_saved_patterns(project_id: int, request: Request, response: Response):
+    etag = project_service.etag(project_id, "patterns")
+    if (cached := etags.not_modified(request, etag)) is not None:
+        return cached
+    response.headers.update(etags.headers(etag))
+    return await project_service.get_saved_patterns(project_id)
 
 
 @router.post("/{project_id}/patterns", response_model=dict)
-def save_pattern(project_id: int, data: ProjectPatternSave):
-    return project_service.save_pattern(
+async def save_pattern(project_id: int, data: ProjectPatternSave):
+    saved = await project_service.save_pattern(
         project_id, data.source, data.title, data.url, data.image_url, data.price, data.notes, data.price_paid
     )
+    if not saved:
+        raise HTTPException(status_code=404, detail="Project not found")
+    return saved
 
 
 @router.patch("/{project_id}/patterns/{pattern_id}", response_model=ProjectPattern)
-def update_pattern(project_id: int, pattern_id: int, data: ProjectPatternUpdate):
-    result = project_service.update_pattern(pattern_id, project_id, data.title, data.notes, data.price_paid)
+async def update_pattern(project_id: int, pattern_id: int, data: ProjectPatternUpdate):
+    result = await project_service.update_pattern(pattern_id, project_id, data.title, data.notes, data.price_paid)
     if not result:
         raise HTTPException(status_code=404, detail="Pattern not found")
     return result
 
 
 @router.delete("/{project_id}/patterns/{pattern_id}")
-def delete_saved_pattern(project_id: int, pattern_id: int):
-    project_service.delete_saved_pattern(pattern_id, project_id)
+async def delete_saved_pattern(project_id: int, pattern_id: int):
+    await project_service.delete_saved_pattern(pattern_id, project_id)
     return {"deleted": pattern_id}
 
 
@@ -97,28 +102,18 @@ async def upload_pattern(
     notes: str = Form(""),
     price_paid: float | None = Form(None),
 ):
-    if not project_service.get_project(project_id):
-        raise HTTPException(status_code=404, detail="Project not found")
-    ext = os.path.splitext(file.filename or "")[1].lower()
-    allowed = {".pdf", ".jpg", ".jpeg", ".png", ".webp"}
-    if ext not in allowed:
-        raise HTTPException(status_code=400, detail=f"File type not allowed. Allowed: {allowed}")
-    max_bytes = 20 * 1024 * 1024
-    content = await file.read(max_bytes + 1)
-    if len(content) > max_bytes:
-        raise HTTPException(status_code=413, detail="File too large (max 20 MB)")
-    filename = f"{uuid.uuid4()}{ext}"
-    dest = os.path.join(UPLOADS_DIR, filename)
-    with open(dest, "wb") as f:
-        f.write(content)
-    url = f"/uploads/{filename}"
-    return project_service.save_pattern(
+    url = await uploads.save(file, {".pdf", *uploads.IMAGE_TYPES}, max_mb=20)
+    saved = await project_service.save_pattern(
         project_id,
         source="upload",
         title=title or file.filename or "",
         url=url,
-        image_url=url if ext in {".jpg", ".jpeg", ".png", ".webp"} else None,
+        image_url=None if url.endswith(".pdf") else url,
         price=None,
         notes=notes or None,
         price_paid=price_paid,
     )
+    if not saved:
+        uploads.discard(url)
+        raise HTTPException(status_code=404, detail="Project not found")
+    return saved
@@ -0,0 +1,29 @@
+from fastapi import APIRouter, HTTPException, Query, Response
+
+from models.search import SearchKind, SearchResult
+from services import search_service
+
+router = APIRouter()
+
+
+@router.get("", response_model=list[SearchResult])
+async def search(
+    response: Response,
+    q: str = Query(min_length=1, max_length=200),
+    limit: int = Query(default=20, ge=1, le=100),
+    cursor: str | None = None,
+    kind: SearchKind | None = None,
+):
+    """
+    Full-text search over projects, checklist items, materials and saved patterns,
+    best match first. The next page's cursor comes back in the X-Next-Cursor header,
+    the number of matches in X-Total-Count.
+    """
+    try:
+        page = await search_service.search(q, limit, cursor, kind)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    response.headers["X-Total-Count"] = str(page["total"])
+    if page["next_cursor"]:
+        response.headers["X-Next-Cursor"] = page["next_cursor"]
+    return page["items"]
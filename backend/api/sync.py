@@ -0,0 +1,22 @@
+from fastapi import APIRouter, HTTPException, Query
+
+from models.sync import SyncPage
+from services import sync_service
+
+router = APIRouter()
+
+
+@router.get("", response_model=SyncPage)
+async def get_changes(
+    since: str | None = Query(default=None, description="Cursor from the previous response; omit for a full sync"),
+    limit: int = Query(default=500, ge=1, le=5000),
+):
+    """
+    Every project, child row and global measurement set inserted, updated or deleted
+    after `since`, read from one snapshot. A deleted project stands for its children.
+    Keep calling with the returned cursor while `has_more` is true.
+    """
+    try:
+        return await sync_service.get_changes(since, limit)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
@@ -0,0 +1,40 @@
+import os
+import uuid
+
+import anyio
+from fastapi import HTTPException, UploadFile
+
+UPLOADS_DIR = os.getenv("UPLOADS_DIR", "uploads")
+
+IMAGE_TYPES = {".jpg", ".jpeg", ".png", ".webp"}
+
+
+def _write(path: str, content: bytes) -> None:
+    with open(path, "wb") as f:
+        f.write(content)
+
+
+async def save(file: UploadFile, allowed: set[str], max_mb: int) -> str:
+    """
+    Check and store an uploaded file, returning its /uploads URL. Call it before the
+    request's first database access: a POST holds the shared writer from then on, and
+    reading a large body must not hold it.
+    """
+    ext = os.path.splitext(file.filename or "")[1].lower()
+    if ext not in allowed:
+        raise HTTPException(status_code=400, detail=f"File type not allowed. Allowed: {allowed}")
+    max_bytes = max_mb * 1024 * 1024
+    content = await file.read(max_bytes + 1)
+    if len(content) > max_bytes:
+        raise HTTPException(status_code=413, detail=f"File too large (max {max_mb} MB)")
+    filename = f"{uuid.uuid4()}{ext}"
+    await anyio.to_thread.run_sync(_write, os.path.join(UPLOADS_DIR, filename), content)
+    return f"/uploads/{filename}"
+
+
+def discard(url: str) -> None:
+    """Remove a file stored by save() that ended up unused."""
+    try:
+        os.remove(os.path.join(UPLOADS_DIR, url.removeprefix("/uploads/")))
+    except FileNotFoundError:
+        pass
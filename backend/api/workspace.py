@@ -0,0 +1,42 @@
+import tempfile
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse
+
+from api.dependencies import unit_of_work
+from services import workspace_service
+
+router = APIRouter()
+
+# Uploads larger than this are spooled to disk before the import reads them back
+_SPOOL_BYTES = 8 * 1024 * 1024
+
+
+@router.get("/export")
+def export_workspace(files: bool = True):
+    """
+    Every project with all its children, plus global measurement sets, as NDJSON
+    streamed from one read snapshot. `files=false` references uploads by content
+    hash instead of embedding them.
+    """
+    return StreamingResponse(
+        workspace_service.export_workspace(files),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="workspace.ndjson"'},
+    )
+
+
+@router.post("/import", response_model=dict, dependencies=[Depends(unit_of_work, scope="function")])
+async def import_workspace(request: Request):
+    """
+    Add the contents of an /export stream to this workspace, in one transaction.
+    The body is spooled first, so a slow upload doesn't hold the database writer.
+    """
+    with tempfile.SpooledTemporaryFile(max_size=_SPOOL_BYTES) as spool:
+        async for chunk in request.stream():
+            spool.write(chunk)
+        spool.seek(0)
+        try:
+            return await workspace_service.import_workspace(spool)
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc))
@@ -0,0 +1,88 @@
+"""
+Requests/sec on the project endpoints with and without the connection pool.
+
+Usage (from backend/):
+    uv run python -m benchmarks.bench_db_pool --requests 2000 --concurrency 8
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import database
+from fastapi.testclient import TestClient
+from main import app
+
+ENDPOINTS = [
+    "/api/projects/",
+    "/api/projects/{id}",
+    "/api/projects/{id}/checklist",
+    "/api/projects/{id}/materials",
+]
+
+
+def _seed(projects: int, items: int) -> list[int]:
+    ids = []
+    with database.get_connection() as conn:
+        for p in range(projects):
+            cur = conn.execute(
+                "INSERT INTO projects (name, description, budget) VALUES (?, ?, ?)",
+                (f"Project {p}", "benchmark", 100.0),
+            )
+            pid = cur.lastrowid
+            ids.append(pid)
+            conn.executemany(
+                "INSERT INTO checklist_items (project_id, title, notes, position) VALUES (?, ?, '', ?)",
+                [(pid, f"Step {i}", i) for i in range(items)],
+            )
+            conn.executemany(
+                "INSERT INTO project_materials (project_id, name, price, purchased) VALUES (?, ?, ?, ?)",
+                [(pid, f"Material {i}", 9.5, i % 2) for i in range(items // 4)],
+            )
+            conn.executemany(
+                "INSERT INTO saved_patterns (project_id, source, title, url, price_paid) VALUES (?, 'bench', ?, ?, ?)",
+                [(pid, f"Pattern {i}", f"https://example.com/{pid}/{i}", 12.0) for i in range(3)],
+            )
+    return ids
+
+
+def _run(pool_size: int, requests: int, concurrency: int, projects: int, items: int) -> dict[str, float]:
+    with tempfile.TemporaryDirectory() as tmp:
+        database.DB_PATH = os.path.join(tmp, "bench.db")
+        database.POOL_SIZE = pool_size
+        database.close_pool()
+        with TestClient(app) as client:
+            ids = _seed(projects, items)
+            results = {}
+            for endpoint in ENDPOINTS:
+                paths = [endpoint.format(id=random.choice(ids)) for _ in range(requests)]
+                start = time.perf_counter()
+                with ThreadPoolExecutor(max_workers=concurrency) as pool:
+                    for resp in pool.map(client.get, paths):
+                        resp.raise_for_status()
+                results[endpoint] = requests / (time.perf_counter() - start)
+        database.close_pool()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--projects", type=int, default=50)
+    parser.add_argument("--items", type=int, default=40, help="checklist items per project")
+    parser.add_argument("--pool-size", type=int, default=8)
+    args = parser.parse_args()
+
+    unpooled = _run(0, args.requests, args.concurrency, args.projects, args.items)
+    pooled = _run(args.pool_size, args.requests, args.concurrency, args.projects, args.items)
+
+    print(f"{'endpoint':32} {'no pool':>10} {'pool':>10} {'speedup':>8}")
+    for endpoint in ENDPOINTS:
+        print(f"{endpoint:32} {unpooled[endpoint]:10.0f} {pooled[endpoint]:10.0f} {pooled[endpoint] / unpooled[endpoint]:7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
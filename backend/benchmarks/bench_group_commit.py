@@ -0,0 +1,83 @@
+"""
+Write throughput with one transaction per write versus the group-commit writer.
+
+Every writer thread toggles checklist items in its own project. "per write" is a
+standalone repository call (its own pooled connection and transaction, contending
+for the SQLite write lock); "group commit" wraps each call in a write unit of work.
+
+Usage (from backend/):
+    uv run python -m benchmarks.bench_group_commit --writes 4000 --synchronous FULL
+"""
+import argparse
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import database
+from repositories import project_repository
+
+
+def _seed(projects: int, items: int) -> list[list[tuple[int, int]]]:
+    targets = []
+    with database.get_connection() as conn:
+        for p in range(projects):
+            pid = conn.execute("INSERT INTO projects (name) VALUES (?)", (f"Project {p}",)).lastrowid
+            conn.executemany(
+                "INSERT INTO checklist_items (project_id, title, position) VALUES (?, ?, ?)",
+                [(pid, f"Step {i}", i) for i in range(items)],
+            )
+            ids = [row[0] for row in conn.execute("SELECT id FROM checklist_items WHERE project_id = ?", (pid,))]
+            targets.append([(item_id, pid) for item_id in ids])
+    return targets
+
+
+def _toggle(item_id: int, project_id: int) -> None:
+    project_repository.toggle_checklist_item(item_id, project_id)
+
+
+def _toggle_grouped(item_id: int, project_id: int) -> None:
+    with database.unit_of_work():
+        project_repository.toggle_checklist_item(item_id, project_id)
+
+
+def _run(write, writers: int, writes: int, synchronous: str) -> float:
+    with tempfile.TemporaryDirectory() as tmp:
+        database.DB_PATH = os.path.join(tmp, "bench.db")
+        database.SYNCHRONOUS = synchronous
+        database.POOL_SIZE = writers
+        database.close_pool()
+        database.init_db()
+        targets = _seed(writers, 20)
+        per_writer = writes // writers
+
+        def worker(items: list[tuple[int, int]]) -> None:
+            for i in range(per_writer):
+                write(*items[i % len(items)])
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=writers) as pool:
+            for future in [pool.submit(worker, items) for items in targets]:
+                future.result()
+        elapsed = time.perf_counter() - start
+        database.close_pool()
+    return per_writer * writers / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--writes", type=int, default=3200, help="total writes per run")
+    parser.add_argument("--writers", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--synchronous", default=database.SYNCHRONOUS, help="PRAGMA synchronous for the run")
+    args = parser.parse_args()
+
+    print(f"synchronous={args.synchronous}, {args.writes} writes per run (writes/sec)")
+    print(f"{'writers':>8} {'per write':>10} {'group commit':>13} {'speedup':>8}")
+    for writers in args.writers:
+        single = _run(_toggle, writers, args.writes, args.synchronous)
+        grouped = _run(_toggle_grouped, writers, args.writes, args.synchronous)
+        print(f"{writers:8} {single:10.0f} {grouped:13.0f} {grouped / single:7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,147 +1,902 @@
-import sqlite3
+import functools
 import os
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Iterator, ParamSpec, TypeVar
+
+import anyio
+from anyio.lowlevel import RunVar
 
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./sewing_assistant.db")
 DB_PATH = DATABASE_URL.removeprefix("sqlite:///") if DATABASE_URL.startswith("sqlite:///") else DATABASE_URL
 
+# Connection pool tuning. DB_POOL_SIZE=0 disables pooling (one connection per call).
+POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "8"))
+POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+CACHE_SIZE_KB = int(os.getenv("DB_CACHE_SIZE_KB", "16384"))
+MMAP_SIZE = int(os.getenv("DB_MMAP_SIZE", str(128 * 1024 * 1024)))
+STATEMENT_CACHE_SIZE = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "256"))
+SYNCHRONOUS = os.getenv("DB_SYNCHRONOUS", "NORMAL")
+
+# Group commit: write transactions share one writer connection and are committed
+# together, at most GROUP_COMMIT_MAX_BATCH at a time. The committer waits at most
+# GROUP_COMMIT_MAX_WAIT_MS for more writers to join, and not at all when none are running.
+GROUP_COMMIT_MAX_BATCH = int(os.getenv("DB_GROUP_COMMIT_MAX_BATCH", "64"))
+GROUP_COMMIT_MAX_WAIT_MS = float(os.getenv("DB_GROUP_COMMIT_MAX_WAIT_MS", "2"))
 
-def get_connection() -> sqlite3.Connection:
-    conn = sqlite3.connect(DB_PATH)
+# Async callers: how many units of work may use the database at once. Each runs its
+# statements on DB worker threads, so this is also the number of DB threads.
+DB_CONCURRENCY = int(os.getenv("DB_CONCURRENCY", str(POOL_SIZE if POOL_SIZE > 0 else 8)))
+
+_pool: queue.LifoQueue[sqlite3.Connection] = queue.LifoQueue()
+_pool_lock = threading.Lock()
+_pool_created = 0
+
+
+def _connect() -> sqlite3.Connection:
+    """Open a new connection with the per-connection pragmas applied."""
+    conn = sqlite3.connect(
+        DB_PATH,
+        timeout=POOL_TIMEOUT,
+        check_same_thread=False,  # pooled connections move between threadpool workers
+        cached_statements=STATEMENT_CACHE_SIZE,
+    )
     conn.row_factory = sqlite3.Row  # rows behave like dicts
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute(f"PRAGMA synchronous = {SYNCHRONOUS}")
+    conn.execute(f"PRAGMA cache_size = -{CACHE_SIZE_KB}")
+    conn.execute(f"PRAGMA mmap_size = {MMAP_SIZE}")
     conn.execute("PRAGMA foreign_keys = ON")
     return conn
 
 
-def init_db():
-    with get_connection() as conn:
-        conn.executescript("""
-            CREATE TABLE IF NOT EXISTS projects (
-                id          INTEGER PRIMARY KEY AUTOINCREMENT,
-                name        TEXT NOT NULL,
-                description TEXT NOT NULL DEFAULT '',
-                budget      REAL,
-                created_at  TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            );
-
-            CREATE TABLE IF NOT EXISTS saved_patterns (
-                id          INTEGER PRIMARY KEY AUTOINCREMENT,
-                project_id  INTEGER NOT NULL REFERENCES projects(id) ON DELETE CASCADE,
-                source      TEXT NOT NULL DEFAULT '',
-                title       TEXT NOT NULL DEFAULT '',
-                url         TEXT NOT NULL,
-                image_url   TEXT,
-                price       TEXT,
-                saved_at    TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            );
-
-            CREATE TABLE IF NOT EXISTS checklist_items (
-                id          INTEGER PRIMARY KEY AUTOINCREMENT,
-                project_id  INTEGER NOT NULL REFERENCES projects(id) ON DELETE CASCADE,
-                title       TEXT NOT NULL,
-                notes       TEXT NOT NULL DEFAULT '',
-                checked     INTEGER NOT NULL DEFAULT 0,
-                created_at  TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            );
-
-            CREATE TABLE IF NOT EXISTS project_materials (
-                id          INTEGER PRIMARY KEY AUTOINCREMENT,
-                project_id  INTEGER NOT NULL REFERENCES projects(id) ON DELETE CASCADE,
-                name        TEXT NOT NULL,
-                quantity    TEXT NOT NULL DEFAULT '',
-                notes       TEXT NOT NULL DEFAULT '',
-                purchased   INTEGER NOT NULL DEFAULT 0,
-                image_url   TEXT,
-                created_at  TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            );
-        """)
-        # Migrate existing DBs that predate the image_url column
+def _acquire() -> sqlite3.Connection:
+    global _pool_created
+    if POOL_SIZE <= 0:
+        return _connect()
+    try:
+        return _pool.get_nowait()
+    except queue.Empty:
+        pass
+    with _pool_lock:
+        if _pool_created < POOL_SIZE:
+            _pool_created += 1
+            create = True
+        else:
+            create = False
+    if create:
         try:
-            conn.execute("ALTER TABLE project_materials ADD COLUMN image_url TEXT")
-        except sqlite3.OperationalError:
-            pass  # column already exists
-        # Migrate existing DBs that predate the measurements column
+            return _connect()
+        except Exception:
+            with _pool_lock:
+                _pool_created -= 1
+            raise
+    try:
+        return _pool.get(timeout=POOL_TIMEOUT)
+    except queue.Empty:
+        raise RuntimeError(f"Timed out waiting for a database connection (pool size {POOL_SIZE})")
+
+
+def _release(conn: sqlite3.Connection) -> None:
+    if POOL_SIZE <= 0:
+        conn.close()
+        return
+    if conn.in_transaction:
+        conn.rollback()
+    _pool.put(conn)
+
+
+class _GroupCommitWriter:
+    """
+    Single writer connection shared by every write unit of work.
+
+    Writers take turns on the connection (self._lock) inside one shared transaction,
+    each after the first in its own savepoint, so a failing writer only undoes its own
+    statements. While more writers are queued, finished ones wait on a future and a
+    committer thread commits the whole batch in one COMMIT; the last writer out commits
+    inline. Either way a writer returns only once its batch has committed.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()  # exclusive use of the writer connection
+        self._state = threading.Condition()  # guards everything below
+        self._conn: sqlite3.Connection | None = None
+        self._savepoint = False  # whether the current writer runs in a savepoint
+        self._pending: list[Future] = []
+        self._writers = 0  # writers holding or waiting for self._lock
+        self._thread: threading.Thread | None = None
+        self._stopping = False
+
+    def begin(self) -> sqlite3.Connection:
+        with self._state:
+            self._writers += 1
+            if self._thread is None:
+                self._stopping = False
+                self._thread = threading.Thread(target=self._run, name="db-group-commit", daemon=True)
+                self._thread.start()
+        self._lock.acquire()
         try:
-            conn.execute("ALTER TABLE projects ADD COLUMN measurements TEXT")
-        except sqlite3.OperationalError:
-            pass  # column already exists
-        # Migrate existing DBs that predate the status column
+            if self._conn is None:
+                self._conn = _connect()
+            # The first writer of a batch owns the whole transaction; later ones
+            # need a savepoint so they can roll back without touching the others
+            self._savepoint = self._conn.in_transaction
+            self._conn.execute("SAVEPOINT unit_of_work" if self._savepoint else "BEGIN IMMEDIATE")
+        except BaseException:
+            self._leave(committed=False)
+            raise
+        return self._conn
+
+    def end(self, commit: bool) -> None:
+        """Release or roll back the current writer's savepoint, then wait for its batch to commit."""
+        conn = self._conn
+        try:
+            if commit:
+                if self._savepoint:
+                    conn.execute("RELEASE unit_of_work")
+            elif not self._savepoint:
+                conn.rollback()
+            elif conn.in_transaction:
+                conn.execute("ROLLBACK TO unit_of_work")
+                conn.execute("RELEASE unit_of_work")
+        except BaseException as exc:
+            # The transaction is unusable; everything batched with it is lost too
+            try:
+                self._abort(exc)
+            finally:
+                self._leave(committed=False)
+            raise
+        future = self._leave(committed=commit)
+        if future is not None:
+            future.result()
+
+    def _leave(self, committed: bool) -> Future | None:
+        """Give up the writer connection; returns the future of the batch to wait for, if any."""
+        # Called with self._lock held
+        future = None
+        batch: list[Future] | None = None
+        with self._state:
+            self._writers -= 1
+            if not committed:
+                if not self._pending and self._conn is not None and self._conn.in_transaction:
+                    # Nothing else in the transaction: end it now rather than hold the write lock
+                    self._conn.rollback()
+            elif not self._writers:
+                # Last writer out with nobody queued behind it: commit here instead of
+                # handing off to the committer thread, since no one else could join the batch
+                batch, self._pending = self._pending, []
+            else:
+                future = Future()
+                self._pending.append(future)
+            if self._pending:
+                self._state.notify_all()
         try:
-            conn.execute("ALTER TABLE projects ADD COLUMN status TEXT NOT NULL DEFAULT 'to_start'")
-        except sqlite3.OperationalError:
-            pass  # column already exists
-        # Migrate existing DBs that predate the price column on materials
+            if batch is not None:
+                error = self._commit(batch)
+                if error is not None:
+                    raise error
+        finally:
+            self._lock.release()
+        return future
+
+    def _commit(self, batch: list[Future]) -> Exception | None:
+        # Called with self._lock held
         try:
-            conn.execute("ALTER TABLE project_materials ADD COLUMN price REAL")
-        except sqlite3.OperationalError:
-            pass  # column already exists
-        # Migrate existing DBs that predate the image_url column on checklist_items
+            self._conn.commit()
+            error = None
+        except Exception as exc:
+            error = exc
+            self._conn.rollback()
+        for future in batch:
+            if error is None:
+                future.set_result(None)
+            else:
+                future.set_exception(error)
+        return error
+
+    def _abort(self, exc: BaseException) -> None:
+        # Called with self._lock held
+        with self._state:
+            batch, self._pending = self._pending, []
+        if self._conn.in_transaction:
+            self._conn.rollback()
+        for future in batch:
+            future.set_exception(exc)
+
+    def _run(self) -> None:
+        while True:
+            with self._state:
+                while not self._pending and not self._stopping:
+                    self._state.wait()
+                if not self._pending:
+                    return
+                # Bounded wait for writers already in flight to join this batch
+                deadline = time.monotonic() + GROUP_COMMIT_MAX_WAIT_MS / 1000
+                while len(self._pending) < GROUP_COMMIT_MAX_BATCH and self._writers and not self._stopping:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._state.wait(remaining)
+            with self._lock:
+                with self._state:
+                    batch, self._pending = self._pending, []
+                if batch:
+                    self._commit(batch)
+
+    def close(self) -> None:
+        """Flush pending writes, stop the committer thread and close the writer connection."""
+        with self._state:
+            thread, self._thread = self._thread, None
+            self._stopping = True
+            self._state.notify_all()
+        if thread is not None:
+            thread.join()
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+_writer = _GroupCommitWriter()
+
+
+class UnitOfWork:
+    """
+    One connection and one transaction shared by every repository call in a request.
+    The connection is borrowed on first use, so requests that never reach the
+    database never touch the pool.
+
+    Write units run on the group-commit writer: they hold it exclusively from their
+    first statement, so a check followed by a write can't be raced by another writer.
+    Read units get a pooled connection and a deferred transaction (one snapshot).
+    """
+
+    def __init__(self, write: bool = True):
+        self.write = write
+        self._conn: sqlite3.Connection | None = None
+        self._admitted = False  # holds a DB_CONCURRENCY slot (async callers only)
+        self._on_close: list[Callable[[], None]] = []
+        self._on_commit: list[Callable[[], None]] = []
+
+    def connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            if self.write:
+                self._conn = _writer.begin()
+                return self._conn
+            conn = _acquire()
+            try:
+                conn.execute("BEGIN")
+            except Exception:
+                _release(conn)
+                raise
+            self._conn = conn
+        return self._conn
+
+    def on_close(self, callback: Callable[[], None]) -> None:
+        """Run `callback` once the transaction has ended, whether it committed or not."""
+        self._on_close.append(callback)
+
+    def on_commit(self, callback: Callable[[], None]) -> None:
+        """Run `callback` once the transaction has committed; dropped on rollback."""
+        self._on_commit.append(callback)
+
+    def close(self, commit: bool) -> None:
+        """Commit (or roll back) the transaction and give the connection back."""
+        conn, self._conn = self._conn, None
+        committed, self._on_commit = self._on_commit, []
         try:
-            conn.execute("ALTER TABLE checklist_items ADD COLUMN image_url TEXT")
-        except sqlite3.OperationalError:
-            pass
-        # Migrate existing DBs that predate the position column on checklist_items
+            if conn is not None:
+                self._end(conn, commit)
+        finally:
+            callbacks, self._on_close = self._on_close, []
+            for callback in callbacks:
+                callback()
+        if commit:
+            for callback in committed:
+                callback()
+
+    def _end(self, conn: sqlite3.Connection, commit: bool) -> None:
+        if self.write:
+            _writer.end(commit)
+            return
         try:
-            conn.execute("ALTER TABLE checklist_items ADD COLUMN position INTEGER")
-            conn.execute("""
-                UPDATE checklist_items SET position = (
-                    SELECT COUNT(*) FROM checklist_items c2
-                    WHERE c2.project_id = checklist_items.project_id
-                      AND (c2.created_at < checklist_items.created_at
-                           OR (c2.created_at = checklist_items.created_at AND c2.id <= checklist_items.id))
-                )
-            """)
-        except sqlite3.OperationalError:
-            pass
-        # Migrate existing DBs that predate fabric note columns on project_materials
-        for col_sql in [
-            "ALTER TABLE project_materials ADD COLUMN care_instructions TEXT",
-            "ALTER TABLE project_materials ADD COLUMN grain_direction TEXT",
-            "ALTER TABLE project_materials ADD COLUMN pre_wash INTEGER NOT NULL DEFAULT 0",
-        ]:
+            if commit:
+                conn.commit()
+            else:
+                conn.rollback()
+        finally:
+            _release(conn)
+
+
+current_unit_of_work: ContextVar[UnitOfWork | None] = ContextVar("unit_of_work", default=None)
+
+
+@contextmanager
+def unit_of_work(write: bool = True) -> Iterator[UnitOfWork]:
+    """Run the block in a single transaction; get_connection() calls inside it share it."""
+    uow = UnitOfWork(write)
+    token = current_unit_of_work.set(uow)
+    try:
+        yield uow
+    except BaseException:
+        uow.close(commit=False)
+        raise
+    else:
+        uow.close(commit=True)
+    finally:
+        current_unit_of_work.reset(token)
+
+
+@contextmanager
+def get_connection() -> Iterator[sqlite3.Connection]:
+    """
+    Borrow a configured connection from the pool.
+    Commits on success, rolls back on error, and returns the connection to the pool.
+    Inside a unit of work, yields the shared connection and leaves the commit to it.
+    """
+    uow = current_unit_of_work.get()
+    if uow is not None:
+        yield uow.connection()
+        return
+    conn = _acquire()
+    try:
+        with conn:
+            yield conn
+    finally:
+        _release(conn)
+
+
+def close_pool() -> None:
+    """Close the writer and every idle pooled connection. Called on application shutdown."""
+    global _pool_created
+    _writer.close()
+    with _pool_lock:
+        while True:
             try:
-                conn.execute(col_sql)
-            except sqlite3.OperationalError:
-                pass  # column already exists
+                conn = _pool.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+            _pool_created -= 1
+
+
+# --- Async access ---
+#
+# Blocking sqlite3 calls run on worker threads under their own limiters rather than
+# Starlette's shared threadpool. A unit of work keeps its slot from its first call to
+# its close, and never needs more than one thread at a time, so with as many threads
+# as slots a unit of work holding the writer or a pooled connection can always run
+# its next statement (queued units wait for a slot, not on a blocked thread).
+
+P = ParamSpec("P")
+T = TypeVar("T")
 
-        # Migrate existing DBs that predate the notes column on saved_patterns
+# Limiters belong to an event loop, so they are created per loop on first use
+_db_slots: RunVar[anyio.CapacityLimiter] = RunVar("db_slots")
+_db_threads: RunVar[anyio.CapacityLimiter] = RunVar("db_threads")
+
+
+def _limiter(var: RunVar[anyio.CapacityLimiter]) -> anyio.CapacityLimiter:
+    try:
+        return var.get()
+    except LookupError:
+        limiter = anyio.CapacityLimiter(DB_CONCURRENCY)
+        var.set(limiter)
+        return limiter
+
+
+async def run_db(func: Callable[..., T], /, *args: Any, **kwargs: Any) -> T:
+    """
+    Await a blocking database call on a DB worker thread without blocking the event loop.
+    The call sees the caller's context, so it joins the current unit of work.
+    """
+    call = functools.partial(func, *args, **kwargs)
+    uow = current_unit_of_work.get()
+    if uow is None:
+        borrower = object()
+        await _limiter(_db_slots).acquire_on_behalf_of(borrower)
         try:
-            conn.execute("ALTER TABLE saved_patterns ADD COLUMN notes TEXT")
-        except sqlite3.OperationalError:
-            pass
-        # Migrate existing DBs that predate the price_paid column on saved_patterns
+            return await anyio.to_thread.run_sync(call, limiter=_limiter(_db_threads))
+        finally:
+            _limiter(_db_slots).release_on_behalf_of(borrower)
+    if not uow._admitted:
+        await _limiter(_db_slots).acquire_on_behalf_of(uow)
+        uow._admitted = True
+    return await anyio.to_thread.run_sync(call, limiter=_limiter(_db_threads))
+
+
+async def close_unit_of_work(uow: UnitOfWork, commit: bool) -> None:
+    """Async counterpart of UnitOfWork.close(); always runs to completion, even when cancelled."""
+    with anyio.CancelScope(shield=True):
         try:
-            conn.execute("ALTER TABLE saved_patterns ADD COLUMN price_paid REAL")
-        except sqlite3.OperationalError:
-            pass
-
-        conn.executescript("""
-            CREATE TABLE IF NOT EXISTS project_progress_images (
-                id          INTEGER PRIMARY KEY AUTOINCREMENT,
-                project_id  INTEGER NOT NULL REFERENCES projects(id) ON DELETE CASCADE,
-                url         TEXT NOT NULL,
-                created_at  TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            );
+            if uow._conn is not None and uow._admitted:
+                await anyio.to_thread.run_sync(uow.close, commit, limiter=_limiter(_db_threads))
+            elif uow._conn is not None:
+                # Opened by blocking code, without a slot: it may hold the writer that
+                # every slot holder is waiting on, so it can't queue for a DB thread
+                await anyio.to_thread.run_sync(uow.close, commit)
+            else:
+                uow.close(commit)
+        finally:
+            if uow._admitted:
+                uow._admitted = False
+                _limiter(_db_slots).release_on_behalf_of(uow)
+
+
+def run_db_async(func: Callable[P, T]) -> Callable[P, Awaitable[T]]:
+    """Wrap a blocking repository function into an async one with the same signature."""
+
+    @functools.wraps(func)
+    async def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+        return await run_db(func, *args, **kwargs)
+
+    return wrapper
+
+
+# --- Schema migrations ---
+#
+# Each migration runs once, in its own transaction, and bumps PRAGMA user_version
+# to its 1-based position in MIGRATIONS. Append new migrations; never edit old ones.
+
+
+def _run_script(conn: sqlite3.Connection, script: str) -> None:
+    """Execute a multi-statement script inside the current transaction.
+    (executescript() would COMMIT first.)"""
+    statement = ""
+    for line in script.splitlines(keepends=True):
+        statement += line
+        if sqlite3.complete_statement(statement):
+            conn.execute(statement)
+            statement = ""
+    if statement.strip():
+        conn.execute(statement)
+
+
+def _add_column(conn: sqlite3.Connection, table: str, column: str, definition: str) -> bool:
+    """Add a column if the table predates it. Returns True if it was added."""
+    existing = {row["name"] for row in conn.execute(f"PRAGMA table_info({table})")}
+    if column in existing:
+        return False
+    conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+    return True
+
+
+def _m001_initial_schema(conn: sqlite3.Connection) -> None:
+    _run_script(conn, """
+        CREATE TABLE IF NOT EXISTS projects (
+            id           INTEGER PRIMARY KEY AUTOINCREMENT,
+            name         TEXT NOT NULL,
+            description  TEXT NOT NULL DEFAULT '',
+            budget       REAL,
+            created_at   TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            measurements TEXT,
+            status       TEXT NOT NULL DEFAULT 'to_start'
+        );
+
+        CREATE TABLE IF NOT EXISTS saved_patterns (
+            id          INTEGER PRIMARY KEY AUTOINCREMENT,
+            project_id  INTEGER NOT NULL REFERENCES projects(id) ON DELETE CASCADE,
+            source      TEXT NOT NULL DEFAULT '',
+            title       TEXT NOT NULL DEFAULT '',
+            url         TEXT NOT NULL,
+            image_url   TEXT,
+            price       TEXT,
+            saved_at    TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            notes       TEXT,
+            price_paid  REAL
+        );
+
+        CREATE TABLE IF NOT EXISTS checklist_items (
+            id          INTEGER PRIMARY KEY AUTOINCREMENT,
+            project_id  INTEGER NOT NULL REFERENCES projects(id) ON DELETE CASCADE,
+            title       TEXT NOT NULL,
+            notes       TEXT NOT NULL DEFAULT '',
+            checked     INTEGER NOT NULL DEFAULT 0,
+            created_at  TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            image_url   TEXT,
+            position    INTEGER
+        );
+
+        CREATE TABLE IF NOT EXISTS project_materials (
+            id                INTEGER PRIMARY KEY AUTOINCREMENT,
+            project_id        INTEGER NOT NULL REFERENCES projects(id) ON DELETE CASCADE,
+            name              TEXT NOT NULL,
+            quantity          TEXT NOT NULL DEFAULT '',
+            notes             TEXT NOT NULL DEFAULT '',
+            purchased         INTEGER NOT NULL DEFAULT 0,
+            image_url         TEXT,
+            created_at        TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            price             REAL,
+            care_instructions TEXT,
+            grain_direction   TEXT,
+            pre_wash          INTEGER NOT NULL DEFAULT 0
+        );
+
+        CREATE TABLE IF NOT EXISTS project_progress_images (
+            id          INTEGER PRIMARY KEY AUTOINCREMENT,
+            project_id  INTEGER NOT NULL REFERENCES projects(id) ON DELETE CASCADE,
+            url         TEXT NOT NULL,
+            created_at  TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+
+        CREATE TABLE IF NOT EXISTS project_measurement_sets (
+            id           INTEGER PRIMARY KEY AUTOINCREMENT,
+            project_id   INTEGER NOT NULL REFERENCES projects(id) ON DELETE CASCADE,
+            name         TEXT NOT NULL,
+            measurements TEXT NOT NULL DEFAULT '{}',
+            created_at   TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+
+        CREATE TABLE IF NOT EXISTS global_measurement_sets (
+            id           INTEGER PRIMARY KEY AUTOINCREMENT,
+            name         TEXT NOT NULL,
+            measurements TEXT NOT NULL DEFAULT '{}',
+            created_at   TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+
+        CREATE TABLE IF NOT EXISTS project_global_measurements (
+            project_id   INTEGER NOT NULL REFERENCES projects(id) ON DELETE CASCADE,
+            global_ms_id INTEGER NOT NULL REFERENCES global_measurement_sets(id) ON DELETE CASCADE,
+            PRIMARY KEY (project_id, global_ms_id)
+        );
+    """)
+
+    # Databases created before the migration runner may be missing later columns
+    _add_column(conn, "projects", "measurements", "TEXT")
+    _add_column(conn, "projects", "status", "TEXT NOT NULL DEFAULT 'to_start'")
+    _add_column(conn, "project_materials", "image_url", "TEXT")
+    _add_column(conn, "project_materials", "price", "REAL")
+    _add_column(conn, "project_materials", "care_instructions", "TEXT")
+    _add_column(conn, "project_materials", "grain_direction", "TEXT")
+    _add_column(conn, "project_materials", "pre_wash", "INTEGER NOT NULL DEFAULT 0")
+    _add_column(conn, "checklist_items", "image_url", "TEXT")
+    _add_column(conn, "saved_patterns", "notes", "TEXT")
+    _add_column(conn, "saved_patterns", "price_paid", "REAL")
+    if _add_column(conn, "checklist_items", "position", "INTEGER"):
+        # Number existing items per project in creation order (single pass, not O(n²))
+        conn.execute("""
+            UPDATE checklist_items SET position = ranked.pos
+            FROM (
+                SELECT id, ROW_NUMBER() OVER (PARTITION BY project_id ORDER BY created_at, id) AS pos
+                FROM checklist_items
+            ) AS ranked
+            WHERE checklist_items.id = ranked.id
         """)
 
-        conn.executescript("""
-            CREATE TABLE IF NOT EXISTS project_measurement_sets (
-                id           INTEGER PRIMARY KEY AUTOINCREMENT,
-                project_id   INTEGER NOT NULL REFERENCES projects(id) ON DELETE CASCADE,
-                name         TEXT NOT NULL,
-                measurements TEXT NOT NULL DEFAULT '{}',
-                created_at   TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            );
-
-            CREATE TABLE IF NOT EXISTS global_measurement_sets (
-                id           INTEGER PRIMARY KEY AUTOINCREMENT,
-                name         TEXT NOT NULL,
-                measurements TEXT NOT NULL DEFAULT '{}',
-                created_at   TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            );
-
-            CREATE TABLE IF NOT EXISTS project_global_measurements (
-                project_id   INTEGER NOT NULL REFERENCES projects(id) ON DELETE CASCADE,
-                global_ms_id INTEGER NOT NULL REFERENCES global_measurement_sets(id) ON DELETE CASCADE,
-                PRIMARY KEY (project_id, global_ms_id)
-            );
+
+def _m002_child_table_indexes(conn: sqlite3.Connection) -> None:
+    # Every child lookup is "WHERE project_id = ? ORDER BY <col>"; the trailing
+    # columns let the spend totals be read from the index alone.
+    _run_script(conn, """
+        CREATE INDEX IF NOT EXISTS idx_saved_patterns_project
+            ON saved_patterns (project_id, saved_at, price_paid);
+        CREATE INDEX IF NOT EXISTS idx_checklist_items_project
+            ON checklist_items (project_id, position, created_at);
+        CREATE INDEX IF NOT EXISTS idx_project_materials_project
+            ON project_materials (project_id, created_at, purchased, price);
+        CREATE INDEX IF NOT EXISTS idx_progress_images_project
+            ON project_progress_images (project_id, created_at);
+        CREATE INDEX IF NOT EXISTS idx_measurement_sets_project
+            ON project_measurement_sets (project_id, created_at);
+        CREATE INDEX IF NOT EXISTS idx_project_global_measurements_global
+            ON project_global_measurements (global_ms_id, project_id);
+    """)
+
+
+# Spend that counts towards a project's total: purchased materials and paid patterns
+_MATERIAL_SPEND = "(CASE WHEN {row}.purchased = 1 THEN COALESCE({row}.price, 0) ELSE 0 END)"
+_PATTERN_SPEND = "COALESCE({row}.price_paid, 0)"
+
+
+def _m003_project_spend_totals(conn: sqlite3.Connection) -> None:
+    # projects.total_spent is maintained incrementally by triggers so listing
+    # projects no longer sums every child row.
+    _add_column(conn, "projects", "total_spent", "REAL NOT NULL DEFAULT 0")
+    material_old, material_new = _MATERIAL_SPEND.format(row="OLD"), _MATERIAL_SPEND.format(row="NEW")
+    pattern_old, pattern_new = _PATTERN_SPEND.format(row="OLD"), _PATTERN_SPEND.format(row="NEW")
+    _run_script(conn, f"""
+        CREATE TRIGGER IF NOT EXISTS trg_materials_spent_insert AFTER INSERT ON project_materials
+        BEGIN
+            UPDATE projects SET total_spent = total_spent + {material_new} WHERE id = NEW.project_id;
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS trg_materials_spent_update
+        AFTER UPDATE OF purchased, price, project_id ON project_materials
+        WHEN {material_old} <> {material_new} OR OLD.project_id <> NEW.project_id
+        BEGIN
+            UPDATE projects SET total_spent = total_spent - {material_old} WHERE id = OLD.project_id;
+            UPDATE projects SET total_spent = total_spent + {material_new} WHERE id = NEW.project_id;
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS trg_materials_spent_delete AFTER DELETE ON project_materials
+        BEGIN
+            UPDATE projects SET total_spent = total_spent - {material_old} WHERE id = OLD.project_id;
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS trg_patterns_spent_insert AFTER INSERT ON saved_patterns
+        BEGIN
+            UPDATE projects SET total_spent = total_spent + {pattern_new} WHERE id = NEW.project_id;
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS trg_patterns_spent_update
+        AFTER UPDATE OF price_paid, project_id ON saved_patterns
+        WHEN {pattern_old} <> {pattern_new} OR OLD.project_id <> NEW.project_id
+        BEGIN
+            UPDATE projects SET total_spent = total_spent - {pattern_old} WHERE id = OLD.project_id;
+            UPDATE projects SET total_spent = total_spent + {pattern_new} WHERE id = NEW.project_id;
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS trg_patterns_spent_delete AFTER DELETE ON saved_patterns
+        BEGIN
+            UPDATE projects SET total_spent = total_spent - {pattern_old} WHERE id = OLD.project_id;
+        END;
+    """)
+    conn.execute(f"""
+        UPDATE projects SET total_spent = COALESCE((
+            SELECT SUM({_MATERIAL_SPEND.format(row="m")}) FROM project_materials m WHERE m.project_id = projects.id
+        ), 0) + COALESCE((
+            SELECT SUM({_PATTERN_SPEND.format(row="sp")}) FROM saved_patterns sp WHERE sp.project_id = projects.id
+        ), 0)
+    """)
+
+
+def _m004_project_list_indexes(conn: sqlite3.Connection) -> None:
+    # Keyset pagination walks (created_at, id); each filter gets its own prefix
+    # so page N is an index seek whatever the filter.
+    _run_script(conn, """
+        CREATE INDEX IF NOT EXISTS idx_projects_created
+            ON projects (created_at, id);
+        CREATE INDEX IF NOT EXISTS idx_projects_status_created
+            ON projects (status, created_at, id);
+        CREATE INDEX IF NOT EXISTS idx_projects_over_budget_created
+            ON projects (total_spent > budget, created_at, id);
+        CREATE INDEX IF NOT EXISTS idx_projects_budget
+            ON projects (budget);
+    """)
+
+
+CHECKLIST_POSITION_STEP = 1024
+
+
+def _m005_sparse_checklist_positions(conn: sqlite3.Connection) -> None:
+    # Spread positions out so moving one item only rewrites that item
+    conn.execute("""
+        UPDATE checklist_items SET position = ranked.pos * ?
+        FROM (
+            SELECT id, ROW_NUMBER() OVER (
+                PARTITION BY project_id ORDER BY position, created_at, id
+            ) AS pos
+            FROM checklist_items
+        ) AS ranked
+        WHERE checklist_items.id = ranked.id
+    """, (CHECKLIST_POSITION_STEP,))
+
+
+# One FTS5 index covers every searchable table. A source row's index rowid is
+# id * len(SEARCH_KINDS) + its kind's position, so triggers address it directly.
+SEARCH_KINDS = ("project", "checklist_item", "material", "pattern")
+
+# kind: (table, title, body, project id, columns the index copies)
+_SEARCH_SOURCES = {
+    "project": ("projects", "{row}.name", "{row}.description", "{row}.id", "name, description"),
+    "checklist_item": ("checklist_items", "{row}.title", "{row}.notes", "{row}.project_id", "title, notes, project_id"),
+    "material": (
+        "project_materials",
+        "{row}.name",
+        "trim(COALESCE({row}.notes, '') || char(10) || COALESCE({row}.care_instructions, ''), ' ' || char(10))",
+        "{row}.project_id",
+        "name, notes, care_instructions, project_id",
+    ),
+    "pattern": ("saved_patterns", "{row}.title", "{row}.notes", "{row}.project_id", "title, notes, project_id"),
+}
+
+
+def _search_triggers(conn: sqlite3.Connection, kind: str) -> None:
+    """Create one kind's index triggers and index the rows its table already holds."""
+    table, title, body, project_id, columns = _SEARCH_SOURCES[kind]
+    stride = len(SEARCH_KINDS)
+    code = SEARCH_KINDS.index(kind)
+    new = {"title": title.format(row="NEW"), "body": body.format(row="NEW"), "pid": project_id.format(row="NEW")}
+    _run_script(conn, f"""
+        CREATE TRIGGER IF NOT EXISTS trg_{table}_search_insert AFTER INSERT ON {table}
+        BEGIN
+            INSERT INTO search_index (rowid, title, body, project_id)
+            VALUES (NEW.id * {stride} + {code}, {new["title"]}, {new["body"]}, {new["pid"]});
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS trg_{table}_search_update AFTER UPDATE OF {columns} ON {table}
+        BEGIN
+            UPDATE search_index SET title = {new["title"]}, body = {new["body"]}, project_id = {new["pid"]}
+            WHERE rowid = NEW.id * {stride} + {code};
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS trg_{table}_search_delete AFTER DELETE ON {table}
+        BEGIN
+            DELETE FROM search_index WHERE rowid = OLD.id * {stride} + {code};
+        END;
+    """)
+    conn.execute(f"""
+        INSERT INTO search_index (rowid, title, body, project_id)
+        SELECT id * {stride} + {code}, {title.format(row=table)}, {body.format(row=table)}, {project_id.format(row=table)}
+        FROM {table}
+    """)
+
+
+def _m006_search_index(conn: sqlite3.Connection) -> None:
+    _run_script(conn, """
+        CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5(
+            title, body, project_id UNINDEXED,
+            tokenize = 'unicode61 remove_diacritics 2',
+            prefix = '2 3'
+        );
+    """)
+    for kind in _SEARCH_SOURCES:
+        _search_triggers(conn, kind)
+
+
+# One REAL column per measurement, named after the MeasurementsUpdate field
+MEASUREMENT_FIELDS = (
+    "ankle", "biceps", "bustFront", "bustPointToUnderbust", "bustSpan", "chest",
+    "crossSeam", "crossSeamFront", "crotchDepth", "head", "heel", "highBust",
+    "highBustFront", "hips", "hpsToBust", "hpsToWaistBack", "hpsToWaistFront", "inseam",
+    "knee", "neck", "seat", "seatBack", "shoulderSlope", "shoulderToElbow",
+    "shoulderToShoulder", "shoulderToWrist", "underbust", "upperLeg", "waist", "waistBack",
+    "waistToArmpit", "waistToFloor", "waistToHips", "waistToKnee", "waistToSeat",
+    "waistToUnderbust", "waistToUpperLeg", "wrist",
+)
+
+
+def _m007_typed_measurements(conn: sqlite3.Connection) -> None:
+    # Measurement sets were JSON text parsed on every read; move each value to its own column
+    for table in ("project_measurement_sets", "global_measurement_sets"):
+        for field in MEASUREMENT_FIELDS:
+            _add_column(conn, table, field, "REAL")
+        assignments = ", ".join(
+            f"{field} = CASE WHEN json_type(measurements, '$.{field}') IN ('integer', 'real')"
+            f" THEN json_extract(measurements, '$.{field}') END"
+            for field in MEASUREMENT_FIELDS
+        )
+        conn.execute(f"UPDATE {table} SET {assignments} WHERE json_valid(measurements)")
+        conn.execute(f"ALTER TABLE {table} DROP COLUMN measurements")
+
+
+# Tables the sync feed reports, with the project each row belongs to
+SYNC_TABLES = {
+    "projects": "{row}.id",
+    "checklist_items": "{row}.project_id",
+    "project_materials": "{row}.project_id",
+    "saved_patterns": "{row}.project_id",
+    "project_progress_images": "{row}.project_id",
+    "project_measurement_sets": "{row}.project_id",
+    "global_measurement_sets": "NULL",
+}
+
+
+def _sync_entry(table: str, row_id: str, project_id: str, deleted: int = 0) -> str:
+    # DELETE + INSERT rather than INSERT OR REPLACE: an outer INSERT OR IGNORE
+    # (e.g. linking a global set) would override the trigger's conflict policy
+    return f"""
+                DELETE FROM sync_log WHERE table_name = '{table}' AND row_id = {row_id};
+                INSERT INTO sync_log (table_name, row_id, project_id, deleted)
+                VALUES ('{table}', {row_id}, {project_id}, {deleted});"""
+
+
+def _m008_sync_log(conn: sqlite3.Connection) -> None:
+    # One entry per row that ever changed, holding the version of its latest change:
+    # a change moves the row's entry to a fresh version, so the log never grows past
+    # one entry per row, and entries with deleted = 1 are the tombstones.
+    _run_script(conn, """
+        CREATE TABLE IF NOT EXISTS sync_log (
+            version     INTEGER PRIMARY KEY AUTOINCREMENT,
+            table_name  TEXT NOT NULL,
+            row_id      INTEGER NOT NULL,
+            project_id  INTEGER,
+            deleted     INTEGER NOT NULL DEFAULT 0,
+            updated_at  TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE (table_name, row_id)
+        );
+        CREATE INDEX IF NOT EXISTS idx_sync_log_project ON sync_log (project_id);
+    """)
+    for table, project_id in SYNC_TABLES.items():
+        new, old = project_id.format(row="NEW"), project_id.format(row="OLD")
+        if table == "projects":
+            # A project's tombstone stands for its children: drop their entries
+            on_delete = "\n                DELETE FROM sync_log WHERE project_id = OLD.id;" + _sync_entry(table, "OLD.id", old, 1)
+            when = ""
+        else:
+            on_delete = _sync_entry(table, "OLD.id", old, 1)
+            # Children deleted along with their project are covered by its tombstone
+            when = "" if project_id == "NULL" else "WHEN EXISTS (SELECT 1 FROM projects WHERE id = OLD.project_id)"
+        _run_script(conn, f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_sync_insert AFTER INSERT ON {table}
+            BEGIN {_sync_entry(table, "NEW.id", new)}
+            END;
+
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_sync_update AFTER UPDATE ON {table}
+            BEGIN {_sync_entry(table, "NEW.id", new)}
+            END;
+
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_sync_delete AFTER DELETE ON {table} {when}
+            BEGIN {on_delete}
+            END;
+        """)
+        conn.execute(f"""
+            INSERT OR IGNORE INTO sync_log (table_name, row_id, project_id)
+            SELECT '{table}', id, {project_id.format(row=table)} FROM {table} ORDER BY id
         """)
+    # Global set links are reported as part of their project
+    _run_script(conn, f"""
+        CREATE TRIGGER IF NOT EXISTS trg_project_global_measurements_sync_insert
+        AFTER INSERT ON project_global_measurements
+        BEGIN {_sync_entry("projects", "NEW.project_id", "NEW.project_id")}
+        END;
+
+        CREATE TRIGGER IF NOT EXISTS trg_project_global_measurements_sync_delete
+        AFTER DELETE ON project_global_measurements
+        WHEN EXISTS (SELECT 1 FROM projects WHERE id = OLD.project_id)
+        BEGIN {_sync_entry("projects", "OLD.project_id", "OLD.project_id")}
+        END;
+    """)
+
+
+def _m009_material_search_body(conn: sqlite3.Connection) -> None:
+    # Materials with neither notes nor care instructions were indexed with a bare newline body
+    table = _SEARCH_SOURCES["material"][0]
+    code = SEARCH_KINDS.index("material")
+    for trigger in ("insert", "update", "delete"):
+        conn.execute(f"DROP TRIGGER IF EXISTS trg_{table}_search_{trigger}")
+    conn.execute(f"DELETE FROM search_index WHERE rowid % {len(SEARCH_KINDS)} = {code}")
+    _search_triggers(conn, "material")
+
+
+def _m010_project_sync_skips_spend(conn: sqlite3.Connection) -> None:
+    # total_spent follows every material and pattern write, which the feed already
+    # reports; only the project's own columns should give it a new entry
+    conn.execute("DROP TRIGGER IF EXISTS trg_projects_sync_update")
+    _run_script(conn, f"""
+        CREATE TRIGGER trg_projects_sync_update
+        AFTER UPDATE OF name, description, budget, created_at, measurements, status ON projects
+        BEGIN {_sync_entry("projects", "NEW.id", "NEW.id")}
+        END;
+    """)
+
+
+MIGRATIONS: list[Callable[[sqlite3.Connection], None]] = [
+    _m001_initial_schema,
+    _m002_child_table_indexes,
+    _m003_project_spend_totals,
+    _m004_project_list_indexes,
+    _m005_sparse_checklist_positions,
+    _m006_search_index,
+    _m007_typed_measurements,
+    _m008_sync_log,
+    _m009_material_search_body,
+    _m010_project_sync_skips_spend,
+]
+
+
+def schema_version(conn: sqlite3.Connection) -> int:
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def init_db() -> None:
+    """Apply any pending migrations. An up-to-date database costs one pragma read."""
+    with get_connection() as conn:
+        if schema_version(conn) >= len(MIGRATIONS):
+            return
+        for version, migrate in enumerate(MIGRATIONS, start=1):
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                # Re-check under the write lock: another worker may have migrated meanwhile
+                if schema_version(conn) < version:
+                    migrate(conn)
+                    conn.execute(f"PRAGMA user_version = {version}")
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
@@ -1,14 +1,16 @@
+import asyncio
 import os
 from dotenv import load_dotenv
 
 load_dotenv()
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, HTTPException, Request
+from fastapi import Depends, FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import FileResponse, JSONResponse
 from fastapi.staticfiles import StaticFiles
 from starlette.exceptions import HTTPException as StarletteHTTPException
-from database import init_db
+from database import init_db, close_pool
+from api.dependencies import unit_of_work
 from api.patterns import router as patterns_router
 from api.stores import router as stores_router
 from api.materials import router as materials_router
@@ -20,6 +22,11 @@ from api.project_patterns import router as project_patterns_router
 from api.project_checklist import router as project_checklist_router
 from api.project_materials import router as project_materials_router
 from api.project_images import router as project_images_router
+from api.search import router as search_router
+from api.sync import router as sync_router
+from api.workspace import router as workspace_router
+from scrapers import _http
+from services import project_cache, scraper_cache, shopify_catalog
 
 UPLOADS_DIR = os.getenv("UPLOADS_DIR", "uploads")
 os.makedirs(UPLOADS_DIR, exist_ok=True)
@@ -28,7 +35,13 @@ os.makedirs(UPLOADS_DIR, exist_ok=True)
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     init_db()
+    catalog_sync = asyncio.create_task(shopify_catalog.keep_in_sync()) if shopify_catalog.SYNC_INTERVAL_S > 0 else None
     yield
+    if catalog_sync is not None:
+        catalog_sync.cancel()
+    await _http.close_clients()
+    scraper_cache.close()
+    close_pool()
 
 
 app = FastAPI(title="Sewing Assistant API", lifespan=lifespan)
@@ -41,12 +54,13 @@ if _cors_origins:
         allow_origins=_cors_origins,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["X-Next-Cursor", "X-Total-Count", "ETag"],
     )
 
 
 @app.get("/health")
 def health():
-    return JSONResponse({"status": "ok"})
+    return JSONResponse({"status": "ok", "project_cache": project_cache.cache.stats()})
 
 app.mount("/uploads", StaticFiles(directory=UPLOADS_DIR), name="uploads")
 
@@ -54,16 +68,23 @@ app.include_router(patterns_router, prefix="/api/patterns", tags=["patterns"])
 app.include_router(stores_router, prefix="/api/stores", tags=["stores"])
 app.include_router(materials_router, prefix="/api/materials", tags=["materials"])
 app.include_router(llm_router, prefix="/api/llm", tags=["llm"])
-app.include_router(measurements_router, prefix="/api/measurements", tags=["measurements"])
+# One transaction per request for the database-backed routers; it commits before the response is sent
+_db_request = [Depends(unit_of_work, scope="function")]
+
+app.include_router(measurements_router, prefix="/api/measurements", tags=["measurements"], dependencies=_db_request)
 
 _projects_prefix = "/api/projects"
 _projects_tags = ["projects"]
-app.include_router(project_core_router, prefix=_projects_prefix, tags=_projects_tags)
-app.include_router(project_measurements_router, prefix=_projects_prefix, tags=_projects_tags)
-app.include_router(project_patterns_router, prefix=_projects_prefix, tags=_projects_tags)
-app.include_router(project_checklist_router, prefix=_projects_prefix, tags=_projects_tags)
-app.include_router(project_materials_router, prefix=_projects_prefix, tags=_projects_tags)
-app.include_router(project_images_router, prefix=_projects_prefix, tags=_projects_tags)
+app.include_router(project_core_router, prefix=_projects_prefix, tags=_projects_tags, dependencies=_db_request)
+app.include_router(project_measurements_router, prefix=_projects_prefix, tags=_projects_tags, dependencies=_db_request)
+app.include_router(project_patterns_router, prefix=_projects_prefix, tags=_projects_tags, dependencies=_db_request)
+app.include_router(project_checklist_router, prefix=_projects_prefix, tags=_projects_tags, dependencies=_db_request)
+app.include_router(project_materials_router, prefix=_projects_prefix, tags=_projects_tags, dependencies=_db_request)
+app.include_router(project_images_router, prefix=_projects_prefix, tags=_projects_tags, dependencies=_db_request)
+app.include_router(search_router, prefix="/api/search", tags=["search"], dependencies=_db_request)
+app.include_router(sync_router, prefix="/api/sync", tags=["sync"], dependencies=_db_request)
+# The export streams after the handler returns, so it reads outside any request transaction
+app.include_router(workspace_router, prefix="/api/workspace", tags=["workspace"])
 
 
 static_dir = os.path.join(os.path.dirname(__file__), "static")
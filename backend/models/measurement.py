@@ -1,7 +1,7 @@
 from pydantic import BaseModel, Field
-from models.project import MeasurementsUpdate, GlobalMeasurementSet
+from models.project import MeasurementsUpdate, MeasurementField, GlobalMeasurementSet
 
-__all__ = ["GlobalMeasurementSetCreate", "GlobalMeasurementSet"]
+__all__ = ["GlobalMeasurementSetCreate", "GlobalMeasurementSet", "MeasurementField"]
 
 
 class GlobalMeasurementSetCreate(BaseModel):
@@ -26,3 +26,19 @@ class PatternDetail(BaseModel):
     notions: list[str] = []
     image_url: str | None = None
     url: str
+
+
+class PatternSourceTiming(BaseModel):
+    """How one source did in a federated search."""
+    source: str
+    status: str  # "ok" | "error" | "timeout"
+    elapsed_ms: int
+    hedged: bool = False
+    results: int = 0
+    error: str | None = None
+
+
+class FederatedPatternSearch(BaseModel):
+    """Merged, deduplicated and ranked results from every pattern source."""
+    results: list[PatternSearchResult]
+    sources: list[PatternSourceTiming]
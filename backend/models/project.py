@@ -1,3 +1,5 @@
+from typing import Annotated, Literal
+
 from pydantic import BaseModel, Field
 
 
@@ -17,6 +19,11 @@ class ProjectUpdate(BaseModel):
     budget: float | None = None
 
 
+class ProjectClone(BaseModel):
+    name: str | None = Field(default=None, min_length=1, max_length=200)  # default: "<name> (copy)"
+    reset_progress: bool = False  # uncheck items, unpurchase materials, restart as 'to_start'
+
+
 class ChecklistItemCreate(BaseModel):
     title: str = Field(min_length=1, max_length=500)
     notes: str = Field(default="", max_length=2000)
@@ -32,6 +39,10 @@ class ChecklistReorder(BaseModel):
     ids: list[int]
 
 
+class ChecklistMove(BaseModel):
+    after_id: int | None = None  # None moves the item to the top
+
+
 class ProjectPatternUpdate(BaseModel):
     title: str = Field(default="", max_length=500)
     notes: str | None = None
@@ -119,6 +130,10 @@ class MeasurementsUpdate(BaseModel):
     wrist:                float | None = None
 
 
+# Name of any single measurement, e.g. for range filters
+MeasurementField = Literal[tuple(MeasurementsUpdate.model_fields)]
+
+
 class SkirtMeasurements(BaseModel):
     waist: float = 70.0
     hips: float = 92.0
@@ -237,3 +252,88 @@ class ProjectDetail(BaseModel):
     measurement_sets: list[ProjectMeasurementSet]
     global_measurement_sets: list[GlobalMeasurementSet] = []
     progress_images: list[ProjectProgressImage] = []
+
+
+# --- Batch operations (POST /{project_id}/batch) ---
+
+
+class AddMaterial(BaseModel):
+    type: Literal["add_material"]
+    data: ProjectMaterialCreate
+
+
+class EditMaterial(BaseModel):
+    type: Literal["edit_material"]
+    id: int
+    data: ProjectMaterialFullEdit
+
+
+class DeleteMaterial(BaseModel):
+    type: Literal["delete_material"]
+    id: int
+
+
+class AddChecklistItem(BaseModel):
+    type: Literal["add_checklist_item"]
+    data: ChecklistItemCreate
+
+
+class EditChecklistItem(BaseModel):
+    type: Literal["edit_checklist_item"]
+    id: int
+    data: ChecklistItemUpdate
+
+
+class DeleteChecklistItem(BaseModel):
+    type: Literal["delete_checklist_item"]
+    id: int
+
+
+class AddPattern(BaseModel):
+    type: Literal["add_pattern"]
+    data: ProjectPatternSave
+
+
+class EditPattern(BaseModel):
+    type: Literal["edit_pattern"]
+    id: int
+    data: ProjectPatternUpdate
+
+
+class DeletePattern(BaseModel):
+    type: Literal["delete_pattern"]
+    id: int
+
+
+class AddMeasurementSet(BaseModel):
+    type: Literal["add_measurement_set"]
+    data: ProjectMeasurementSetCreate
+
+
+class EditMeasurementSet(BaseModel):
+    type: Literal["edit_measurement_set"]
+    id: int
+    data: ProjectMeasurementSetCreate
+
+
+class DeleteMeasurementSet(BaseModel):
+    type: Literal["delete_measurement_set"]
+    id: int
+
+
+BatchOperation = Annotated[
+    AddMaterial | EditMaterial | DeleteMaterial
+    | AddChecklistItem | EditChecklistItem | DeleteChecklistItem
+    | AddPattern | EditPattern | DeletePattern
+    | AddMeasurementSet | EditMeasurementSet | DeleteMeasurementSet,
+    Field(discriminator="type"),
+]
+
+
+class ProjectBatch(BaseModel):
+    operations: list[BatchOperation] = Field(min_length=1, max_length=1000)
+
+
+class ProjectBatchResult(BaseModel):
+    # One entry per operation, in order: the added or edited row, or {"id", "deleted"}
+    results: list[dict]
@@ -0,0 +1,14 @@
+from typing import Literal
+
+from pydantic import BaseModel, Field
+
+SearchKind = Literal["project", "checklist_item", "material", "pattern"]
+
+
+class SearchResult(BaseModel):
+    kind: SearchKind
+    id: int
+    project_id: int
+    project_name: str
+    title: str = Field(description="Matched title as escaped HTML, hits wrapped in <mark>")
+    snippet: str = Field(description="Best-matching fragment of the body as escaped HTML, hits wrapped in <mark>")
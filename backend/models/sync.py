@@ -0,0 +1,16 @@
+from pydantic import BaseModel
+
+
+class SyncChange(BaseModel):
+    table: str
+    id: int
+    project_id: int | None
+    deleted: bool
+    updated_at: str
+    row: dict | None  # the row as it is now; None once deleted
+
+
+class SyncPage(BaseModel):
+    changes: list[SyncChange]
+    cursor: str
+    has_more: bool
@@ -0,0 +1,47 @@
+"""Shared SQL for the typed measurement columns of both measurement set tables."""
+import sqlite3
+
+from database import MEASUREMENT_FIELDS
+
+COLUMNS = ", ".join(MEASUREMENT_FIELDS)
+PLACEHOLDERS = ", ".join("?" for _ in MEASUREMENT_FIELDS)
+ASSIGNMENTS = ", ".join(f"{field} = ?" for field in MEASUREMENT_FIELDS)
+
+
+def values(measurements: dict) -> list[float | None]:
+    """Column values in MEASUREMENT_FIELDS order; missing fields are stored as NULL."""
+    return [measurements.get(field) for field in MEASUREMENT_FIELDS]
+
+
+def to_set(row: sqlite3.Row) -> dict:
+    """A measurement set row with its non-NULL measurement columns gathered into one dict."""
+    data = dict(row)
+    data["measurements"] = {
+        field: value for field in MEASUREMENT_FIELDS if (value := data.pop(field)) is not None
+    }
+    return data
+
+
+def as_json(alias: str) -> str:
+    """SQL expression rendering a row's measurement columns as a JSON object without NULLs."""
+    pairs = ", ".join(f"'{field}', {alias}.{field}" for field in MEASUREMENT_FIELDS)
+    # json_patch() drops the keys whose value is null
+    return f"json_patch('{{}}', json_object({pairs}))"
+
+
+def range_filter(field: str | None, min_value: float | None, max_value: float | None) -> tuple[list[str], list]:
+    """WHERE clauses (and their params) keeping sets whose `field` lies within the bounds."""
+    if field is None:
+        return [], []
+    if field not in MEASUREMENT_FIELDS:
+        raise ValueError(f"Unknown measurement: {field}")
+    clauses, params = [], []
+    if min_value is not None:
+        clauses.append(f"{field} >= ?")
+        params.append(min_value)
+    if max_value is not None:
+        clauses.append(f"{field} <= ?")
+        params.append(max_value)
+    if not clauses:
+        clauses.append(f"{field} IS NOT NULL")
+    return clauses, params
@@ -0,0 +1,13 @@
+"""
+Async counterpart of measurements_repository, awaited on the database worker threads.
+"""
+from database import run_db_async
+from repositories import measurements_repository
+
+get_all = run_db_async(measurements_repository.get_all)
+add = run_db_async(measurements_repository.add)
+delete = run_db_async(measurements_repository.delete)
+get_for_project = run_db_async(measurements_repository.get_for_project)
+update = run_db_async(measurements_repository.update)
+link_to_project = run_db_async(measurements_repository.link_to_project)
+unlink_from_project = run_db_async(measurements_repository.unlink_from_project)
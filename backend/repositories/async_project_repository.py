@@ -0,0 +1,64 @@
+"""
+Async counterpart of project_repository: the same functions with the same signatures,
+awaited on the database worker threads instead of blocking the event loop.
+"""
+from database import run_db_async
+from repositories import project_repository
+
+# --- Projects ---
+
+get_projects_page = run_db_async(project_repository.get_projects_page)
+verify_project_totals = run_db_async(project_repository.verify_project_totals)
+get_project = run_db_async(project_repository.get_project)
+get_project_detail = run_db_async(project_repository.get_project_detail)
+create_project = run_db_async(project_repository.create_project)
+update_project = run_db_async(project_repository.update_project)
+update_project_status = run_db_async(project_repository.update_project_status)
+delete_project = run_db_async(project_repository.delete_project)
+clone_project = run_db_async(project_repository.clone_project)
+save_measurements = run_db_async(project_repository.save_measurements)
+
+# --- Checklist ---
+
+get_checklist = run_db_async(project_repository.get_checklist)
+add_checklist_item = run_db_async(project_repository.add_checklist_item)
+reorder_checklist = run_db_async(project_repository.reorder_checklist)
+move_checklist_item = run_db_async(project_repository.move_checklist_item)
+toggle_checklist_item = run_db_async(project_repository.toggle_checklist_item)
+update_checklist_item = run_db_async(project_repository.update_checklist_item)
+delete_checklist_item = run_db_async(project_repository.delete_checklist_item)
+
+# --- Progress images ---
+
+get_progress_images = run_db_async(project_repository.get_progress_images)
+add_progress_image = run_db_async(project_repository.add_progress_image)
+delete_progress_image = run_db_async(project_repository.delete_progress_image)
+
+# --- Saved patterns ---
+
+get_saved_patterns = run_db_async(project_repository.get_saved_patterns)
+save_pattern = run_db_async(project_repository.save_pattern)
+update_pattern = run_db_async(project_repository.update_pattern)
+delete_saved_pattern = run_db_async(project_repository.delete_saved_pattern)
+
+# --- Project materials ---
+
+get_materials = run_db_async(project_repository.get_materials)
+add_material = run_db_async(project_repository.add_material)
+update_material = run_db_async(project_repository.update_material)
+toggle_material_purchased = run_db_async(project_repository.toggle_material_purchased)
+edit_material = run_db_async(project_repository.edit_material)
+delete_material = run_db_async(project_repository.delete_material)
+
+# --- Measurement sets ---
+
+get_measurement_sets = run_db_async(project_repository.get_measurement_sets)
+add_measurement_set = run_db_async(project_repository.add_measurement_set)
+update_measurement_set = run_db_async(project_repository.update_measurement_set)
+delete_measurement_set = run_db_async(project_repository.delete_measurement_set)
+
+# --- Batches ---
+
+batch_insert = run_db_async(project_repository.batch_insert)
+batch_update = run_db_async(project_repository.batch_update)
+batch_delete = run_db_async(project_repository.batch_delete)
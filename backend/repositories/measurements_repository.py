@@ -1,24 +1,26 @@
 from database import get_connection
+from repositories import _measurements
 
 
-def get_all() -> list[dict]:
+def get_all(field: str | None = None, min_value: float | None = None, max_value: float | None = None) -> list[dict]:
+    """Every global set, newest first; with `field`, only those whose value lies within the bounds."""
+    filters, params = _measurements.range_filter(field, min_value, max_value)
     with get_connection() as conn:
         rows = conn.execute(
-            "SELECT * FROM global_measurement_sets ORDER BY created_at DESC"
+            f"SELECT * FROM global_measurement_sets WHERE {' AND '.join(filters) or 1} ORDER BY created_at DESC",
+            params,
         ).fetchall()
-    return [dict(r) for r in rows]
+    return [_measurements.to_set(r) for r in rows]
 
 
-def add(name: str, measurements_json: str) -> dict:
+def add(name: str, measurements: dict) -> dict:
     with get_connection() as conn:
-        cur = conn.execute(
-            "INSERT INTO global_measurement_sets (name, measurements) VALUES (?, ?)",
-            (name, measurements_json),
-        )
         row = conn.execute(
-            "SELECT * FROM global_measurement_sets WHERE id = ?", (cur.lastrowid,)
+            f"INSERT INTO global_measurement_sets (name, {_measurements.COLUMNS})"
+            f" VALUES (?, {_measurements.PLACEHOLDERS}) RETURNING *",
+            (name, *_measurements.values(measurements)),
         ).fetchone()
-    return dict(row)
+    return _measurements.to_set(row)
 
 
 def delete(ms_id: int) -> None:
@@ -37,19 +39,16 @@ def get_for_project(project_id: int) -> list[dict]:
             """,
             (project_id,),
         ).fetchall()
-    return [dict(r) for r in rows]
+    return [_measurements.to_set(r) for r in rows]
 
 
-def update(ms_id: int, name: str, measurements_json: str) -> dict | None:
+def update(ms_id: int, name: str, measurements: dict) -> dict | None:
     with get_connection() as conn:
-        conn.execute(
-            "UPDATE global_measurement_sets SET name = ?, measurements = ? WHERE id = ?",
-            (name, measurements_json, ms_id),
-        )
         row = conn.execute(
-            "SELECT * FROM global_measurement_sets WHERE id = ?", (ms_id,)
+            f"UPDATE global_measurement_sets SET name = ?, {_measurements.ASSIGNMENTS} WHERE id = ? RETURNING *",
+            (name, *_measurements.values(measurements), ms_id),
         ).fetchone()
-    return dict(row) if row else None
+    return _measurements.to_set(row) if row else None
 
 
 def link_to_project(project_id: int, global_ms_ids: list[int]) -> None:
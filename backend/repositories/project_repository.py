@@ -1,25 +1,90 @@
-from database import get_connection
+import json
+import sqlite3
+
+from database import get_connection, CHECKLIST_POSITION_STEP, MEASUREMENT_FIELDS
+from repositories import _measurements
 
 
 # --- Projects ---
 
 
-def get_all_projects() -> list[dict]:
+def get_projects_page(
+    limit: int | None,
+    after: tuple[str, int] | None = None,
+    ascending: bool = False,
+    status: str | None = None,
+    over_budget: bool | None = None,
+    min_budget: float | None = None,
+    max_budget: float | None = None,
+) -> tuple[list[dict], int]:
+    """
+    One keyset page of projects ordered by (created_at, id), plus the total number
+    of projects matching the filters. `after` is the (created_at, id) of the last
+    row of the previous page.
+    """
+    filters, params = [], []
+    if status is not None:
+        filters.append("status = ?")
+        params.append(status)
+    if over_budget is not None:
+        # Matches the idx_projects_over_budget_created expression; NULL budgets match neither
+        filters.append("(total_spent > budget) = ?")
+        params.append(int(over_budget))
+    if min_budget is not None:
+        filters.append("budget >= ?")
+        params.append(min_budget)
+    if max_budget is not None:
+        filters.append("budget <= ?")
+        params.append(max_budget)
+
+    page_filters, page_params = list(filters), list(params)
+    if after is not None:
+        page_filters.append(f"(created_at, id) {'>' if ascending else '<'} (?, ?)")
+        page_params += after
+    direction = "ASC" if ascending else "DESC"
+    page_sql = (
+        f"SELECT * FROM projects WHERE {' AND '.join(page_filters) or 1}"
+        f" ORDER BY created_at {direction}, id {direction}"
+    )
+    if limit is not None:
+        page_sql += " LIMIT ?"
+        page_params.append(limit)
+
+    with get_connection() as conn:
+        rows = conn.execute(page_sql, page_params).fetchall()
+        total = conn.execute(
+            f"SELECT COUNT(*) FROM projects WHERE {' AND '.join(filters) or 1}", params
+        ).fetchone()[0]
+    return [dict(r) for r in rows], total
+
+
+def verify_project_totals(repair: bool = False) -> list[dict]:
+    """
+    Recompute every project's total_spent from scratch and return the projects whose
+    trigger-maintained total has drifted. With repair=True, overwrite them too.
+    """
     with get_connection() as conn:
         rows = conn.execute("""
-            SELECT p.*,
-                COALESCE((
-                    SELECT SUM(m.price) FROM project_materials m
-                    WHERE m.project_id = p.id AND m.purchased = 1 AND m.price IS NOT NULL
-                ), 0) +
-                COALESCE((
-                    SELECT SUM(sp.price_paid) FROM saved_patterns sp
-                    WHERE sp.project_id = p.id AND sp.price_paid IS NOT NULL
-                ), 0) AS total_spent
+            SELECT p.id, p.total_spent AS stored,
+                   COALESCE(m.spent, 0) + COALESCE(sp.spent, 0) AS actual
             FROM projects p
-            ORDER BY p.created_at DESC
+            LEFT JOIN (
+                SELECT project_id, SUM(price) AS spent FROM project_materials
+                WHERE purchased = 1 AND price IS NOT NULL GROUP BY project_id
+            ) m ON m.project_id = p.id
+            LEFT JOIN (
+                SELECT project_id, SUM(price_paid) AS spent FROM saved_patterns
+                WHERE price_paid IS NOT NULL GROUP BY project_id
+            ) sp ON sp.project_id = p.id
+            WHERE ABS(p.total_spent - (COALESCE(m.spent, 0) + COALESCE(sp.spent, 0))) > 1e-6
         """).fetchall()
-    return [dict(r) for r in rows]
+        drifted = [dict(r) for r in rows]
+        if repair and drifted:
+            conn.executemany(
+                "UPDATE projects SET total_spent = ? WHERE id = ?",
+                [(r["actual"], r["id"]) for r in drifted],
+            )
+    return drifted
 
 
 def get_project(project_id: int) -> dict | None:
@@ -30,6 +95,94 @@ def get_project(project_id: int) -> dict | None:
     return dict(row) if row else None
 
 
+def _json_rows(table: str, columns: list[str], order_by: str, extra: dict[str, str] | None = None) -> str:
+    """Subselect that renders a project's child rows as a JSON array of objects."""
+    pairs = [f"'{c}', t.{c}" for c in columns] + [f"'{k}', {v}" for k, v in (extra or {}).items()]
+    return f"""(
+        SELECT json_group_array(json_object({', '.join(pairs)}))
+        FROM (SELECT * FROM {table} WHERE project_id = p.id ORDER BY {order_by}) AS t
+    )"""
+
+
+# Mirrors project_service._parse_checklist_images: a JSON list, a bare string, or nothing
+_CHECKLIST_IMAGE_URLS = """CASE
+    WHEN t.image_url IS NULL OR t.image_url = '' THEN json('[]')
+    WHEN NOT json_valid(t.image_url) THEN json_array(t.image_url)
+    WHEN json_type(t.image_url) = 'array' THEN json(t.image_url)
+    WHEN json_type(t.image_url) = 'text' AND json_extract(t.image_url, '$') <> ''
+        THEN json_array(json_extract(t.image_url, '$'))
+    ELSE json('[]')
+END"""
+
+_PROJECT_DETAIL_SQL = f"""
+    SELECT json_object(
+        'id', p.id, 'name', p.name, 'description', p.description,
+        'budget', p.budget, 'created_at', p.created_at,
+        'patterns', json({_json_rows(
+            "saved_patterns",
+            ["id", "project_id", "source", "title", "url", "image_url", "price", "price_paid", "notes", "saved_at"],
+            "saved_at DESC",
+        )}),
+        'materials', json({_json_rows(
+            "project_materials",
+            ["id", "project_id", "name", "quantity", "notes", "purchased", "price", "image_url",
+             "care_instructions", "grain_direction", "pre_wash", "created_at"],
+            "created_at",
+        )}),
+        'checklist', json({_json_rows(
+            "checklist_items",
+            ["id", "project_id", "title", "notes", "checked", "position", "created_at"],
+            "position, created_at",
+            {"image_urls": _CHECKLIST_IMAGE_URLS},
+        )}),
+        'measurement_sets', json({_json_rows(
+            "project_measurement_sets",
+            ["id", "project_id", "name", "created_at"],
+            "created_at",
+            {"measurements": _measurements.as_json("t")},
+        )}),
+        'global_measurement_sets', json((
+            SELECT json_group_array(json_object(
+                'id', t.id, 'name', t.name, 'created_at', t.created_at,
+                'measurements', {_measurements.as_json("t")}
+            ))
+            FROM (
+                SELECT g.* FROM global_measurement_sets g
+                JOIN project_global_measurements pgm ON g.id = pgm.global_ms_id
+                WHERE pgm.project_id = p.id
+                ORDER BY g.created_at
+            ) AS t
+        )),
+        'progress_images', json({_json_rows(
+            "project_progress_images", ["id", "project_id", "url", "created_at"], "created_at",
+        )})
+    )
+    FROM projects p
+    WHERE p.id = ?
+"""
+
+
+def get_project_detail(project_id: int) -> str | None:
+    """
+    The whole project aggregate as a ProjectDetail-shaped JSON document,
+    built by SQLite in one statement (one connection, one read snapshot).
+    """
+    with get_connection() as conn:
+        row = conn.execute(_PROJECT_DETAIL_SQL, (project_id,)).fetchone()
+    return row[0] if row else None
+
+
+def _insert_child(conn: sqlite3.Connection, sql: str, params: tuple) -> sqlite3.Row | None:
+    """Run an INSERT ... RETURNING into a project child table.
+    Returns None instead of raising when the parent project does not exist."""
+    try:
+        return conn.execute(sql, params).fetchone()
+    except sqlite3.IntegrityError as exc:
+        if "FOREIGN KEY" not in str(exc):
+            raise
+        return None
+
+
 def create_project(name: str, description: str, budget: float | None) -> dict:
     with get_connection() as conn:
         cur = conn.execute(
@@ -41,21 +194,19 @@ def create_project(name: str, description: str, budget: float | None) -> dict:
 
 def update_project(project_id: int, name: str, description: str, budget: float | None) -> dict | None:
     with get_connection() as conn:
-        conn.execute(
-            "UPDATE projects SET name = ?, description = ?, budget = ? WHERE id = ?",
+        row = conn.execute(
+            "UPDATE projects SET name = ?, description = ?, budget = ? WHERE id = ? RETURNING *",
             (name, description, budget, project_id),
-        )
-        row = conn.execute("SELECT * FROM projects WHERE id = ?", (project_id,)).fetchone()
+        ).fetchone()
     return dict(row) if row else None
 
 
 def update_project_status(project_id: int, status: str) -> dict | None:
     with get_connection() as conn:
-        conn.execute(
-            "UPDATE projects SET status = ? WHERE id = ?",
+        row = conn.execute(
+            "UPDATE projects SET status = ? WHERE id = ? RETURNING *",
             (status, project_id),
-        )
-        row = conn.execute("SELECT * FROM projects WHERE id = ?", (project_id,)).fetchone()
+        ).fetchone()
     return dict(row) if row else None
 
 
@@ -64,6 +215,64 @@ def delete_project(project_id: int) -> None:
         conn.execute("DELETE FROM projects WHERE id = ?", (project_id,))
 
 
+def clone_project(project_id: int, name: str | None = None, reset_progress: bool = False) -> dict | None:
+    """
+    Copy a project with its checklist, materials, saved patterns, measurement sets and
+    global set links, one INSERT ... SELECT per table. Children keep their positions and
+    timestamps and point at the same uploaded files. `reset_progress` unchecks every
+    item, marks every material unpurchased and starts the copy as 'to_start'.
+    Progress photos belong to the original and are not copied. None if it doesn't exist.
+    """
+    reset = int(reset_progress)
+    with get_connection() as conn:
+        row = conn.execute(
+            """INSERT INTO projects (name, description, budget, measurements, status)
+               SELECT COALESCE(?, name || ' (copy)'), description, budget, measurements,
+                      CASE WHEN ? THEN 'to_start' ELSE status END
+               FROM projects WHERE id = ?
+               RETURNING id""",
+            (name, reset, project_id),
+        ).fetchone()
+        if row is None:
+            return None
+        clone_id = row["id"]
+        conn.execute(
+            """INSERT INTO checklist_items (project_id, title, notes, checked, created_at, image_url, position)
+               SELECT ?, title, notes, CASE WHEN ? THEN 0 ELSE checked END, created_at, image_url, position
+               FROM checklist_items WHERE project_id = ? ORDER BY id""",
+            (clone_id, reset, project_id),
+        )
+        conn.execute(
+            """INSERT INTO project_materials
+                   (project_id, name, quantity, notes, purchased, image_url, created_at, price,
+                    care_instructions, grain_direction, pre_wash)
+               SELECT ?, name, quantity, notes, CASE WHEN ? THEN 0 ELSE purchased END, image_url, created_at,
+                      price, care_instructions, grain_direction, pre_wash
+               FROM project_materials WHERE project_id = ? ORDER BY id""",
+            (clone_id, reset, project_id),
+        )
+        conn.execute(
+            """INSERT INTO saved_patterns (project_id, source, title, url, image_url, price, saved_at, notes, price_paid)
+               SELECT ?, source, title, url, image_url, price, saved_at, notes, price_paid
+               FROM saved_patterns WHERE project_id = ? ORDER BY id""",
+            (clone_id, project_id),
+        )
+        conn.execute(
+            f"""INSERT INTO project_measurement_sets (project_id, name, created_at, {_measurements.COLUMNS})
+                SELECT ?, name, created_at, {_measurements.COLUMNS}
+                FROM project_measurement_sets WHERE project_id = ? ORDER BY id""",
+            (clone_id, project_id),
+        )
+        conn.execute(
+            """INSERT INTO project_global_measurements (project_id, global_ms_id)
+               SELECT ?, global_ms_id FROM project_global_measurements WHERE project_id = ?""",
+            (clone_id, project_id),
+        )
+        # Read back after the children so total_spent includes them
+        clone = conn.execute("SELECT * FROM projects WHERE id = ?", (clone_id,)).fetchone()
+    return dict(clone)
+
+
 def save_measurements(project_id: int, measurements_json: str) -> None:
     with get_connection() as conn:
         conn.execute(
@@ -84,45 +293,96 @@ def get_checklist(project_id: int) -> list[dict]:
     return [dict(r) for r in rows]
 
 
-def add_checklist_item(project_id: int, title: str, notes: str) -> dict:
+def add_checklist_item(project_id: int, title: str, notes: str) -> dict | None:
     with get_connection() as conn:
-        cur = conn.execute(
+        row = _insert_child(
+            conn,
             """INSERT INTO checklist_items (project_id, title, notes, position)
-               VALUES (?, ?, ?, COALESCE((SELECT MAX(position) FROM checklist_items WHERE project_id = ?), 0) + 1)""",
-            (project_id, title, notes, project_id),
+               VALUES (?, ?, ?, COALESCE((SELECT MAX(position) FROM checklist_items WHERE project_id = ?), 0) + ?)
+               RETURNING id, title""",
+            (project_id, title, notes, project_id, CHECKLIST_POSITION_STEP),
         )
-    return {"id": cur.lastrowid, "title": title}
+    return dict(row) if row else None
 
 
-def reorder_checklist(project_id: int, ordered_ids: list[int]) -> None:
+def reorder_checklist(project_id: int, ordered_ids: list[int]) -> int:
+    """Returns how many of the given items were found in the project."""
     with get_connection() as conn:
-        for pos, item_id in enumerate(ordered_ids, start=1):
-            conn.execute(
-                "UPDATE checklist_items SET position = ? WHERE id = ? AND project_id = ?",
-                (pos, item_id, project_id),
-            )
+        cur = conn.execute(
+            """UPDATE checklist_items SET position = ordered.pos
+               FROM (SELECT value AS id, (key + 1) * ? AS pos FROM json_each(?)) AS ordered
+               WHERE checklist_items.id = ordered.id AND checklist_items.project_id = ?""",
+            (CHECKLIST_POSITION_STEP, json.dumps(ordered_ids), project_id),
+        )
+    return cur.rowcount
+
+
+def _rebalance_checklist(conn: sqlite3.Connection, project_id: int) -> None:
+    conn.execute(
+        """UPDATE checklist_items SET position = ranked.pos * ?
+           FROM (
+               SELECT id, ROW_NUMBER() OVER (ORDER BY position, created_at, id) AS pos
+               FROM checklist_items WHERE project_id = ?
+           ) AS ranked
+           WHERE checklist_items.id = ranked.id""",
+        (CHECKLIST_POSITION_STEP, project_id),
+    )
+
+
+def move_checklist_item(item_id: int, project_id: int, after_id: int | None) -> dict | None:
+    """
+    Move one item to just after `after_id` (or to the top when None) by giving it a
+    position in the gap between its new neighbours. Only that row is written unless
+    the gap is used up, in which case the project's positions are respaced first.
+    Returns None if either item is not in the project.
+    """
+    with get_connection() as conn:
+        for _ in range(2):
+            if after_id is None:
+                prev_pos = 0
+            else:
+                prev = conn.execute(
+                    "SELECT position FROM checklist_items WHERE id = ? AND project_id = ?",
+                    (after_id, project_id),
+                ).fetchone()
+                if not prev or after_id == item_id:
+                    return None
+                prev_pos = prev["position"]
+            next_pos = conn.execute(
+                """SELECT position FROM checklist_items
+                   WHERE project_id = ? AND position > ? AND id != ?
+                   ORDER BY position LIMIT 1""",
+                (project_id, prev_pos, item_id),
+            ).fetchone()
+            if next_pos is None:
+                new_pos = prev_pos + CHECKLIST_POSITION_STEP
+            elif next_pos["position"] - prev_pos > 1:
+                new_pos = (prev_pos + next_pos["position"]) // 2
+            else:
+                _rebalance_checklist(conn, project_id)
+                continue
+            row = conn.execute(
+                "UPDATE checklist_items SET position = ? WHERE id = ? AND project_id = ? RETURNING *",
+                (new_pos, item_id, project_id),
+            ).fetchone()
+            return dict(row) if row else None
+    return None
 
 
 def toggle_checklist_item(item_id: int, project_id: int) -> dict | None:
     with get_connection() as conn:
-        conn.execute(
-            "UPDATE checklist_items SET checked = NOT checked WHERE id = ? AND project_id = ?",
-            (item_id, project_id),
-        )
         row = conn.execute(
-            "SELECT * FROM checklist_items WHERE id = ? AND project_id = ?", (item_id, project_id)
+            "UPDATE checklist_items SET checked = NOT checked WHERE id = ? AND project_id = ? RETURNING *",
+            (item_id, project_id),
         ).fetchone()
     return dict(row) if row else None
 
 
 def update_checklist_item(item_id: int, project_id: int, title: str, notes: str, image_urls_json: str) -> dict | None:
     with get_connection() as conn:
-        conn.execute(
-            "UPDATE checklist_items SET title = ?, notes = ?, image_url = ? WHERE id = ? AND project_id = ?",
-            (title, notes, image_urls_json, item_id, project_id),
-        )
         row = conn.execute(
-            "SELECT * FROM checklist_items WHERE id = ? AND project_id = ?", (item_id, project_id)
+            "UPDATE checklist_items SET title = ?, notes = ?, image_url = ? WHERE id = ? AND project_id = ? RETURNING *",
+            (title, notes, image_urls_json, item_id, project_id),
         ).fetchone()
     return dict(row) if row else None
 
@@ -147,16 +407,14 @@ def get_progress_images(project_id: int) -> list[dict]:
     return [dict(r) for r in rows]
 
 
-def add_progress_image(project_id: int, url: str) -> dict:
+def add_progress_image(project_id: int, url: str) -> dict | None:
     with get_connection() as conn:
-        cur = conn.execute(
-            "INSERT INTO project_progress_images (project_id, url) VALUES (?, ?)",
+        row = _insert_child(
+            conn,
+            "INSERT INTO project_progress_images (project_id, url) VALUES (?, ?) RETURNING *",
             (project_id, url),
         )
-        row = conn.execute(
-            "SELECT * FROM project_progress_images WHERE id = ?", (cur.lastrowid,)
-        ).fetchone()
-    return dict(row)
+    return dict(row) if row else None
 
 
 def delete_progress_image(image_id: int, project_id: int) -> None:
@@ -188,23 +446,22 @@ def save_pattern(
     price: str | None,
     notes: str | None = None,
     price_paid: float | None = None,
-) -> dict:
+) -> dict | None:
     with get_connection() as conn:
-        cur = conn.execute(
-            "INSERT INTO saved_patterns (project_id, source, title, url, image_url, price, notes, price_paid) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        row = _insert_child(
+            conn,
+            """INSERT INTO saved_patterns (project_id, source, title, url, image_url, price, notes, price_paid)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?) RETURNING *""",
             (project_id, source, title, url, image_url, price, notes, price_paid),
         )
-    return {"id": cur.lastrowid, "url": url}
+    return dict(row) if row else None
 
 
 def update_pattern(pattern_id: int, project_id: int, title: str, notes: str | None, price_paid: float | None) -> dict | None:
     with get_connection() as conn:
-        conn.execute(
-            "UPDATE saved_patterns SET title=?, notes=?, price_paid=? WHERE id=? AND project_id=?",
-            (title, notes, price_paid, pattern_id, project_id),
-        )
         row = conn.execute(
-            "SELECT * FROM saved_patterns WHERE id=? AND project_id=?", (pattern_id, project_id)
+            "UPDATE saved_patterns SET title=?, notes=?, price_paid=? WHERE id=? AND project_id=? RETURNING *",
+            (title, notes, price_paid, pattern_id, project_id),
         ).fetchone()
     return dict(row) if row else None
 
@@ -233,15 +490,16 @@ def add_material(
     project_id: int, name: str, quantity: str, notes: str,
     image_url: str | None = None, price: float | None = None,
     care_instructions: str | None = None, grain_direction: str | None = None, pre_wash: int = 0,
-) -> dict:
+) -> dict | None:
     with get_connection() as conn:
-        cur = conn.execute(
+        row = _insert_child(
+            conn,
             """INSERT INTO project_materials
                (project_id, name, quantity, notes, image_url, price, care_instructions, grain_direction, pre_wash)
-               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) RETURNING id, name""",
             (project_id, name, quantity, notes, image_url, price, care_instructions, grain_direction, pre_wash),
         )
-    return {"id": cur.lastrowid, "name": name}
+    return dict(row) if row else None
 
 
 def update_material(material_id: int, project_id: int, purchased: int, price: float | None, quantity: str | None) -> dict | None:
@@ -252,23 +510,17 @@ def update_material(material_id: int, project_id: int, purchased: int, price: fl
             fields += ", quantity = ?"
             params.append(quantity)
         params += [material_id, project_id]
-        conn.execute(
-            f"UPDATE project_materials SET {fields} WHERE id = ? AND project_id = ?", params
-        )
         row = conn.execute(
-            "SELECT * FROM project_materials WHERE id = ? AND project_id = ?", (material_id, project_id)
+            f"UPDATE project_materials SET {fields} WHERE id = ? AND project_id = ? RETURNING *", params
         ).fetchone()
     return dict(row) if row else None
 
 
 def toggle_material_purchased(material_id: int, project_id: int) -> dict | None:
     with get_connection() as conn:
-        conn.execute(
-            "UPDATE project_materials SET purchased = NOT purchased WHERE id = ? AND project_id = ?",
-            (material_id, project_id),
-        )
         row = conn.execute(
-            "SELECT * FROM project_materials WHERE id = ? AND project_id = ?", (material_id, project_id)
+            "UPDATE project_materials SET purchased = NOT purchased WHERE id = ? AND project_id = ? RETURNING *",
+            (material_id, project_id),
         ).fetchone()
     return dict(row) if row else None
 
@@ -279,15 +531,12 @@ def edit_material(
     care_instructions: str | None = None, grain_direction: str | None = None, pre_wash: int = 0,
 ) -> dict | None:
     with get_connection() as conn:
-        conn.execute(
+        row = conn.execute(
             """UPDATE project_materials
                SET name=?, quantity=?, notes=?, image_url=?, price=?,
                    care_instructions=?, grain_direction=?, pre_wash=?
-               WHERE id=? AND project_id=?""",
+               WHERE id=? AND project_id=? RETURNING *""",
             (name, quantity, notes, image_url, price, care_instructions, grain_direction, pre_wash, material_id, project_id),
-        )
-        row = conn.execute(
-            "SELECT * FROM project_materials WHERE id=? AND project_id=?", (material_id, project_id)
         ).fetchone()
     return dict(row) if row else None
 
@@ -303,37 +552,39 @@ def delete_material(material_id: int, project_id: int) -> None:
 # --- Measurement sets ---
 
 
-def get_measurement_sets(project_id: int) -> list[dict]:
+def get_measurement_sets(
+    project_id: int, field: str | None = None, min_value: float | None = None, max_value: float | None = None,
+) -> list[dict]:
+    """A project's sets in creation order; with `field`, only those whose value lies within the bounds."""
+    filters, params = _measurements.range_filter(field, min_value, max_value)
     with get_connection() as conn:
         rows = conn.execute(
-            "SELECT * FROM project_measurement_sets WHERE project_id = ? ORDER BY created_at",
-            (project_id,),
+            f"SELECT * FROM project_measurement_sets WHERE {' AND '.join(['project_id = ?', *filters])}"
+            " ORDER BY created_at",
+            (project_id, *params),
         ).fetchall()
-    return [dict(r) for r in rows]
+    return [_measurements.to_set(r) for r in rows]
 
 
-def add_measurement_set(project_id: int, name: str, measurements_json: str) -> dict:
+def add_measurement_set(project_id: int, name: str, measurements: dict) -> dict | None:
     with get_connection() as conn:
-        cur = conn.execute(
-            "INSERT INTO project_measurement_sets (project_id, name, measurements) VALUES (?, ?, ?)",
-            (project_id, name, measurements_json),
+        row = _insert_child(
+            conn,
+            f"INSERT INTO project_measurement_sets (project_id, name, {_measurements.COLUMNS})"
+            f" VALUES (?, ?, {_measurements.PLACEHOLDERS}) RETURNING *",
+            (project_id, name, *_measurements.values(measurements)),
         )
-        row = conn.execute(
-            "SELECT * FROM project_measurement_sets WHERE id = ?", (cur.lastrowid,)
-        ).fetchone()
-    return dict(row)
+    return _measurements.to_set(row) if row else None
 
 
-def update_measurement_set(ms_id: int, project_id: int, name: str, measurements_json: str) -> dict | None:
+def update_measurement_set(ms_id: int, project_id: int, name: str, measurements: dict) -> dict | None:
     with get_connection() as conn:
-        conn.execute(
-            "UPDATE project_measurement_sets SET name = ?, measurements = ? WHERE id = ? AND project_id = ?",
-            (name, measurements_json, ms_id, project_id),
-        )
         row = conn.execute(
-            "SELECT * FROM project_measurement_sets WHERE id = ? AND project_id = ?", (ms_id, project_id)
+            f"UPDATE project_measurement_sets SET name = ?, {_measurements.ASSIGNMENTS}"
+            " WHERE id = ? AND project_id = ? RETURNING *",
+            (name, *_measurements.values(measurements), ms_id, project_id),
         ).fetchone()
-    return dict(row) if row else None
+    return _measurements.to_set(row) if row else None
 
 
 def delete_measurement_set(ms_id: int, project_id: int) -> None:
@@ -342,3 +593,88 @@ def delete_measurement_set(ms_id: int, project_id: int) -> None:
             "DELETE FROM project_measurement_sets WHERE id = ? AND project_id = ?",
             (ms_id, project_id),
         )
+
+
+# --- Batches ---
+
+# Child tables a batch can write, with the columns it may set
+_BATCH_TABLES: dict[str, tuple[str, frozenset[str]]] = {
+    "material": ("project_materials", frozenset({
+        "name", "quantity", "notes", "image_url", "price", "care_instructions", "grain_direction", "pre_wash",
+    })),
+    "checklist_item": ("checklist_items", frozenset({"title", "notes", "image_url"})),
+    "pattern": ("saved_patterns", frozenset({
+        "source", "title", "url", "image_url", "price", "notes", "price_paid",
+    })),
+    "measurement_set": ("project_measurement_sets", frozenset({"name", *MEASUREMENT_FIELDS})),
+}
+
+
+def _batch_table(entity: str, columns: list[str]) -> str:
+    table, allowed = _BATCH_TABLES[entity]
+    unknown = set(columns) - allowed
+    if unknown:
+        raise ValueError(f"Unknown {entity} fields: {', '.join(sorted(unknown))}")
+    return table
+
+
+def _batch_row(entity: str, row: sqlite3.Row) -> dict:
+    return _measurements.to_set(row) if entity == "measurement_set" else dict(row)
+
+
+def batch_insert(entity: str, project_id: int, rows: list[dict]) -> list[dict]:
+    """
+    Insert rows of one child table in a single INSERT ... SELECT over a JSON array.
+    Every row must have the same keys. Returns the new rows in input order.
+    """
+    columns = list(rows[0])
+    table = _batch_table(entity, columns)
+    names = ", ".join(columns)
+    values = ", ".join(f"json_extract(value, '$.{c}')" for c in columns)
+    params: list = [project_id]
+    if entity == "checklist_item":
+        # Appended after the current last item, in input order
+        names += ", position"
+        values += ", ? + (key + 1) * ?"
+    with get_connection() as conn:
+        if entity == "checklist_item":
+            last = conn.execute(
+                "SELECT COALESCE(MAX(position), 0) FROM checklist_items WHERE project_id = ?", (project_id,)
+            ).fetchone()[0]
+            params += [last, CHECKLIST_POSITION_STEP]
+        inserted = conn.execute(
+            f"INSERT INTO {table} (project_id, {names}) SELECT ?, {values} FROM json_each(?) ORDER BY key RETURNING *",
+            (*params, json.dumps(rows)),
+        ).fetchall()
+    # AUTOINCREMENT ids follow insertion order, RETURNING's order is unspecified
+    return [_batch_row(entity, r) for r in sorted(inserted, key=lambda r: r["id"])]
+
+
+def batch_update(entity: str, project_id: int, rows: list[dict]) -> list[dict]:
+    """
+    Update rows of one child table in a single UPDATE ... FROM a JSON array; each row
+    names its target in "id". Returns the updated rows in input order, skipping ids
+    that are not in the project.
+    """
+    columns = [c for c in rows[0] if c != "id"]
+    table = _batch_table(entity, columns)
+    assignments = ", ".join(f"{c} = json_extract(v.value, '$.{c}')" for c in columns)
+    with get_connection() as conn:
+        updated = conn.execute(
+            f"""UPDATE {table} SET {assignments}
+                FROM json_each(?) AS v
+                WHERE {table}.id = json_extract(v.value, '$.id') AND {table}.project_id = ?
+                RETURNING *""",
+            (json.dumps(rows), project_id),
+        ).fetchall()
+    by_id = {r["id"]: r for r in updated}
+    return [_batch_row(entity, by_id[row["id"]]) for row in rows if row["id"] in by_id]
+
+
+def batch_delete(entity: str, project_id: int, ids: list[int]) -> None:
+    table = _batch_table(entity, [])
+    with get_connection() as conn:
+        conn.execute(
+            f"DELETE FROM {table} WHERE project_id = ? AND id IN (SELECT value FROM json_each(?))",
+            (project_id, json.dumps(ids)),
+        )
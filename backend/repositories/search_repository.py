@@ -0,0 +1,48 @@
+from database import get_connection, SEARCH_KINDS
+
+# highlight()/snippet() wrap matches in these control characters; the service escapes
+# the text and turns them into markup, so stored text can never inject any.
+MATCH_START = "\x02"
+MATCH_END = "\x03"
+
+# bm25 column weights: a hit in a title counts ten times a hit in the body
+_SCORE = "bm25(search_index, 10.0, 1.0)"
+
+
+def search(
+    fts_query: str,
+    limit: int,
+    after: tuple[float, int] | None = None,
+    kind: str | None = None,
+) -> tuple[list[dict], int]:
+    """
+    One page of index rows matching an FTS5 query, best first, plus the total number
+    of matches. `after` is the (score, doc) of the last row of the previous page.
+    """
+    filters, params = ["search_index MATCH ?"], [fts_query]
+    if kind is not None:
+        filters.append(f"search_index.rowid % {len(SEARCH_KINDS)} = ?")
+        params.append(SEARCH_KINDS.index(kind))
+
+    page_filters, page_params = list(filters), list(params)
+    if after is not None:
+        page_filters.append(f"({_SCORE}, search_index.rowid) > (?, ?)")
+        page_params += after
+    page_params.append(limit)
+
+    with get_connection() as conn:
+        rows = conn.execute(f"""
+            SELECT search_index.rowid AS doc, search_index.project_id, p.name AS project_name,
+                   highlight(search_index, 0, '{MATCH_START}', '{MATCH_END}') AS title,
+                   snippet(search_index, 1, '{MATCH_START}', '{MATCH_END}', '…', 16) AS snippet,
+                   {_SCORE} AS score
+            FROM search_index
+            JOIN projects p ON p.id = search_index.project_id
+            WHERE {' AND '.join(page_filters)}
+            ORDER BY score, doc
+            LIMIT ?
+        """, page_params).fetchall()
+        total = conn.execute(
+            f"SELECT COUNT(*) FROM search_index WHERE {' AND '.join(filters)}", params
+        ).fetchone()[0]
+    return [dict(r) for r in rows], total
@@ -0,0 +1,47 @@
+import json
+
+from database import get_connection, SYNC_TABLES
+from repositories import _measurements
+
+
+def get_changes(since: int, limit: int) -> tuple[list[dict], int]:
+    """
+    Up to `limit` changes with a version above `since`, oldest first, each with the
+    row as it is now (None for deletions), plus the database's latest version.
+    """
+    with get_connection() as conn:
+        latest = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'sync_log'").fetchone()
+        entries = [dict(r) for r in conn.execute(
+            """SELECT version, table_name, row_id, project_id, deleted, updated_at
+               FROM sync_log WHERE version > ? ORDER BY version LIMIT ?""",
+            (since, limit),
+        )]
+        live: dict[str, list[int]] = {}
+        for entry in entries:
+            if not entry["deleted"]:
+                live.setdefault(entry["table_name"], []).append(entry["row_id"])
+
+        rows: dict[tuple[str, int], dict] = {}
+        for table, ids in live.items():
+            if table not in SYNC_TABLES:
+                continue
+            for r in conn.execute(
+                f"SELECT * FROM {table} WHERE id IN (SELECT value FROM json_each(?))", (json.dumps(ids),)
+            ):
+                rows[table, r["id"]] = (
+                    _measurements.to_set(r) if table.endswith("measurement_sets") else dict(r)
+                )
+        if "projects" in live:
+            for project_id in live["projects"]:
+                if ("projects", project_id) in rows:
+                    rows["projects", project_id]["global_measurement_set_ids"] = []
+            for r in conn.execute(
+                """SELECT project_id, global_ms_id FROM project_global_measurements
+                   WHERE project_id IN (SELECT value FROM json_each(?))""",
+                (json.dumps(live["projects"]),),
+            ):
+                rows["projects", r["project_id"]]["global_measurement_set_ids"].append(r["global_ms_id"])
+
+    for entry in entries:
+        entry["row"] = None if entry["deleted"] else rows.get((entry["table_name"], entry["row_id"]))
+    return entries, latest[0] if latest else 0
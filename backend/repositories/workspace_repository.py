@@ -0,0 +1,154 @@
+"""
+Whole-workspace reads and bulk inserts for export/import.
+
+Rows travel as plain dicts of the columns below. Exports also carry each project's and
+global set's source id, so links can be remapped. Imports never reuse them: they assign
+ids themselves, right after the table's AUTOINCREMENT sequence, so children can be
+inserted with executemany() without reading back each parent id. Callers run the
+inserts inside one write unit of work, which keeps the ids free.
+"""
+import sqlite3
+from typing import Iterator
+
+from database import get_connection, MEASUREMENT_FIELDS
+
+# (column, SQL default used when an imported row leaves it out or null)
+_Columns = tuple[tuple[str, str | None], ...]
+
+_MEASUREMENTS: _Columns = tuple((field, None) for field in MEASUREMENT_FIELDS)
+
+PROJECT_COLUMNS: _Columns = (
+    ("name", None),
+    ("description", "''"),
+    ("budget", None),
+    ("created_at", "CURRENT_TIMESTAMP"),
+    ("measurements", None),
+    ("status", "'to_start'"),
+)
+
+GLOBAL_SET_COLUMNS: _Columns = (("name", None), ("created_at", "CURRENT_TIMESTAMP")) + _MEASUREMENTS
+
+# project key -> (table, columns, ORDER BY)
+CHILDREN: dict[str, tuple[str, _Columns, str]] = {
+    "checklist": ("checklist_items", (
+        ("title", None),
+        ("notes", "''"),
+        ("checked", "0"),
+        ("created_at", "CURRENT_TIMESTAMP"),
+        ("image_url", None),
+        ("position", None),
+    ), "position, created_at"),
+    "materials": ("project_materials", (
+        ("name", None),
+        ("quantity", "''"),
+        ("notes", "''"),
+        ("purchased", "0"),
+        ("image_url", None),
+        ("created_at", "CURRENT_TIMESTAMP"),
+        ("price", None),
+        ("care_instructions", None),
+        ("grain_direction", None),
+        ("pre_wash", "0"),
+    ), "created_at"),
+    "patterns": ("saved_patterns", (
+        ("source", "''"),
+        ("title", "''"),
+        ("url", None),
+        ("image_url", None),
+        ("price", None),
+        ("saved_at", "CURRENT_TIMESTAMP"),
+        ("notes", None),
+        ("price_paid", None),
+    ), "saved_at"),
+    "progress_images": ("project_progress_images", (
+        ("url", None),
+        ("created_at", "CURRENT_TIMESTAMP"),
+    ), "created_at"),
+    "measurement_sets": ("project_measurement_sets", (
+        ("name", None),
+        ("created_at", "CURRENT_TIMESTAMP"),
+    ) + _MEASUREMENTS, "created_at"),
+}
+
+
+def _select(columns: _Columns) -> str:
+    return ", ".join(name for name, _ in columns)
+
+
+def _insert_sql(table: str, columns: _Columns, leading: tuple[str, ...]) -> str:
+    names = ", ".join(leading + tuple(name for name, _ in columns))
+    values = ", ".join(
+        ["?"] * len(leading)
+        + [f"COALESCE(?, {default})" if default else "?" for _, default in columns]
+    )
+    return f"INSERT INTO {table} ({names}) VALUES ({values})"
+
+
+def _values(row: dict, columns: _Columns) -> tuple:
+    return tuple(row.get(name) for name, _ in columns)
+
+
+def _next_id(conn: sqlite3.Connection, table: str) -> int:
+    row = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = ?", (table,)).fetchone()
+    return (row[0] if row else 0) + 1
+
+
+def iter_workspace() -> Iterator[tuple[str, dict]]:
+    """
+    Every global measurement set, then every project with its children, read from one
+    snapshot: ("global_measurement_set", row) and ("project", aggregate) pairs.
+    Projects are read one at a time, so memory stays flat however large the workspace.
+    """
+    with get_connection() as conn:
+        if not conn.in_transaction:
+            conn.execute("BEGIN")
+        for row in conn.execute(f"SELECT id, {_select(GLOBAL_SET_COLUMNS)} FROM global_measurement_sets ORDER BY id"):
+            yield "global_measurement_set", dict(row)
+        for row in conn.execute(f"SELECT id, {_select(PROJECT_COLUMNS)} FROM projects ORDER BY id"):
+            project = dict(row)
+            for key, (table, columns, order_by) in CHILDREN.items():
+                project[key] = [dict(r) for r in conn.execute(
+                    f"SELECT {_select(columns)} FROM {table} WHERE project_id = ? ORDER BY {order_by}, id",
+                    (row["id"],),
+                )]
+            project["global_measurement_set_ids"] = [r[0] for r in conn.execute(
+                "SELECT global_ms_id FROM project_global_measurements WHERE project_id = ?", (row["id"],)
+            )]
+            yield "project", project
+
+
+def insert_global_measurement_sets(rows: list[dict]) -> list[int]:
+    """Insert global measurement sets in one executemany(); returns their new ids in order."""
+    with get_connection() as conn:
+        first = _next_id(conn, "global_measurement_sets")
+        ids = list(range(first, first + len(rows)))
+        conn.executemany(
+            _insert_sql("global_measurement_sets", GLOBAL_SET_COLUMNS, ("id",)),
+            [(new_id, *_values(row, GLOBAL_SET_COLUMNS)) for new_id, row in zip(ids, rows)],
+        )
+    return ids
+
+
+def insert_projects(projects: list[dict]) -> list[int]:
+    """
+    Insert projects shaped like iter_workspace()'s, children included, with one
+    executemany() per table. `global_measurement_set_ids` must already name rows of
+    this database. Returns the new project ids in order.
+    """
+    with get_connection() as conn:
+        first = _next_id(conn, "projects")
+        ids = list(range(first, first + len(projects)))
+        conn.executemany(
+            _insert_sql("projects", PROJECT_COLUMNS, ("id",)),
+            [(new_id, *_values(p, PROJECT_COLUMNS)) for new_id, p in zip(ids, projects)],
+        )
+        for key, (table, columns, _) in CHILDREN.items():
+            conn.executemany(
+                _insert_sql(table, columns, ("project_id",)),
+                [(new_id, *_values(row, columns)) for new_id, p in zip(ids, projects) for row in p.get(key, [])],
+            )
+        conn.executemany(
+            "INSERT OR IGNORE INTO project_global_measurements (project_id, global_ms_id) VALUES (?, ?)",
+            [(new_id, gid) for new_id, p in zip(ids, projects) for gid in p.get("global_measurement_set_ids", [])],
+        )
+    return ids
@@ -0,0 +1,85 @@
+"""
+Long-lived HTTP clients shared by the scrapers and the store finder.
+
+One client per store host, so every search to a store reuses warm keep-alive (and,
+where the server offers it, HTTP/2) connections instead of paying DNS, TCP and TLS
+setup on each call. URLs users paste can be on any host, so those all go through one
+other client, whose connection limits bound what they keep open. Clients are created
+on first use and closed with the app.
+"""
+import asyncio
+import importlib.util
+import os
+import threading
+from urllib.parse import urlsplit
+
+import httpx
+
+# HTTP/2 needs the optional h2 package (httpx[http2]); fall back to HTTP/1.1 without it
+HTTP2 = importlib.util.find_spec("h2") is not None
+
+LIMITS = httpx.Limits(
+    max_connections=int(os.getenv("SCRAPER_MAX_CONNECTIONS", "20")),
+    max_keepalive_connections=int(os.getenv("SCRAPER_MAX_KEEPALIVE", "10")),
+    keepalive_expiry=float(os.getenv("SCRAPER_KEEPALIVE_EXPIRY_S", "60")),
+)
+TIMEOUT = httpx.Timeout(15.0, connect=5.0)
+
+_lock = threading.Lock()
+_clients: dict[str, httpx.Client] = {}
+_any_host: httpx.Client | None = None
+_async_clients: dict[tuple[str, asyncio.AbstractEventLoop], httpx.AsyncClient] = {}
+
+
+def _host(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}".lower()
+
+
+def client(url: str) -> httpx.Client:
+    """The shared client for `url`'s host."""
+    host = _host(url)
+    with _lock:
+        if host not in _clients:
+            _clients[host] = httpx.Client(http2=HTTP2, limits=LIMITS, timeout=TIMEOUT)
+        return _clients[host]
+
+
+def any_host_client() -> httpx.Client:
+    """The client shared by every host that isn't a store."""
+    global _any_host
+    with _lock:
+        if _any_host is None:
+            _any_host = httpx.Client(http2=HTTP2, limits=LIMITS, timeout=TIMEOUT)
+        return _any_host
+
+
+def async_client(url: str) -> httpx.AsyncClient:
+    """The shared async client for `url`'s host on the running event loop."""
+    key = (_host(url), asyncio.get_running_loop())
+    with _lock:
+        if key not in _async_clients:
+            _async_clients[key] = httpx.AsyncClient(http2=HTTP2, limits=LIMITS, timeout=TIMEOUT)
+        return _async_clients[key]
+
+
+def get(url: str, *, per_host: bool = True, **kwargs) -> httpx.Response:
+    """GET `url` on its host's client; per_host=False for URLs on arbitrary hosts."""
+    return (client(url) if per_host else any_host_client()).get(url, **kwargs)
+
+
+async def close_clients() -> None:
+    """Close every client; called when the app shuts down."""
+    global _any_host
+    loop = asyncio.get_running_loop()
+    with _lock:
+        clients = [*_clients.values(), *([_any_host] if _any_host else [])]
+        # Clients of other (finished) loops can't be awaited here; their sockets just drop
+        async_clients = [c for (_, owner), c in _async_clients.items() if owner is loop]
+        _clients.clear()
+        _async_clients.clear()
+        _any_host = None
+    for c in clients:
+        c.close()
+    for c in async_clients:
+        await c.aclose()
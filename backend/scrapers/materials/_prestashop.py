@@ -1,5 +1,5 @@
 """Shared helper for PrestaShop classic-theme stores (Tonitex, Fine Fabrics Canada)."""
-import httpx
+from scrapers import _http
 from bs4 import BeautifulSoup
 from models.material import FabricSearchResult
 
@@ -10,7 +10,7 @@ HEADERS = {
 
 def search(base_url: str, source: str, query: str, max_results: int = 10) -> list[FabricSearchResult]:
     url = f"{base_url}/en/search?controller=search&s={query}"
-    resp = httpx.get(url, headers=HEADERS, timeout=15, follow_redirects=True)
+    resp = _http.get(url, headers=HEADERS, timeout=15, follow_redirects=True)
     resp.raise_for_status()
 
     soup = BeautifulSoup(resp.text, "html.parser")
@@ -1,5 +1,5 @@
 """Shared helper for Shopify stores using the suggest.json endpoint."""
-import httpx
+from scrapers import _http
 from models.material import FabricSearchResult
 
 HEADERS = {
@@ -12,7 +12,7 @@ def search(base_url: str, source: str, query: str, max_results: int = 10) -> lis
         f"{base_url}/search/suggest.json"
         f"?q={query}&resources[type]=product&resources[limit]={max_results}"
     )
-    resp = httpx.get(url, headers=HEADERS, timeout=15, follow_redirects=True)
+    resp = _http.get(url, headers=HEADERS, timeout=15, follow_redirects=True)
     resp.raise_for_status()
 
     data = resp.json()
@@ -1,4 +1,4 @@
-import httpx
+from scrapers import _http
 from bs4 import BeautifulSoup
 from models.material import FabricSearchResult
 
@@ -13,7 +13,7 @@ HEADERS = {
 def search(query: str, max_results: int = 10) -> list[FabricSearchResult]:
     """Search The Fabric Club (Magento 2, membership-based Montreal retailer)."""
     url = f"{BASE_URL}/en/search?q={query}"
-    resp = httpx.get(url, headers=HEADERS, timeout=15, follow_redirects=True)
+    resp = _http.get(url, headers=HEADERS, timeout=15, follow_redirects=True)
     resp.raise_for_status()
 
     soup = BeautifulSoup(resp.text, "html.parser")
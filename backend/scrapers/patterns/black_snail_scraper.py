@@ -1,4 +1,4 @@
-import httpx
+from scrapers import _http
 from models.pattern import PatternSearchResult, PatternDetail
 
 BASE_URL = "https://blacksnailpatterns.com"
@@ -26,7 +26,7 @@ def search_patterns(query: str, max_results: int = 10) -> list[PatternSearchResu
     Fetches the full catalog and filters by title or tags matching the query.
     No scraping needed — Shopify exposes a public /products.json endpoint.
     """
-    resp = httpx.get(
+    resp = _http.get(
         f"{BASE_URL}/products.json",
         params={"limit": 250},
         headers=HEADERS,
@@ -53,7 +53,7 @@ def search_patterns(query: str, max_results: int = 10) -> list[PatternSearchResu
 
 def list_free_patterns() -> list[PatternSearchResult]:
     """Return all patterns in the Gratis Schnittmuster (free) collection."""
-    resp = httpx.get(
+    resp = _http.get(
         f"{BASE_URL}/collections/gratis-schnittmuster/products.json",
         headers=HEADERS,
         timeout=15,
@@ -69,7 +69,7 @@ def scrape_pattern_detail(url: str) -> PatternDetail:
     Converts the product handle from the URL to a /products/{handle}.json request.
     """
     handle = _handle_from_url(url)
-    resp = httpx.get(
+    resp = _http.get(
         f"{BASE_URL}/products/{handle}.json",
         headers=HEADERS,
         timeout=15,
@@ -81,7 +81,7 @@ def scrape_pattern_detail(url: str) -> PatternDetail:
         return PatternDetail(source="black_snail", title="Unknown", brand="Black Snail Patterns", url=url)
 
     title = product.get("title", "Unknown")
-    price = product.get("variants", [{}])[0].get("price")
+    price = (product.get("variants") or [{}])[0].get("price")
     image_url = (product.get("images") or [{}])[0].get("src")
 
     return PatternDetail(
@@ -96,7 +96,7 @@ def scrape_pattern_detail(url: str) -> PatternDetail:
 
 def _product_to_search_result(product: dict) -> PatternSearchResult:
     handle = product.get("handle", "")
-    price = product.get("variants", [{}])[0].get("price")
+    price = (product.get("variants") or [{}])[0].get("price")
     image_url = (product.get("images") or [{}])[0].get("src")
     return PatternSearchResult(
         source="black_snail",
@@ -1,5 +1,5 @@
 import re
-import httpx
+from scrapers import _http
 from bs4 import BeautifulSoup
 from models.pattern import PatternDetail
 
@@ -16,7 +16,7 @@ def scrape_from_url(url: str) -> PatternDetail:
     Generic fallback scraper for any pattern page.
     Extracts title, price, and image on a best-effort basis.
     """
-    resp = httpx.get(url, headers=HEADERS, timeout=15, follow_redirects=True)
+    resp = _http.get(url, per_host=False, headers=HEADERS, timeout=15, follow_redirects=True)
     resp.raise_for_status()
 
     soup = BeautifulSoup(resp.text, "html.parser")
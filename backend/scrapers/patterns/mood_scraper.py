@@ -1,5 +1,5 @@
 import json
-import httpx
+from scrapers import _http
 from bs4 import BeautifulSoup, Tag
 from models.pattern import PatternSearchResult, PatternDetail
 
@@ -16,7 +16,7 @@ def search_patterns(query: str, max_results: int = 10) -> list[PatternSearchResu
     Search the Mood Fabrics blog for free sewing patterns.
     Uses WordPress built-in search (?s=query).
     """
-    resp = httpx.get(BASE_URL + "/", params={"s": query}, headers=HEADERS, timeout=15)
+    resp = _http.get(BASE_URL + "/", params={"s": query}, headers=HEADERS, timeout=15)
     resp.raise_for_status()
 
     soup = BeautifulSoup(resp.text, "html.parser")
@@ -48,7 +48,7 @@ def scrape_pattern_detail(url: str) -> PatternDetail:
     Extracts fabric/material recommendations from the post body.
     Note: PDF patterns require email signup — we surface the post URL only.
     """
-    resp = httpx.get(url, headers=HEADERS, timeout=15)
+    resp = _http.get(url, headers=HEADERS, timeout=15)
     resp.raise_for_status()
 
     soup = BeautifulSoup(resp.text, "html.parser")
@@ -1,6 +1,6 @@
 import json
 import re
-import httpx
+from scrapers import _http
 from bs4 import BeautifulSoup
 from models.pattern import PatternSearchResult, PatternDetail
 
@@ -31,7 +31,7 @@ def search_patterns(query: str, max_results: int = 10) -> list[PatternSearchResu
     Covers Simplicity, McCall's, Vogue, Butterick, New Look — all on one site.
     No LLM needed.
     """
-    resp = httpx.get(
+    resp = _http.get(
         SEARCH_URL,
         params={"section": "product", "search_query": query},
         headers=HEADERS,
@@ -72,7 +72,7 @@ def scrape_pattern_detail(url: str) -> PatternDetail:
     Extracts structured data from JSON-LD. Fabrics and notions are parsed
     from the description using regex — no LLM needed.
     """
-    resp = httpx.get(url, headers=HEADERS, timeout=15)
+    resp = _http.get(url, headers=HEADERS, timeout=15)
     resp.raise_for_status()
 
     soup = BeautifulSoup(resp.text, "html.parser")
@@ -1,4 +1,4 @@
-import httpx
+from scrapers import _http
 from bs4 import BeautifulSoup
 from models.pattern import PatternSearchResult, PatternDetail
 
@@ -13,7 +13,7 @@ def search_patterns(query: str, max_results: int = 10) -> list[PatternSearchResu
     Search Truly Victorian using WordPress/WooCommerce product search.
     Uses the standard ?s=query&post_type=product URL pattern.
     """
-    resp = httpx.get(
+    resp = _http.get(
         BASE_URL + "/",
         params={"s": query, "post_type": "product"},
         headers=HEADERS,
@@ -30,7 +30,7 @@ def scrape_pattern_detail(url: str) -> PatternDetail:
     Scrape a Truly Victorian product page.
     Uses standard WooCommerce HTML selectors.
     """
-    resp = httpx.get(url, headers=HEADERS, timeout=15)
+    resp = _http.get(url, headers=HEADERS, timeout=15)
     resp.raise_for_status()
 
     soup = BeautifulSoup(resp.text, "html.parser")
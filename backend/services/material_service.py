@@ -1,3 +1,10 @@
+import asyncio
+import json
+import os
+from typing import AsyncIterator
+
+import anyio
+
 from scrapers.materials import (
     tonitex_scraper,
     fabricville_scraper,
@@ -7,6 +14,7 @@ from scrapers.materials import (
     cleanersupply_scraper,
 )
 from models.material import FabricSearchResult
+from services import scraper_cache, shopify_catalog
 
 SCRAPERS = {
     "tonitex": tonitex_scraper,
@@ -17,13 +25,55 @@ SCRAPERS = {
     "cleanersupply": cleanersupply_scraper,
 }
 
+# Seconds each store gets in search_all before it is reported as timed out
+SEARCH_ALL_TIMEOUT_S = float(os.getenv("MATERIAL_SEARCH_TIMEOUT_S", "10"))
+
 
 def search_fabrics(query: str, source: str) -> list[FabricSearchResult]:
     scraper = SCRAPERS.get(source)
     if not scraper:
         raise ValueError(f"Unknown source '{source}'. Valid: {list(SCRAPERS)}")
-    return scraper.search(query)
+    mirrored = shopify_catalog.search(source, query)
+    if mirrored is not None:
+        return mirrored
+    return scraper_cache.cached(source, query, scraper.search, FabricSearchResult)
 
 
 def list_sources() -> list[str]:
     return list(SCRAPERS)
+
+
+async def _search_source(source: str, query: str) -> dict:
+    try:
+        # The scrapers block; a store past its deadline is abandoned, not waited for
+        results = await asyncio.wait_for(
+            anyio.to_thread.run_sync(search_fabrics, query, source, abandon_on_cancel=True),
+            SEARCH_ALL_TIMEOUT_S,
+        )
+    except TimeoutError:
+        return {"source": source, "status": "timeout", "error": f"No answer within {SEARCH_ALL_TIMEOUT_S:g}s"}
+    except Exception as exc:
+        return {"source": source, "status": "error", "error": str(exc)}
+    return {"source": source, "status": "ok", "results": [r.model_dump() for r in results]}
+
+
+def search_all(query: str, sources: list[str] | None = None) -> AsyncIterator[bytes]:
+    """
+    Search every store (or just `sources`) at once, yielding one NDJSON line per store
+    as soon as it answers, fails or runs out of time.
+    """
+    sources = sources or list(SCRAPERS)
+    unknown = [s for s in sources if s not in SCRAPERS]
+    if unknown:
+        raise ValueError(f"Unknown source '{unknown[0]}'. Valid: {list(SCRAPERS)}")
+
+    async def lines() -> AsyncIterator[bytes]:
+        tasks = [asyncio.ensure_future(_search_source(source, query)) for source in dict.fromkeys(sources)]
+        try:
+            for task in asyncio.as_completed(tasks):
+                yield json.dumps(await task).encode() + b"\n"
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    return lines()
@@ -1,49 +1,41 @@
-import json
-from repositories import measurements_repository
+from repositories import async_measurements_repository as measurements_repository
+from services import project_cache
 
 
-def list_global_sets() -> list[dict]:
-    rows = measurements_repository.get_all()
-    for row in rows:
-        row["measurements"] = _parse(row.get("measurements", "{}"))
-    return rows
+async def list_global_sets(
+    field: str | None = None, min_value: float | None = None, max_value: float | None = None,
+) -> list[dict]:
+    return await measurements_repository.get_all(field, min_value, max_value)
 
 
-def add_global_set(name: str, measurements: dict) -> dict:
-    row = measurements_repository.add(name, json.dumps(measurements))
-    row["measurements"] = _parse(row.get("measurements", "{}"))
-    return row
+async def add_global_set(name: str, measurements: dict) -> dict:
+    return await measurements_repository.add(name, measurements)
 
 
-def update_global_set(ms_id: int, name: str, measurements: dict) -> dict | None:
-    row = measurements_repository.update(ms_id, name, json.dumps(measurements))
-    if row:
-        row["measurements"] = _parse(row.get("measurements", "{}"))
-    return row
+async def update_global_set(ms_id: int, name: str, measurements: dict) -> dict | None:
+    try:
+        return await measurements_repository.update(ms_id, name, measurements)
+    finally:
+        project_cache.invalidate_all()  # linked projects embed the set
 
 
-def delete_global_set(ms_id: int) -> None:
-    measurements_repository.delete(ms_id)
+async def delete_global_set(ms_id: int) -> None:
+    try:
+        await measurements_repository.delete(ms_id)
+    finally:
+        project_cache.invalidate_all()  # ON DELETE CASCADE unlinks it from projects
 
 
-def get_for_project(project_id: int) -> list[dict]:
-    rows = measurements_repository.get_for_project(project_id)
-    for row in rows:
-        row["measurements"] = _parse(row.get("measurements", "{}"))
-    return rows
+async def get_for_project(project_id: int) -> list[dict]:
+    return await measurements_repository.get_for_project(project_id)
 
 
-def link_to_project(project_id: int, global_ms_ids: list[int]) -> None:
+async def link_to_project(project_id: int, global_ms_ids: list[int]) -> None:
     if global_ms_ids:
-        measurements_repository.link_to_project(project_id, global_ms_ids)
-
+        await measurements_repository.link_to_project(project_id, global_ms_ids)
+        project_cache.invalidate(project_id)
 
-def unlink_from_project(project_id: int, global_ms_id: int) -> None:
-    measurements_repository.unlink_from_project(project_id, global_ms_id)
 
-
-def _parse(raw: str) -> dict:
-    try:
-        return json.loads(raw)
-    except (json.JSONDecodeError, ValueError):
-        return {}
+async def unlink_from_project(project_id: int, global_ms_id: int) -> None:
+    await measurements_repository.unlink_from_project(project_id, global_ms_id)
+    project_cache.invalidate(project_id)
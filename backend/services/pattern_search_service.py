@@ -0,0 +1,174 @@
+"""
+Federated pattern search: every pattern source at once, under one latency budget,
+merged into a single ranked list.
+
+A source that is slow compared with its own recent history (past its rolling p95)
+gets one hedged duplicate request, and whichever attempt answers first wins. Sources
+still running when the budget runs out are reported as timed out.
+"""
+import asyncio
+import math
+import os
+import re
+import threading
+import time
+from collections import defaultdict, deque
+from urllib.parse import urlsplit
+
+import anyio
+
+from models.pattern import PatternSearchResult
+from services import scraper_cache, shopify_catalog
+from scrapers.patterns import (
+    simplicity_scraper,
+    mood_scraper,
+    black_snail_scraper,
+    truly_victorian_scraper,
+    laughing_moon_scraper,
+)
+
+SCRAPERS = {
+    "simplicity": simplicity_scraper,
+    "mood": mood_scraper,
+    "black_snail": black_snail_scraper,
+    "truly_victorian": truly_victorian_scraper,
+    "laughing_moon": laughing_moon_scraper,
+}
+
+# Seconds a federated search may take overall
+BUDGET_S = float(os.getenv("PATTERN_SEARCH_BUDGET_S", "8"))
+# Successful latencies a source must have before it is hedged against its p95
+HEDGE_MIN_SAMPLES = int(os.getenv("PATTERN_SEARCH_HEDGE_MIN_SAMPLES", "5"))
+
+_WORD = re.compile(r"\w+")
+
+
+class LatencyWindow:
+    """Recent successful response times per source, for the hedging threshold."""
+
+    def __init__(self, size: int = 50):
+        self._lock = threading.Lock()
+        self._samples: dict[str, deque[float]] = defaultdict(lambda: deque(maxlen=size))
+
+    def record(self, source: str, seconds: float) -> None:
+        with self._lock:
+            self._samples[source].append(seconds)
+
+    def p95(self, source: str) -> float | None:
+        with self._lock:
+            samples = sorted(self._samples.get(source, ()))
+        if len(samples) < HEDGE_MIN_SAMPLES:
+            return None
+        return samples[math.ceil(0.95 * len(samples)) - 1]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._samples.clear()
+
+
+latencies = LatencyWindow()
+
+
+def search_source(source: str, query: str) -> list[PatternSearchResult]:
+    """One source's results, from the catalog mirror or the scraper cache when possible."""
+    scraper = SCRAPERS.get(source)
+    if not scraper:
+        raise ValueError(f"Unknown source '{source}'. Valid: {list(SCRAPERS)}")
+    mirrored = shopify_catalog.search(source, query)
+    if mirrored is not None:
+        return mirrored
+
+    def fetch(q: str) -> list[PatternSearchResult]:
+        # Only real round trips count toward the source's latency profile
+        started = time.monotonic()
+        results = scraper.search_patterns(q)
+        latencies.record(source, time.monotonic() - started)
+        return results
+
+    return scraper_cache.cached(source, query, fetch, PatternSearchResult)
+
+
+async def _query_source(source: str, query: str, deadline: float) -> tuple[dict, list[PatternSearchResult]]:
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+
+    def attempt() -> asyncio.Task:
+        return asyncio.ensure_future(anyio.to_thread.run_sync(search_source, source, query, abandon_on_cancel=True))
+
+    def timing(status: str, **extra) -> dict:
+        elapsed_ms = round((loop.time() - started) * 1000)
+        return {"source": source, "status": status, "elapsed_ms": elapsed_ms, "hedged": hedged, **extra}
+
+    attempts = {attempt()}
+    hedge_at = latencies.p95(source)
+    hedged = False
+    error: BaseException | None = None
+    try:
+        while attempts:
+            now = loop.time()
+            if now >= deadline:
+                return timing("timeout"), []
+            wake = deadline
+            if not hedged and hedge_at is not None:
+                if now >= started + hedge_at:
+                    attempts.add(attempt())
+                    hedged = True
+                else:
+                    wake = min(wake, started + hedge_at)
+            done, attempts = await asyncio.wait(attempts, timeout=wake - now, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    results = task.result()
+                    return timing("ok", results=len(results)), results
+                error = task.exception()
+        return timing("error", error=str(error)), []
+    finally:
+        for task in attempts:
+            task.cancel()
+
+
+def _dedup_key(result: PatternSearchResult) -> str:
+    parts = urlsplit(result.url)
+    host = parts.netloc.lower().removeprefix("www.")
+    return f"{host}{parts.path.rstrip('/')}".lower()
+
+
+def _score(result: PatternSearchResult, terms: set[str]) -> float:
+    """Relevance (query terms found in the title, brand and number) weighted over completeness."""
+    text = " ".join(filter(None, (result.title, result.brand, result.pattern_number))).lower()
+    relevance = len(terms & set(_WORD.findall(text))) / len(terms) if terms else 0.0
+    completeness = sum(bool(v) for v in (result.price, result.image_url, result.pattern_number)) / 3
+    return 0.7 * relevance + 0.3 * completeness
+
+
+def merge(query: str, batches: list[list[PatternSearchResult]]) -> list[PatternSearchResult]:
+    """One list without duplicate URLs, best first; duplicates fill in each other's blanks."""
+    merged: dict[str, PatternSearchResult] = {}
+    for batch in batches:
+        for result in batch:
+            key = _dedup_key(result)
+            if key not in merged:
+                merged[key] = result
+                continue
+            kept = merged[key]
+            blanks = {f: v for f, v in result.model_dump().items() if v and not getattr(kept, f)}
+            merged[key] = kept.model_copy(update=blanks)
+    terms = set(_WORD.findall(query.lower()))
+    return sorted(merged.values(), key=lambda r: _score(r, terms), reverse=True)
+
+
+async def search(query: str, sources: list[str] | None = None) -> dict:
+    """
+    Search the given pattern sources (all by default) in parallel within BUDGET_S.
+    Returns {"results": merged ranked list, "sources": per-source status and timing}.
+    """
+    sources = list(dict.fromkeys(sources or SCRAPERS))
+    unknown = [s for s in sources if s not in SCRAPERS]
+    if unknown:
+        raise ValueError(f"Unknown source '{unknown[0]}'. Valid: {list(SCRAPERS)}")
+    deadline = asyncio.get_running_loop().time() + BUDGET_S
+    answers = await asyncio.gather(*(_query_source(source, query, deadline) for source in sources))
+    return {
+        "results": merge(query, [results for _, results in answers]),
+        "sources": [timing for timing, _ in answers],
+    }
@@ -0,0 +1,131 @@
+"""
+In-process LRU cache of serialized project aggregates.
+
+Entries are keyed by (project id, project revision, global revision). Every write in
+project_service bumps the project's revision and every change to a global measurement
+set bumps the global one, so a stale aggregate is never looked up again. Revisions
+live in this process: the cache assumes a single worker, like the SQLite file does.
+
+A write inside a unit of work bumps the revision twice: once right away and once when
+the transaction ends. A read that raced the write (and saw the pre-commit snapshot)
+stores its result under the in-between revision, which nobody asks for afterwards.
+"""
+import os
+import secrets
+import sys
+import threading
+from collections import OrderedDict
+
+import database
+
+MAX_BYTES = int(os.getenv("PROJECT_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+
+Key = tuple[int, int, int]
+
+# Revisions restart at 0 with the process; the epoch keeps old ETags from matching new ones
+EPOCH = secrets.token_hex(4)
+
+
+class ProjectCache:
+    def __init__(self, max_bytes: int = MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[Key, str] = OrderedDict()
+        self._bytes = 0
+        self._revisions: dict[int, int] = {}
+        self._global_revision = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def key(self, project_id: int) -> Key:
+        """The key a read of this project should use; take it before reading the database."""
+        with self._lock:
+            return project_id, self._revisions.get(project_id, 0), self._global_revision
+
+    def get(self, key: Key) -> str | None:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Key, value: str) -> None:
+        size = sys.getsizeof(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key[1:] != (self._revisions.get(key[0], 0), self._global_revision):
+                return  # written to while we were reading
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= sys.getsizeof(old)
+            self._entries[key] = value
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= sys.getsizeof(evicted)
+                self.evictions += 1
+
+    def bump(self, project_id: int) -> None:
+        with self._lock:
+            revision = self._revisions.get(project_id, 0)
+            self._revisions[project_id] = revision + 1
+            stale = self._entries.pop((project_id, revision, self._global_revision), None)
+            if stale is not None:
+                self._bytes -= sys.getsizeof(stale)
+
+    def bump_global(self) -> None:
+        with self._lock:
+            self._global_revision += 1
+            self._entries.clear()
+            self._bytes = 0
+
+    def clear(self) -> None:
+        """Drop every entry, revision and counter (tests only)."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self._revisions.clear()
+            self._global_revision = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+cache = ProjectCache()
+
+
+def _after_transaction(bump) -> None:
+    bump()
+    uow = database.current_unit_of_work.get()
+    if uow is not None:
+        uow.on_close(bump)
+
+
+def invalidate(project_id: int) -> None:
+    """A project (or one of its children) changed."""
+    _after_transaction(lambda: cache.bump(project_id))
+
+
+def invalidate_all() -> None:
+    """Something every project may embed changed, e.g. a global measurement set."""
+    _after_transaction(cache.bump_global)
+
+
+def etag(project_id: int, resource: str) -> str:
+    """Strong ETag of one representation of a project, e.g. "detail" or "checklist"."""
+    _, revision, global_revision = cache.key(project_id)
+    return f'"{EPOCH}-{project_id}.{revision}.{global_revision}-{resource}"'
@@ -0,0 +1,126 @@
+"""
+In-process fan-out of project change events to live subscribers (the SSE feed).
+
+project_service publishes one compact event per write, after its transaction
+commits. Each event is serialized once and handed to every subscriber of the
+project on that subscriber's event loop. Subscribers have a bounded queue: one that
+falls behind loses its backlog and gets a single "resync" event instead, so a slow
+client never holds up writers or grows memory. Like the aggregate cache, this
+assumes a single worker process.
+"""
+import asyncio
+import json
+import os
+import threading
+from collections import defaultdict
+from typing import AsyncIterator
+
+import database
+
+QUEUE_SIZE = int(os.getenv("PROJECT_EVENTS_QUEUE_SIZE", "64"))
+# Seconds between keep-alive comments on an idle stream
+HEARTBEAT_S = float(os.getenv("PROJECT_EVENTS_HEARTBEAT_S", "15"))
+
+RESYNC = "resync"
+
+
+class Subscription:
+    def __init__(self, project_id: int, size: int = QUEUE_SIZE):
+        self.project_id = project_id
+        self.loop = asyncio.get_running_loop()
+        self.queue: asyncio.Queue[tuple[str, str]] = asyncio.Queue(size)
+
+    def _push(self, event: tuple[str, str]) -> None:
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Too far behind: drop the backlog, the client refetches instead
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait((RESYNC, json.dumps({"project_id": self.project_id})))
+
+    async def get(self) -> tuple[str, str]:
+        """The next (event name, JSON data) pair."""
+        return await self.queue.get()
+
+
+class ProjectEvents:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers: dict[int, set[Subscription]] = defaultdict(set)
+
+    def subscribe(self, project_id: int) -> Subscription:
+        subscription = Subscription(project_id)
+        with self._lock:
+            self._subscribers[project_id].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.project_id)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.project_id]
+
+    def has_subscribers(self, project_id: int) -> bool:
+        return project_id in self._subscribers
+
+    def publish(self, project_id: int, event: dict) -> None:
+        """Send `event` to the project's subscribers; callable from any thread."""
+        with self._lock:
+            subscribers = tuple(self._subscribers.get(project_id, ()))
+        if not subscribers:
+            return
+        message = ("change", json.dumps(event))
+        by_loop: dict[asyncio.AbstractEventLoop, list[Subscription]] = defaultdict(list)
+        for subscription in subscribers:
+            by_loop[subscription.loop].append(subscription)
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        for loop, batch in by_loop.items():
+            if loop is running:
+                _fan_out(batch, message)
+                continue
+            try:
+                # One hop per loop, not per subscriber
+                loop.call_soon_threadsafe(_fan_out, batch, message)
+            except RuntimeError:
+                pass  # that loop has shut down; its subscribers are gone
+
+
+def _fan_out(subscriptions: list[Subscription], message: tuple[str, str]) -> None:
+    for subscription in subscriptions:
+        subscription._push(message)
+
+
+events = ProjectEvents()
+
+
+def publish_after_commit(project_id: int, event: dict) -> None:
+    """Publish once the current transaction commits (right away outside one)."""
+    if not events.has_subscribers(project_id):
+        return
+    uow = database.current_unit_of_work.get()
+    if uow is None:
+        events.publish(project_id, event)
+    else:
+        uow.on_commit(lambda: events.publish(project_id, event))
+
+
+async def stream(project_id: int) -> AsyncIterator[str]:
+    """The project's events as Server-Sent Events, until the client goes away."""
+    subscription = events.subscribe(project_id)
+    try:
+        yield ": subscribed\n\n"
+        while True:
+            try:
+                name, data = await asyncio.wait_for(subscription.get(), HEARTBEAT_S)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            yield f"event: {name}\ndata: {data}\n\n"
+    finally:
+        events.unsubscribe(subscription)
@@ -1,84 +1,177 @@
+import base64
+import functools
+import inspect
 import json
-from repositories import project_repository
+from repositories import async_project_repository as project_repository
+from repositories import async_measurements_repository as measurements_repository
+from services import project_cache, project_events
+
+
+def _writes(func):
+    """
+    Invalidate the cached aggregate of the project a write touched, even if it failed
+    halfway, and tell the project's live subscribers about it once it commits.
+    """
+    signature = inspect.signature(func)
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        arguments = signature.bind(*args, **kwargs).arguments
+        project_id = arguments["project_id"]
+        try:
+            result = await func(*args, **kwargs)
+        finally:
+            project_cache.invalidate(project_id)
+        if project_events.events.has_subscribers(project_id):
+            row_id = next((v for k, v in arguments.items() if k.endswith("_id") and k != "project_id"), None)
+            if row_id is None and isinstance(result, dict):
+                row_id = result.get("id")
+            project_events.publish_after_commit(
+                project_id, {"op": func.__name__, "project_id": project_id, "id": row_id}
+            )
+        return result
+
+    return wrapper
 
 
 # --- Projects ---
 
 
-def list_projects() -> list[dict]:
-    return project_repository.get_all_projects()
+def _encode_cursor(row: dict) -> str:
+    raw = json.dumps([row["created_at"], row["id"]]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> tuple[str, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, project_id = json.loads(raw)
+        return str(created_at), int(project_id)
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+
+
+async def list_projects(
+    limit: int | None = None,
+    cursor: str | None = None,
+    ascending: bool = False,
+    status: str | None = None,
+    over_budget: bool | None = None,
+    min_budget: float | None = None,
+    max_budget: float | None = None,
+) -> dict:
+    """
+    A page of projects newest-first (or oldest-first), with the opaque cursor of the
+    next page (None on the last one) and the total matching the filters.
+    """
+    after = _decode_cursor(cursor) if cursor else None
+    rows, total = await project_repository.get_projects_page(
+        limit + 1 if limit is not None else None, after, ascending,
+        status, over_budget, min_budget, max_budget,
+    )
+    next_cursor = None
+    if limit is not None and len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = _encode_cursor(rows[-1])
+    return {"items": rows, "next_cursor": next_cursor, "total": total}
+
+
+async def get_project(project_id: int) -> dict | None:
+    return await project_repository.get_project(project_id)
+
+
+def etag(project_id: int, resource: str) -> str:
+    """
+    ETag of a project read endpoint, without touching the database. Take it before
+    reading: a write that lands in between then changes the tag again.
+    """
+    return project_cache.etag(project_id, resource)
+
+
+async def get_project_detail(project_id: int) -> str | None:
+    """Full project aggregate, already serialized as JSON; served from the cache when current."""
+    key = project_cache.cache.key(project_id)
+    detail = project_cache.cache.get(key)
+    if detail is None:
+        detail = await project_repository.get_project_detail(project_id)
+        if detail is not None:
+            project_cache.cache.put(key, detail)
+    return detail
+
+
+async def create_project(name: str, description: str, budget: float | None) -> dict:
+    return await project_repository.create_project(name, description, budget)
+
 
+@_writes
+async def update_project(project_id: int, name: str, description: str, budget: float | None) -> dict | None:
+    return await project_repository.update_project(project_id, name, description, budget)
 
-def get_project(project_id: int) -> dict | None:
-    return project_repository.get_project(project_id)
 
+@_writes
+async def update_project_status(project_id: int, status: str) -> dict | None:
+    return await project_repository.update_project_status(project_id, status)
 
-def create_project(name: str, description: str, budget: float | None) -> dict:
-    return project_repository.create_project(name, description, budget)
 
+@_writes
+async def delete_project(project_id: int) -> None:
+    await project_repository.delete_project(project_id)
 
-def update_project(project_id: int, name: str, description: str, budget: float | None) -> dict | None:
-    return project_repository.update_project(project_id, name, description, budget)
 
+async def clone_project(project_id: int, name: str | None = None, reset_progress: bool = False) -> dict | None:
+    return await project_repository.clone_project(project_id, name, reset_progress)
 
-def update_project_status(project_id: int, status: str) -> dict | None:
-    return project_repository.update_project_status(project_id, status)
 
+@_writes
+async def link_global_measurement_sets(project_id: int, global_ms_ids: list[int]) -> None:
+    if global_ms_ids:
+        await measurements_repository.link_to_project(project_id, global_ms_ids)
 
-def delete_project(project_id: int) -> None:
-    project_repository.delete_project(project_id)
+
+@_writes
+async def unlink_global_measurement_set(project_id: int, global_ms_id: int) -> None:
+    await measurements_repository.unlink_from_project(project_id, global_ms_id)
 
 
 # --- Progress images ---
 
 
-def get_progress_images(project_id: int) -> list[dict]:
-    return project_repository.get_progress_images(project_id)
+async def get_progress_images(project_id: int) -> list[dict]:
+    return await project_repository.get_progress_images(project_id)
 
 
-def add_progress_image(project_id: int, url: str) -> dict:
-    return project_repository.add_progress_image(project_id, url)
+@_writes
+async def add_progress_image(project_id: int, url: str) -> dict | None:
+    return await project_repository.add_progress_image(project_id, url)
 
 
-def delete_progress_image(image_id: int, project_id: int) -> None:
-    project_repository.delete_progress_image(image_id, project_id)
+@_writes
+async def delete_progress_image(image_id: int, project_id: int) -> None:
+    await project_repository.delete_progress_image(image_id, project_id)
 
 
 # --- Measurement sets ---
 
 
-def get_measurement_sets(project_id: int) -> list[dict]:
-    rows = project_repository.get_measurement_sets(project_id)
-    for row in rows:
-        raw = row.get("measurements", "{}")
-        try:
-            row["measurements"] = json.loads(raw)
-        except (json.JSONDecodeError, ValueError):
-            row["measurements"] = {}
-    return rows
+async def get_measurement_sets(
+    project_id: int, field: str | None = None, min_value: float | None = None, max_value: float | None = None,
+) -> list[dict]:
+    return await project_repository.get_measurement_sets(project_id, field, min_value, max_value)
 
 
-def add_measurement_set(project_id: int, name: str, measurements: dict) -> dict:
-    row = project_repository.add_measurement_set(project_id, name, json.dumps(measurements))
-    try:
-        row["measurements"] = json.loads(row["measurements"])
-    except (json.JSONDecodeError, ValueError):
-        row["measurements"] = {}
-    return row
+@_writes
+async def add_measurement_set(project_id: int, name: str, measurements: dict) -> dict | None:
+    return await project_repository.add_measurement_set(project_id, name, measurements)
 
 
-def update_measurement_set(ms_id: int, project_id: int, name: str, measurements: dict) -> dict | None:
-    row = project_repository.update_measurement_set(ms_id, project_id, name, json.dumps(measurements))
-    if row:
-        try:
-            row["measurements"] = json.loads(row["measurements"])
-        except (json.JSONDecodeError, ValueError):
-            row["measurements"] = {}
-    return row
+@_writes
+async def update_measurement_set(ms_id: int, project_id: int, name: str, measurements: dict) -> dict | None:
+    return await project_repository.update_measurement_set(ms_id, project_id, name, measurements)
 
 
-def delete_measurement_set(ms_id: int, project_id: int) -> None:
-    project_repository.delete_measurement_set(ms_id, project_id)
+@_writes
+async def delete_measurement_set(ms_id: int, project_id: int) -> None:
+    await project_repository.delete_measurement_set(ms_id, project_id)
 
 
 # --- Checklist ---
@@ -98,37 +191,53 @@ def _parse_checklist_images(row: dict) -> dict:
     return row
 
 
-def get_checklist(project_id: int) -> list[dict]:
-    rows = project_repository.get_checklist(project_id)
+async def get_checklist(project_id: int) -> list[dict]:
+    rows = await project_repository.get_checklist(project_id)
     return [_parse_checklist_images(r) for r in rows]
 
 
-def add_checklist_item(project_id: int, title: str, notes: str) -> dict:
-    return project_repository.add_checklist_item(project_id, title, notes)
+@_writes
+async def add_checklist_item(project_id: int, title: str, notes: str) -> dict | None:
+    return await project_repository.add_checklist_item(project_id, title, notes)
+
 
+@_writes
+async def reorder_checklist(project_id: int, ordered_ids: list[int]) -> int:
+    return await project_repository.reorder_checklist(project_id, ordered_ids)
 
-def toggle_checklist_item(item_id: int, project_id: int) -> dict | None:
-    row = project_repository.toggle_checklist_item(item_id, project_id)
+
+@_writes
+async def move_checklist_item(item_id: int, project_id: int, after_id: int | None) -> dict | None:
+    row = await project_repository.move_checklist_item(item_id, project_id, after_id)
+    return _parse_checklist_images(row) if row else None
+
+
+@_writes
+async def toggle_checklist_item(item_id: int, project_id: int) -> dict | None:
+    row = await project_repository.toggle_checklist_item(item_id, project_id)
     return _parse_checklist_images(row) if row else None
 
 
-def update_checklist_item(item_id: int, project_id: int, title: str, notes: str, image_urls: list) -> dict | None:
-    row = project_repository.update_checklist_item(item_id, project_id, title, notes, json.dumps(image_urls))
+@_writes
+async def update_checklist_item(item_id: int, project_id: int, title: str, notes: str, image_urls: list) -> dict | None:
+    row = await project_repository.update_checklist_item(item_id, project_id, title, notes, json.dumps(image_urls))
     return _parse_checklist_images(row) if row else None
 
 
-def delete_checklist_item(item_id: int, project_id: int) -> None:
-    project_repository.delete_checklist_item(item_id, project_id)
+@_writes
+async def delete_checklist_item(item_id: int, project_id: int) -> None:
+    await project_repository.delete_checklist_item(item_id, project_id)
 
 
 # --- Saved patterns ---
 
 
-def get_saved_patterns(project_id: int) -> list[dict]:
-    return project_repository.get_saved_patterns(project_id)
+async def get_saved_patterns(project_id: int) -> list[dict]:
+    return await project_repository.get_saved_patterns(project_id)
 
 
-def save_pattern(
+@_writes
+async def save_pattern(
     project_id: int,
     source: str,
     title: str,
@@ -137,54 +246,127 @@ def save_pattern(
     price: str | None,
     notes: str | None = None,
     price_paid: float | None = None,
-) -> dict:
-    return project_repository.save_pattern(
+) -> dict | None:
+    return await project_repository.save_pattern(
         project_id, source, title, url, image_url, price, notes, price_paid
     )
 
 
-def update_pattern(pattern_id: int, project_id: int, title: str, notes: str | None, price_paid: float | None) -> dict | None:
-    return project_repository.update_pattern(pattern_id, project_id, title, notes, price_paid)
+@_writes
+async def update_pattern(pattern_id: int, project_id: int, title: str, notes: str | None, price_paid: float | None) -> dict | None:
+    return await project_repository.update_pattern(pattern_id, project_id, title, notes, price_paid)
 
 
-def delete_saved_pattern(pattern_id: int, project_id: int) -> None:
-    project_repository.delete_saved_pattern(pattern_id, project_id)
+@_writes
+async def delete_saved_pattern(pattern_id: int, project_id: int) -> None:
+    await project_repository.delete_saved_pattern(pattern_id, project_id)
 
 
 # --- Project materials ---
 
 
-def get_materials(project_id: int) -> list[dict]:
-    return project_repository.get_materials(project_id)
+async def get_materials(project_id: int) -> list[dict]:
+    return await project_repository.get_materials(project_id)
 
 
-def add_material(
+@_writes
+async def add_material(
     project_id: int, name: str, quantity: str, notes: str,
     image_url: str | None = None, price: float | None = None,
     care_instructions: str | None = None, grain_direction: str | None = None, pre_wash: int = 0,
-) -> dict:
-    return project_repository.add_material(
+) -> dict | None:
+    return await project_repository.add_material(
         project_id, name, quantity, notes, image_url, price, care_instructions, grain_direction, pre_wash
     )
 
 
-def update_material(material_id: int, project_id: int, purchased: int, price: float | None, quantity: str | None) -> dict | None:
-    return project_repository.update_material(material_id, project_id, purchased, price, quantity)
+@_writes
+async def update_material(material_id: int, project_id: int, purchased: int, price: float | None, quantity: str | None) -> dict | None:
+    return await project_repository.update_material(material_id, project_id, purchased, price, quantity)
 
 
-def toggle_material_purchased(material_id: int, project_id: int) -> dict | None:
-    return project_repository.toggle_material_purchased(material_id, project_id)
+@_writes
+async def toggle_material_purchased(material_id: int, project_id: int) -> dict | None:
+    return await project_repository.toggle_material_purchased(material_id, project_id)
 
 
-def edit_material(
+@_writes
+async def edit_material(
     material_id: int, project_id: int, name: str, quantity: str, notes: str,
     image_url: str | None, price: float | None,
     care_instructions: str | None = None, grain_direction: str | None = None, pre_wash: int = 0,
 ) -> dict | None:
-    return project_repository.edit_material(
+    return await project_repository.edit_material(
         material_id, project_id, name, quantity, notes, image_url, price, care_instructions, grain_direction, pre_wash
     )
 
 
-def delete_material(material_id: int, project_id: int) -> None:
-    project_repository.delete_material(material_id, project_id)
+@_writes
+async def delete_material(material_id: int, project_id: int) -> None:
+    await project_repository.delete_material(material_id, project_id)
+
+
+# --- Batches ---
+
+
+def _batch_runs(operations: list[dict]) -> list[tuple[str, str, list[dict]]]:
+    """
+    Split operations into runs of one type, each applied as one statement. A run also
+    ends where an id repeats, so ops on the same row keep their order.
+    """
+    runs: list[tuple[str, str, list[dict]]] = []
+    run_ids: set[int] = set()
+    for op in operations:
+        action, entity = op["type"].split("_", 1)
+        target = op.get("id")
+        if not runs or runs[-1][:2] != (action, entity) or target in run_ids:
+            runs.append((action, entity, []))
+            run_ids = set()
+        runs[-1][2].append(op)
+        if target is not None:
+            run_ids.add(target)
+    return runs
+
+
+def _batch_columns(action: str, entity: str, op: dict) -> dict:
+    """The column values an add or edit operation writes."""
+    data = dict(op["data"])
+    if entity == "checklist_item" and action == "edit":
+        data["image_url"] = json.dumps(data.pop("image_urls"))
+    elif entity == "measurement_set":
+        data = {"name": data["name"], **data["measurements"]}
+    if action == "edit":
+        data["id"] = op["id"]
+    return data
+
+
+@_writes
+async def apply_batch(project_id: int, operations: list[dict]) -> list[dict] | None:
+    """
+    Apply typed add/edit/delete operations to a project's children, in order, with one
+    set-based statement per run of same-type operations. Returns one result per
+    operation, or None if the project does not exist. Raises LookupError when an edit
+    targets a row the project doesn't have; callers roll the whole batch back.
+    """
+    if not await project_repository.get_project(project_id):
+        return None
+    results: list[dict] = []
+    for action, entity, run in _batch_runs(operations):
+        if action == "delete":
+            ids = [op["id"] for op in run]
+            await project_repository.batch_delete(entity, project_id, ids)
+            results += [{"id": i, "deleted": True} for i in ids]
+            continue
+        rows = [_batch_columns(action, entity, op) for op in run]
+        if action == "add":
+            written = await project_repository.batch_insert(entity, project_id, rows)
+        else:
+            written = await project_repository.batch_update(entity, project_id, rows)
+            if len(written) < len(rows):
+                found = {r["id"] for r in written}
+                missing = next(row["id"] for row in rows if row["id"] not in found)
+                raise LookupError(f"{entity.replace('_', ' ').capitalize()} {missing} not found")
+        if entity == "checklist_item":
+            written = [_parse_checklist_images(r) for r in written]
+        results += written
+    return results
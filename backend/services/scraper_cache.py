@@ -0,0 +1,161 @@
+"""
+Persistent cache of scraper search results, keyed on source and normalized query.
+
+Entries live in their own SQLite file (SCRAPER_CACHE_PATH): they are disposable, so
+they stay out of the workspace database, its sync feed and its exports. A fresh
+entry is served as-is. An expired one is still served for up to STALE_S while a
+background thread refreshes it. Past that, the search waits for the site again. The
+least recently used entries are dropped beyond MAX_ENTRIES.
+
+The cache never fails a search: if the file can't be read or written, the scraper
+is simply called directly.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, TypeVar
+
+from pydantic import BaseModel
+
+CACHE_PATH = os.getenv("SCRAPER_CACHE_PATH", "scraper_cache.db")
+MAX_ENTRIES = int(os.getenv("SCRAPER_CACHE_MAX_ENTRIES", "5000"))
+# Seconds a result stays fresh, by default and per source ("fabricville=3600,mood=7200")
+TTL_S = float(os.getenv("SCRAPER_CACHE_TTL_S", str(6 * 3600)))
+TTLS = {
+    # Pattern catalogs change far less often than fabric stock
+    "black_snail": 24 * 3600.0,
+    "truly_victorian": 24 * 3600.0,
+    "laughing_moon": 24 * 3600.0,
+    **{
+        source.strip(): float(seconds)
+        for source, _, seconds in (
+            pair.partition("=") for pair in os.getenv("SCRAPER_CACHE_TTLS", "").split(",") if "=" in pair
+        )
+    },
+}
+# Seconds past expiry an entry may still be served while it is refreshed
+STALE_S = float(os.getenv("SCRAPER_CACHE_STALE_S", str(7 * 24 * 3600)))
+
+M = TypeVar("M", bound=BaseModel)
+
+_lock = threading.Lock()
+_conn: sqlite3.Connection | None = None
+_refreshing: set[tuple[str, str]] = set()
+_refresher = ThreadPoolExecutor(max_workers=4, thread_name_prefix="scraper-cache")
+
+
+def normalize(query: str) -> str:
+    return " ".join(query.casefold().split())
+
+
+def _connection() -> sqlite3.Connection:
+    """The shared connection, opened on first use; callers hold _lock."""
+    global _conn
+    if _conn is None:
+        _conn = sqlite3.connect(CACHE_PATH, check_same_thread=False, isolation_level=None)
+        _conn.execute("PRAGMA journal_mode = WAL")
+        _conn.execute("PRAGMA synchronous = NORMAL")
+        _conn.executescript("""
+            CREATE TABLE IF NOT EXISTS search_results (
+                source     TEXT NOT NULL,
+                query      TEXT NOT NULL,
+                results    TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                used_at    REAL NOT NULL,
+                PRIMARY KEY (source, query)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS idx_search_results_used_at ON search_results(used_at);
+        """)
+    return _conn
+
+
+def _lookup(source: str, query: str) -> tuple[list[dict], float] | None:
+    with _lock:
+        conn = _connection()
+        row = conn.execute(
+            "SELECT results, fetched_at FROM search_results WHERE source = ? AND query = ?", (source, query)
+        ).fetchone()
+        if row is None:
+            return None
+        conn.execute(
+            "UPDATE search_results SET used_at = ? WHERE source = ? AND query = ?", (time.time(), source, query)
+        )
+    return json.loads(row[0]), row[1]
+
+
+def _store(source: str, query: str, results: list[BaseModel]) -> None:
+    now = time.time()
+    payload = json.dumps([r.model_dump() for r in results])
+    with _lock:
+        conn = _connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO search_results VALUES (?, ?, ?, ?, ?)", (source, query, payload, now, now)
+            )
+            conn.execute(
+                """DELETE FROM search_results WHERE (source, query) IN (
+                       SELECT source, query FROM search_results ORDER BY used_at
+                       LIMIT max((SELECT COUNT(*) FROM search_results) - ?, 0))""",
+                (MAX_ENTRIES,),
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+
+def _fetch_and_store(source: str, key: str, query: str, fetch: Callable[[str], list[M]]) -> list[M]:
+    results = fetch(query)
+    try:
+        _store(source, key, results)
+    except sqlite3.Error:
+        pass
+    return results
+
+
+def _refresh(source: str, key: str, query: str, fetch: Callable[[str], list[BaseModel]]) -> None:
+    try:
+        _fetch_and_store(source, key, query, fetch)
+    except Exception:
+        pass  # keep serving the stale entry; the next search past expiry tries again
+    finally:
+        with _lock:
+            _refreshing.discard((source, key))
+
+
+def cached(source: str, query: str, fetch: Callable[[str], list[M]], model: type[M]) -> list[M]:
+    """`fetch(query)` for `source`, answered from the cache when possible.
+    Entries are keyed on the normalized query, but `fetch` gets the query as given."""
+    key = normalize(query)
+    try:
+        entry = _lookup(source, key)
+    except sqlite3.Error:
+        entry = None
+    if entry is None:
+        return _fetch_and_store(source, key, query, fetch)
+
+    rows, fetched_at = entry
+    age = time.time() - fetched_at
+    ttl = TTLS.get(source, TTL_S)
+    if age > ttl + STALE_S:
+        return _fetch_and_store(source, key, query, fetch)
+    if age > ttl:
+        with _lock:
+            start = (source, key) not in _refreshing
+            _refreshing.add((source, key))
+        if start:
+            _refresher.submit(_refresh, source, key, query, fetch)
+    return [model.model_validate(row) for row in rows]
+
+
+def close() -> None:
+    """Close the cache file; refreshes still running finish in the background."""
+    global _conn
+    with _lock:
+        if _conn is not None:
+            _conn.close()
+        _conn = None
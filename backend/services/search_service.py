@@ -0,0 +1,63 @@
+import base64
+import html
+import json
+import re
+
+from database import run_db, SEARCH_KINDS
+from repositories import search_repository
+
+_WORD = re.compile(r"\w+")
+
+
+def _fts_query(text: str) -> str:
+    """Every word of the user's text as a quoted prefix term, all of them required."""
+    words = _WORD.findall(text)
+    if not words:
+        raise ValueError("Search query has no words")
+    # Quoting keeps FTS5 operators and punctuation in user input from being parsed
+    return " ".join(f'"{word}"*' for word in words)
+
+
+def _encode_cursor(row: dict) -> str:
+    raw = json.dumps([row["score"], row["doc"]]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> tuple[float, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        score, doc = json.loads(raw)
+        return float(score), int(doc)
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+
+
+def _markup(text: str | None) -> str:
+    escaped = html.escape(text or "")
+    return escaped.replace(search_repository.MATCH_START, "<mark>").replace(search_repository.MATCH_END, "</mark>")
+
+
+async def search(query: str, limit: int = 20, cursor: str | None = None, kind: str | None = None) -> dict:
+    """
+    One page of workspace search results, best match first, with the opaque cursor
+    of the next page (None on the last one) and the total number of matches.
+    """
+    fts_query = _fts_query(query)
+    after = _decode_cursor(cursor) if cursor else None
+    rows, total = await run_db(search_repository.search, fts_query, limit + 1, after, kind)
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = _encode_cursor(rows[-1])
+    items = [
+        {
+            "kind": SEARCH_KINDS[row["doc"] % len(SEARCH_KINDS)],
+            "id": row["doc"] // len(SEARCH_KINDS),
+            "project_id": row["project_id"],
+            "project_name": row["project_name"],
+            "title": _markup(row["title"]),
+            "snippet": _markup(row["snippet"]),
+        }
+        for row in rows
+    ]
+    return {"items": items, "next_cursor": next_cursor, "total": total}
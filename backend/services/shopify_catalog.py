@@ -0,0 +1,274 @@
+"""
+Local mirror of the Shopify stores' product catalogs, searched from memory.
+
+Each store's public /products.json is paged through in full, then incrementally:
+later passes ask only for products updated since the newest one seen, and a full
+pass every FULL_SYNC_S also drops products the store removed. Products are kept in
+their own SQLite file (SHOPIFY_CATALOG_PATH) so a restart serves search at once,
+and every sync swaps in a fresh inverted index over title, tags and product type.
+
+Until a store has been mirrored, search() returns None and callers use the live
+scraper instead.
+"""
+import asyncio
+import bisect
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Callable
+
+import anyio
+from pydantic import BaseModel
+
+from models.material import FabricSearchResult
+from scrapers import _http
+from scrapers.materials import _shopify, fabricville_scraper, spool_of_thread_scraper
+from scrapers.patterns import black_snail_scraper
+
+CATALOG_PATH = os.getenv("SHOPIFY_CATALOG_PATH", "shopify_catalog.db")
+# Seconds between syncs; 0 (the default) turns the background sync off
+SYNC_INTERVAL_S = float(os.getenv("SHOPIFY_CATALOG_SYNC_S", "0"))
+FULL_SYNC_S = float(os.getenv("SHOPIFY_CATALOG_FULL_SYNC_S", str(24 * 3600)))
+
+PAGE_SIZE = 250  # the most products.json returns per page
+MAX_PAGES = 200
+
+_WORD = re.compile(r"\w+")
+
+
+def _fabric_result(source: str, base_url: str) -> Callable[[dict], FabricSearchResult]:
+    def to_result(product: dict) -> FabricSearchResult:
+        price = (product.get("variants") or [{}])[0].get("price")
+        return FabricSearchResult(
+            source=source,
+            title=product.get("title", ""),
+            price=_shopify._format_price(price) if price else None,
+            image_url=(product.get("images") or [{}])[0].get("src"),
+            url=f"{base_url}/products/{product.get('handle', '')}",
+        )
+    return to_result
+
+
+@dataclass(frozen=True)
+class Store:
+    base_url: str
+    to_result: Callable[[dict], BaseModel]
+
+
+STORES = {
+    "black_snail": Store(black_snail_scraper.BASE_URL, black_snail_scraper._product_to_search_result),
+    "fabricville": Store(
+        fabricville_scraper.BASE_URL, _fabric_result(fabricville_scraper.SOURCE, fabricville_scraper.BASE_URL)
+    ),
+    "spool_of_thread": Store(
+        spool_of_thread_scraper.BASE_URL,
+        _fabric_result(spool_of_thread_scraper.SOURCE, spool_of_thread_scraper.BASE_URL),
+    ),
+}
+
+
+@dataclass
+class Index:
+    """Products of one store with a token -> product positions map."""
+    products: list[dict] = field(default_factory=list)
+    postings: dict[str, set[int]] = field(default_factory=dict)
+    tokens: list[str] = field(default_factory=list)  # sorted, for prefix lookups
+
+    @classmethod
+    def build(cls, products: list[dict]) -> "Index":
+        index = cls(products=products)
+        for position, product in enumerate(products):
+            for token in _tokens(product):
+                index.postings.setdefault(token, set()).add(position)
+        index.tokens = sorted(index.postings)
+        return index
+
+    def _prefixed(self, prefix: str) -> set[int]:
+        matches: set[int] = set()
+        start = bisect.bisect_left(self.tokens, prefix)
+        for token in self.tokens[start:]:
+            if not token.startswith(prefix):
+                break
+            matches |= self.postings[token]
+        return matches
+
+    def search(self, query: str, max_results: int) -> list[dict]:
+        """Products matching every query word; the last word may be a prefix (search as you type)."""
+        terms = _WORD.findall(query.casefold())
+        if not terms:
+            return []
+        *whole, last = terms
+        hits = self._prefixed(last)
+        for term in whole:
+            hits &= self.postings.get(term, set())
+        # Title matches first, then catalog order (most recently updated first)
+        title_words = {p: set(_WORD.findall(self.products[p].get("title", "").casefold())) for p in hits}
+        ranked = sorted(hits, key=lambda p: (-sum(t in title_words[p] for t in terms), p))
+        return [self.products[p] for p in ranked[:max_results]]
+
+
+def _tags(product: dict) -> list[str]:
+    tags = product.get("tags") or []
+    return [t.strip() for t in tags.split(",")] if isinstance(tags, str) else tags
+
+
+def _tokens(product: dict) -> set[str]:
+    text = " ".join([product.get("title") or "", product.get("product_type") or "", *_tags(product)])
+    return set(_WORD.findall(text.casefold()))
+
+
+def _compact(product: dict) -> dict:
+    """The fields search and the result models use."""
+    return {
+        "id": product["id"],
+        "title": product.get("title", ""),
+        "handle": product.get("handle", ""),
+        "product_type": product.get("product_type", ""),
+        "tags": _tags(product),
+        "variants": [{"price": v.get("price")} for v in (product.get("variants") or [])[:1]],
+        "images": [{"src": i.get("src")} for i in (product.get("images") or [])[:1]],
+        "updated_at": _utc(product.get("updated_at")),
+    }
+
+
+def _utc(timestamp: str | None) -> str:
+    if not timestamp:
+        return ""
+    try:
+        return datetime.fromisoformat(timestamp).astimezone(timezone.utc).isoformat()
+    except ValueError:
+        return ""
+
+
+_lock = threading.Lock()
+_indexes: dict[str, Index] = {}
+
+
+def _connect() -> sqlite3.Connection:
+    conn = sqlite3.connect(CATALOG_PATH)
+    conn.executescript("""
+        CREATE TABLE IF NOT EXISTS products (
+            store      TEXT NOT NULL,
+            id         INTEGER NOT NULL,
+            updated_at TEXT NOT NULL,
+            product    TEXT NOT NULL,
+            PRIMARY KEY (store, id)
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS sync_state (
+            store        TEXT PRIMARY KEY,
+            updated_at   TEXT NOT NULL,
+            full_sync_at REAL NOT NULL
+        );
+    """)
+    return conn
+
+
+def _load(conn: sqlite3.Connection, store: str) -> None:
+    rows = conn.execute(
+        "SELECT product FROM products WHERE store = ? ORDER BY updated_at DESC, id", (store,)
+    ).fetchall()
+    index = Index.build([json.loads(row[0]) for row in rows])
+    with _lock:
+        _indexes[store] = index
+
+
+def load() -> None:
+    """Index every store mirrored by an earlier run."""
+    conn = _connect()
+    try:
+        synced = [row[0] for row in conn.execute("SELECT store FROM sync_state")]
+        for store in synced:
+            if store in STORES:
+                _load(conn, store)
+    finally:
+        conn.close()
+
+
+def _pages(store: str, updated_since: str | None):
+    """Each page of products, with whether it was cut off at MAX_PAGES while more were left."""
+    params = {"limit": PAGE_SIZE}
+    if updated_since:
+        params["updated_at_min"] = updated_since
+    url = f"{STORES[store].base_url}/products.json"
+    for page in range(1, MAX_PAGES + 1):
+        resp = _http.get(url, params={**params, "page": page}, headers=_shopify.HEADERS, timeout=30)
+        resp.raise_for_status()
+        products = resp.json().get("products", [])
+        yield products, page == MAX_PAGES and len(products) == PAGE_SIZE
+        if len(products) < PAGE_SIZE:
+            return
+
+
+def sync_store(store: str) -> int:
+    """Bring one store's mirror up to date and re-index it; returns how many products changed."""
+    conn = _connect()
+    try:
+        state = conn.execute("SELECT updated_at, full_sync_at FROM sync_state WHERE store = ?", (store,)).fetchone()
+        full = state is None or time.time() - state[1] >= FULL_SYNC_S
+        known = dict(conn.execute("SELECT id, updated_at FROM products WHERE store = ?", (store,)).fetchall())
+
+        changed, seen = [], set()
+        newest = state[0] if state else ""
+        capped = False
+        # Stores that ignore updated_at_min just send everything; unchanged rows are skipped below
+        for products, capped in _pages(store, None if full else newest or None):
+            for product in products:
+                compact = _compact(product)
+                seen.add(compact["id"])
+                if compact["updated_at"] != known.get(compact["id"]):
+                    changed.append(compact)
+                newest = max(newest, compact["updated_at"])
+        # A pass cut off at MAX_PAGES never saw the rest of the catalog: it can't tell
+        # what the store removed, and the next pass must be a full one again
+        complete = full and not capped
+        removed = set(known) - seen if complete else set()
+
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO products VALUES (?, ?, ?, ?)",
+                [(store, p["id"], p["updated_at"], json.dumps(p)) for p in changed],
+            )
+            conn.executemany("DELETE FROM products WHERE store = ? AND id = ?", [(store, i) for i in removed])
+            conn.execute(
+                "INSERT OR REPLACE INTO sync_state VALUES (?, ?, ?)",
+                (store, newest, time.time() if complete else state[1] if state else 0),
+            )
+        if changed or removed or store not in _indexes:
+            _load(conn, store)
+        return len(changed) + len(removed)
+    finally:
+        conn.close()
+
+
+def search(store: str, query: str, max_results: int = 10) -> list[BaseModel] | None:
+    """Search a mirrored store in memory, or None if `store` isn't mirrored (yet)."""
+    index = _indexes.get(store)
+    if index is None:
+        return None
+    return [STORES[store].to_result(product) for product in index.search(query, max_results)]
+
+
+def clear() -> None:
+    """Forget the in-memory indexes (the mirror file is kept)."""
+    with _lock:
+        _indexes.clear()
+
+
+async def keep_in_sync() -> None:
+    """Serve what earlier runs mirrored, then sync every store every SYNC_INTERVAL_S."""
+    try:
+        await anyio.to_thread.run_sync(load)
+    except sqlite3.Error:
+        pass
+    while True:
+        for store in STORES:
+            try:
+                await anyio.to_thread.run_sync(sync_store, store)
+            except Exception:
+                pass  # the store stays searchable from the last good sync, or live
+        await asyncio.sleep(SYNC_INTERVAL_S)
@@ -1,4 +1,4 @@
-import httpx
+from scrapers import _http
 
 OVERPASS_URL = "https://overpass-api.de/api/interpreter"
 
@@ -18,10 +18,10 @@ async def find_nearby_stores(lat: float, lon: float, radius_m: int = 10000) -> l
 
     try:
         headers = {"User-Agent": "SewingAssistant/1.0 (store finder)"}
-        async with httpx.AsyncClient(headers=headers) as client:
-            resp = await client.post(OVERPASS_URL, data={"data": query}, timeout=30)
-            resp.raise_for_status()
-            elements = resp.json().get("elements", [])
+        client = _http.async_client(OVERPASS_URL)
+        resp = await client.post(OVERPASS_URL, data={"data": query}, headers=headers, timeout=30)
+        resp.raise_for_status()
+        elements = resp.json().get("elements", [])
     except Exception:
         return []
     return [
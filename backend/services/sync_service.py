@@ -0,0 +1,42 @@
+from database import run_db
+from repositories import sync_repository
+from services.project_service import _parse_checklist_images
+
+
+def _decode_cursor(cursor: str) -> int:
+    try:
+        version = int(cursor)
+    except ValueError:
+        raise ValueError("Invalid cursor")
+    if version < 0:
+        raise ValueError("Invalid cursor")
+    return version
+
+
+async def get_changes(cursor: str | None = None, limit: int = 500) -> dict:
+    """
+    Rows inserted, updated or deleted since `cursor` (everything without one), oldest
+    change first, with the cursor to pass next time. A row changed several times shows
+    up once, as it is now. `has_more` means another call will return more changes.
+    """
+    since = _decode_cursor(cursor) if cursor else 0
+    entries, latest = await run_db(sync_repository.get_changes, since, limit + 1)
+    if since > latest:
+        raise ValueError("Cursor is ahead of this database; sync again without one")
+    has_more = len(entries) > limit
+    entries = entries[:limit]
+    changes = []
+    for entry in entries:
+        row = entry["row"]
+        if row is not None and entry["table_name"] == "checklist_items":
+            row = _parse_checklist_images(row)
+        changes.append({
+            "table": entry["table_name"],
+            "id": entry["row_id"],
+            "project_id": entry["project_id"],
+            "deleted": bool(entry["deleted"]),
+            "updated_at": entry["updated_at"],
+            "row": row,
+        })
+    next_version = entries[-1]["version"] if has_more else latest
+    return {"changes": changes, "cursor": str(next_version), "has_more": has_more}
@@ -0,0 +1,255 @@
+"""
+Workspace export and import as NDJSON, one JSON document per line:
+
+    {"type": "header", "format": "sewing-assistant-workspace", "version": 1}
+    {"type": "global_measurement_set", "id": 3, "name": ..., <measurement columns>}
+    {"type": "file", "url": "/uploads/a.png", "sha256": ..., "data": <base64>}
+    {"type": "project", "id": 7, "name": ..., "checklist": [...], "materials": [...], ...}
+
+A file line comes right before the first project that references the upload. With
+files left out of the export, file lines carry only the content hash, and the import
+links to an upload with that hash if the target instance already has it. The import
+stores files in a first pass over the export, before it takes the database writer.
+"""
+import base64
+import binascii
+import hashlib
+import json
+import os
+import re
+import sqlite3
+from typing import IO, Iterable, Iterator
+
+import anyio
+
+from database import run_db
+from repositories import workspace_repository
+
+UPLOADS_DIR = os.getenv("UPLOADS_DIR", "uploads")
+
+FORMAT = "sewing-assistant-workspace"
+VERSION = 1
+
+# Child rows (plus the projects themselves) gathered per executemany() batch
+IMPORT_BATCH_ROWS = int(os.getenv("WORKSPACE_IMPORT_BATCH_ROWS", "1000"))
+
+_CHUNK_BYTES = 64 * 1024
+_UPLOADS_PREFIX = "/uploads/"
+_SHA256 = re.compile(r"[0-9a-f]{64}")
+_EXTENSION = re.compile(r"\.[A-Za-z0-9]{1,10}")
+
+
+def _upload_path(url: str | None) -> str | None:
+    """Local path of an uploaded file URL, or None for external and malformed URLs."""
+    if not url or not url.startswith(_UPLOADS_PREFIX):
+        return None
+    name = url[len(_UPLOADS_PREFIX):]
+    if not name or name.startswith(".") or "/" in name or "\\" in name:
+        return None
+    return os.path.join(UPLOADS_DIR, name)
+
+
+def _checklist_urls(raw: str | None) -> list[str]:
+    try:
+        urls = json.loads(raw or "[]")
+    except ValueError:
+        return [raw]
+    if isinstance(urls, str):
+        return [urls] if urls else []
+    return urls if isinstance(urls, list) else []
+
+
+def _project_urls(project: dict) -> Iterator[str]:
+    for row in project["progress_images"]:
+        yield row["url"]
+    for key in ("materials", "patterns"):
+        for row in project[key]:
+            if row["image_url"]:
+                yield row["image_url"]
+    for row in project["checklist"]:
+        yield from _checklist_urls(row["image_url"])
+
+
+def _rewrite_urls(project: dict, urls: dict[str, str]) -> None:
+    """Point the project's upload references at the files the import stored."""
+    for row in project.get("progress_images", []):
+        row["url"] = urls.get(row.get("url"), row.get("url"))
+    for key in ("materials", "patterns"):
+        for row in project.get(key, []):
+            row["image_url"] = urls.get(row.get("image_url"), row.get("image_url"))
+    for row in project.get("checklist", []):
+        if row.get("image_url"):
+            row["image_url"] = json.dumps([urls.get(u, u) for u in _checklist_urls(row["image_url"])])
+
+
+def _sha256(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+def _line(record: dict) -> bytes:
+    return json.dumps(record, ensure_ascii=False).encode() + b"\n"
+
+
+def _export_lines(include_files: bool) -> Iterator[bytes]:
+    yield _line({"type": "header", "format": FORMAT, "version": VERSION})
+    exported: set[str] = set()
+    for kind, row in workspace_repository.iter_workspace():
+        if kind == "project":
+            for url in _project_urls(row):
+                path = _upload_path(url)
+                if url in exported or path is None or not os.path.isfile(path):
+                    continue
+                exported.add(url)
+                record = {"type": "file", "url": url, "sha256": _sha256(path)}
+                if include_files:
+                    with open(path, "rb") as f:
+                        record["data"] = base64.b64encode(f.read()).decode()
+                yield _line(record)
+        yield _line({"type": kind, **row})
+
+
+def export_workspace(include_files: bool = True) -> Iterator[bytes]:
+    """The whole workspace as NDJSON, in chunks of about 64 KB, produced as it is read."""
+    chunk = bytearray()
+    for line in _export_lines(include_files):
+        chunk += line
+        if len(chunk) >= _CHUNK_BYTES:
+            yield bytes(chunk)
+            chunk.clear()
+    if chunk:
+        yield bytes(chunk)
+
+
+def _store_file(record: dict, counts: dict, created: list[str]) -> str:
+    """
+    Save (or find) an exported upload; returns the URL the imported rows should use.
+    Paths of files written here are added to `created`.
+    """
+    url, sha256 = record.get("url"), record.get("sha256")
+    if not isinstance(url, str) or not isinstance(sha256, str) or not _SHA256.fullmatch(sha256):
+        raise ValueError("File record needs a url and a sha256")
+    extension = os.path.splitext(url)[1]
+    name = sha256 + (extension if _EXTENSION.fullmatch(extension) else "")
+    path = os.path.join(UPLOADS_DIR, name)
+
+    if "data" in record:
+        try:
+            content = base64.b64decode(record["data"], validate=True)
+        except (binascii.Error, TypeError):
+            raise ValueError(f"File {url} is not valid base64")
+        if hashlib.sha256(content).hexdigest() != sha256:
+            raise ValueError(f"File {url} does not match its sha256")
+        if not os.path.exists(path):
+            partial = f"{path}.{os.getpid()}.part"
+            with open(partial, "wb") as f:
+                f.write(content)
+            os.replace(partial, path)
+            created.append(path)
+        counts["files"] += 1
+        return _UPLOADS_PREFIX + name
+
+    if os.path.isfile(path):
+        return _UPLOADS_PREFIX + name
+    original = _upload_path(url)
+    if original is None or not os.path.isfile(original) or _sha256(original) != sha256:
+        counts["missing_files"] += 1
+    return url
+
+
+def _parse(number: int, raw: bytes) -> object:
+    try:
+        return json.loads(raw)
+    except ValueError:
+        raise ValueError(f"Line {number}: not valid JSON")
+
+
+def _store_files(lines: Iterable[bytes], counts: dict, created: list[str]) -> dict[str, str]:
+    """Store every file line's upload; returns exported URL -> URL to use instead."""
+    urls: dict[str, str] = {}
+    for number, raw in enumerate(lines, 1):
+        if not raw.strip():
+            continue
+        record = _parse(number, raw)
+        if isinstance(record, dict) and record.get("type") == "file":
+            urls[record.get("url")] = _store_file(record, counts, created)
+    return urls
+
+
+def _import(lines: Iterable[bytes], urls: dict[str, str], counts: dict) -> dict:
+    global_ids: dict[int, int] = {}
+    global_sets: list[dict] = []
+    projects: list[dict] = []
+    pending_rows = 0
+
+    def flush_global_sets() -> None:
+        new_ids = workspace_repository.insert_global_measurement_sets(global_sets)
+        global_ids.update(zip((row.get("id") for row in global_sets), new_ids))
+        counts["global_measurement_sets"] += len(global_sets)
+        global_sets.clear()
+
+    def flush_projects() -> None:
+        nonlocal pending_rows
+        workspace_repository.insert_projects(projects)
+        counts["projects"] += len(projects)
+        projects.clear()
+        pending_rows = 0
+
+    header_seen = False
+    try:
+        for number, raw in enumerate(lines, 1):
+            if not raw.strip():
+                continue
+            record = _parse(number, raw)
+            kind = record.pop("type", None) if isinstance(record, dict) else None
+            if not header_seen:
+                if kind != "header" or record.get("format") != FORMAT or record.get("version") != VERSION:
+                    raise ValueError(f"Line {number}: not a version {VERSION} workspace export")
+                header_seen = True
+            elif kind == "global_measurement_set":
+                global_sets.append(record)
+            elif kind == "file":
+                pass  # stored by _store_files
+            elif kind == "project":
+                if global_sets:
+                    flush_global_sets()
+                ids = record.get("global_measurement_set_ids", [])
+                record["global_measurement_set_ids"] = [global_ids[i] for i in ids if i in global_ids]
+                _rewrite_urls(record, urls)
+                projects.append(record)
+                pending_rows += 1 + sum(len(record.get(key, [])) for key in workspace_repository.CHILDREN)
+                if pending_rows >= IMPORT_BATCH_ROWS:
+                    flush_projects()
+            else:
+                raise ValueError(f"Line {number}: unknown record type {kind!r}")
+        if not header_seen:
+            raise ValueError("Empty workspace export")
+        if global_sets:
+            flush_global_sets()
+        if projects:
+            flush_projects()
+    except (sqlite3.IntegrityError, AttributeError, TypeError) as exc:
+        raise ValueError(f"Malformed workspace export: {exc}")
+    return counts
+
+
+async def import_workspace(source: IO[bytes]) -> dict:
+    """
+    Add every global measurement set, project and upload of an export to this
+    workspace, in the current unit of work. Returns how many of each were imported.
+    `source` is read twice: uploads are stored first, then the rows are inserted.
+    Files this import wrote are removed again if it fails.
+    """
+    counts = {"projects": 0, "global_measurement_sets": 0, "files": 0, "missing_files": 0}
+    created: list[str] = []
+    try:
+        urls = await anyio.to_thread.run_sync(_store_files, source, counts, created)
+        source.seek(0)
+        return await run_db(_import, source, urls, counts)
+    except BaseException:
+        for path in created:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        raise
@@ -7,3 +7,26 @@ import pytest
 def mock_init_db():
     with patch("database.init_db"):
         yield
+
+
+# Keep cached scraper results in a throwaway file, fresh for every test
+@pytest.fixture(autouse=True)
+def scraper_cache_file(tmp_path, monkeypatch):
+    from services import scraper_cache
+    scraper_cache.close()  # the connection is opened on first use, from the new path
+    monkeypatch.setattr(scraper_cache, "CACHE_PATH", str(tmp_path / "scraper_cache.db"))
+    yield
+    scraper_cache.close()
+
+
+# Point the database module at a throwaway file for tests that need real SQL
+@pytest.fixture
+def temp_db(tmp_path, monkeypatch):
+    import database
+    from services import project_cache
+    database.close_pool()
+    project_cache.cache.clear()
+    monkeypatch.setattr(database, "DB_PATH", str(tmp_path / "test.db"))
+    yield database
+    database.close_pool()
+    project_cache.cache.clear()
@@ -64,7 +64,7 @@ def _mock_response(data: dict, status: int = 200):
 # --- search_patterns ---
 
 def test_search_matches_by_title():
-    with patch("scrapers.patterns.black_snail_scraper.httpx.get", return_value=_mock_response(MOCK_PRODUCTS_JSON)):
+    with patch("scrapers.patterns.black_snail_scraper._http.get", return_value=_mock_response(MOCK_PRODUCTS_JSON)):
         results = search_patterns("dress")
     assert len(results) == 1
     assert "Visiting Dress" in results[0].title
@@ -72,32 +72,32 @@ def test_search_matches_by_title():
 
 
 def test_search_matches_by_tag():
-    with patch("scrapers.patterns.black_snail_scraper.httpx.get", return_value=_mock_response(MOCK_PRODUCTS_JSON)):
+    with patch("scrapers.patterns.black_snail_scraper._http.get", return_value=_mock_response(MOCK_PRODUCTS_JSON)):
         results = search_patterns("men")
     assert len(results) == 1
     assert "Trousers" in results[0].title
 
 
 def test_search_extracts_price():
-    with patch("scrapers.patterns.black_snail_scraper.httpx.get", return_value=_mock_response(MOCK_PRODUCTS_JSON)):
+    with patch("scrapers.patterns.black_snail_scraper._http.get", return_value=_mock_response(MOCK_PRODUCTS_JSON)):
         results = search_patterns("dress")
     assert results[0].price == "12.50"
 
 
 def test_search_extracts_image():
-    with patch("scrapers.patterns.black_snail_scraper.httpx.get", return_value=_mock_response(MOCK_PRODUCTS_JSON)):
+    with patch("scrapers.patterns.black_snail_scraper._http.get", return_value=_mock_response(MOCK_PRODUCTS_JSON)):
         results = search_patterns("dress")
     assert "tv101.jpg" in results[0].image_url
 
 
 def test_search_sets_brand():
-    with patch("scrapers.patterns.black_snail_scraper.httpx.get", return_value=_mock_response(MOCK_PRODUCTS_JSON)):
+    with patch("scrapers.patterns.black_snail_scraper._http.get", return_value=_mock_response(MOCK_PRODUCTS_JSON)):
         results = search_patterns("dress")
     assert results[0].brand == "Black Snail Patterns"
 
 
 def test_search_no_match_returns_empty():
-    with patch("scrapers.patterns.black_snail_scraper.httpx.get", return_value=_mock_response(MOCK_PRODUCTS_JSON)):
+    with patch("scrapers.patterns.black_snail_scraper._http.get", return_value=_mock_response(MOCK_PRODUCTS_JSON)):
         results = search_patterns("wedding")
     assert results == []
 
@@ -105,7 +105,7 @@ def test_search_no_match_returns_empty():
 # --- list_free_patterns ---
 
 def test_list_free_returns_results():
-    with patch("scrapers.patterns.black_snail_scraper.httpx.get", return_value=_mock_response(MOCK_FREE_JSON)):
+    with patch("scrapers.patterns.black_snail_scraper._http.get", return_value=_mock_response(MOCK_FREE_JSON)):
         results = list_free_patterns()
     assert len(results) == 1
     assert results[0].title == "Free Corset Pattern"
@@ -114,26 +114,26 @@ def test_list_free_returns_results():
 # --- scrape_pattern_detail ---
 
 def test_detail_extracts_title():
-    with patch("scrapers.patterns.black_snail_scraper.httpx.get", return_value=_mock_response(MOCK_PRODUCT_JSON)):
+    with patch("scrapers.patterns.black_snail_scraper._http.get", return_value=_mock_response(MOCK_PRODUCT_JSON)):
         detail = scrape_pattern_detail("https://blacksnailpatterns.com/products/tv101-visiting-dress")
     assert detail.title == "TV101 Visiting Dress 1872"
     assert detail.source == "black_snail"
 
 
 def test_detail_extracts_price():
-    with patch("scrapers.patterns.black_snail_scraper.httpx.get", return_value=_mock_response(MOCK_PRODUCT_JSON)):
+    with patch("scrapers.patterns.black_snail_scraper._http.get", return_value=_mock_response(MOCK_PRODUCT_JSON)):
         detail = scrape_pattern_detail("https://blacksnailpatterns.com/products/tv101-visiting-dress")
     assert detail.price == "12.50"
 
 
 def test_detail_extracts_image():
-    with patch("scrapers.patterns.black_snail_scraper.httpx.get", return_value=_mock_response(MOCK_PRODUCT_JSON)):
+    with patch("scrapers.patterns.black_snail_scraper._http.get", return_value=_mock_response(MOCK_PRODUCT_JSON)):
         detail = scrape_pattern_detail("https://blacksnailpatterns.com/products/tv101-visiting-dress")
     assert "tv101.jpg" in detail.image_url
 
 
 def test_detail_missing_product_returns_unknown():
-    with patch("scrapers.patterns.black_snail_scraper.httpx.get", return_value=_mock_response({"product": None})):
+    with patch("scrapers.patterns.black_snail_scraper._http.get", return_value=_mock_response({"product": None})):
         detail = scrape_pattern_detail("https://blacksnailpatterns.com/products/missing")
     assert detail.title == "Unknown"
 
@@ -0,0 +1,109 @@
+import sqlite3
+from database import init_db, get_connection, MIGRATIONS, _m008_sync_log
+
+
+def _columns(conn, table):
+    return {row["name"] for row in conn.execute(f"PRAGMA table_info({table})")}
+
+
+def test_init_db_migrates_fresh_database(temp_db):
+    init_db()
+    with get_connection() as conn:
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == len(MIGRATIONS)
+        assert {"position", "image_url"} <= _columns(conn, "checklist_items")
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+def test_init_db_up_to_date_reads_only_user_version(temp_db):
+    init_db()
+    statements = []
+    with get_connection() as conn:
+        conn.set_trace_callback(statements.append)
+    init_db()
+    with get_connection() as conn:
+        conn.set_trace_callback(None)
+    assert statements == ["PRAGMA user_version"]
+
+
+def test_init_db_upgrades_legacy_database(temp_db):
+    # Schema as it looked before the image_url/position/price columns existed
+    legacy = sqlite3.connect(temp_db.DB_PATH)
+    legacy.executescript("""
+        CREATE TABLE projects (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL,
+            description TEXT NOT NULL DEFAULT '', budget REAL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+        CREATE TABLE checklist_items (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            project_id INTEGER NOT NULL REFERENCES projects(id) ON DELETE CASCADE,
+            title TEXT NOT NULL, notes TEXT NOT NULL DEFAULT '',
+            checked INTEGER NOT NULL DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+        INSERT INTO projects (name) VALUES ('A'), ('B');
+        INSERT INTO checklist_items (project_id, title, created_at) VALUES
+            (1, 'second', '2026-01-02'), (1, 'first', '2026-01-01'), (2, 'only', '2026-01-01');
+    """)
+    legacy.close()
+
+    init_db()
+
+    with get_connection() as conn:
+        assert "status" in _columns(conn, "projects")
+        rows = conn.execute("SELECT title, position FROM checklist_items ORDER BY id").fetchall()
+    # Creation order, spaced out by the sparse-position migration
+    assert [(r["title"], r["position"]) for r in rows] == [("second", 2048), ("first", 1024), ("only", 1024)]
+
+
+def test_init_db_moves_measurement_json_into_columns(temp_db):
+    legacy = sqlite3.connect(temp_db.DB_PATH)
+    legacy.executescript("""
+        CREATE TABLE projects (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL,
+            description TEXT NOT NULL DEFAULT '', budget REAL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+        CREATE TABLE project_measurement_sets (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            project_id INTEGER NOT NULL REFERENCES projects(id) ON DELETE CASCADE,
+            name TEXT NOT NULL, measurements TEXT NOT NULL DEFAULT '{}',
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+        CREATE TABLE global_measurement_sets (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL,
+            measurements TEXT NOT NULL DEFAULT '{}',
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+        INSERT INTO projects (name) VALUES ('A');
+        INSERT INTO project_measurement_sets (project_id, name, measurements) VALUES
+            (1, 'typed', '{"waist": 70, "bustFront": 45.5}'), (1, 'broken', 'not json');
+        INSERT INTO global_measurement_sets (name, measurements) VALUES ('text', '{"hips": "96", "neck": 38.0}');
+    """)
+    legacy.close()
+
+    init_db()
+
+    with get_connection() as conn:
+        assert "measurements" not in _columns(conn, "project_measurement_sets")
+        assert "measurements" not in _columns(conn, "global_measurement_sets")
+        sets = conn.execute("SELECT name, waist, bustFront, hips FROM project_measurement_sets ORDER BY id").fetchall()
+        assert [tuple(r) for r in sets] == [("typed", 70.0, 45.5, None), ("broken", None, None, None)]
+        # Non-numeric values are dropped rather than stored as text
+        assert tuple(conn.execute("SELECT hips, neck FROM global_measurement_sets").fetchone()) == (None, 38.0)
+
+
+def test_init_db_logs_existing_rows_for_sync(temp_db):
+    with get_connection() as conn:
+        before = MIGRATIONS.index(_m008_sync_log)
+        for migrate in MIGRATIONS[:before]:
+            migrate(conn)
+        conn.execute(f"PRAGMA user_version = {before}")
+        conn.execute("INSERT INTO projects (name) VALUES ('A')")
+        conn.execute("INSERT INTO checklist_items (project_id, title) VALUES (1, 'Cut')")
+
+    init_db()
+
+    with get_connection() as conn:
+        logged = conn.execute("SELECT table_name, row_id, deleted FROM sync_log ORDER BY version").fetchall()
+    assert [tuple(r) for r in logged] == [("projects", 1, 0), ("checklist_items", 1, 0)]
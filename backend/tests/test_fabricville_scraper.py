@@ -31,43 +31,43 @@ def _mock_resp(data=MOCK_SUGGEST):
 
 
 def test_returns_results():
-    with patch("scrapers.materials._shopify.httpx.get", return_value=_mock_resp()):
+    with patch("scrapers.materials._shopify._http.get", return_value=_mock_resp()):
         results = search("cotton")
     assert len(results) == 2
 
 
 def test_title_extracted():
-    with patch("scrapers.materials._shopify.httpx.get", return_value=_mock_resp()):
+    with patch("scrapers.materials._shopify._http.get", return_value=_mock_resp()):
         results = search("cotton")
     assert results[0].title == "Cotton Poplin Fabric"
 
 
 def test_price_formatted_as_cad():
-    with patch("scrapers.materials._shopify.httpx.get", return_value=_mock_resp()):
+    with patch("scrapers.materials._shopify._http.get", return_value=_mock_resp()):
         results = search("cotton")
     assert results[0].price == "CAD $12.99"
 
 
 def test_image_url_extracted():
-    with patch("scrapers.materials._shopify.httpx.get", return_value=_mock_resp()):
+    with patch("scrapers.materials._shopify._http.get", return_value=_mock_resp()):
         results = search("cotton")
     assert "cotton-poplin.jpg" in results[0].image_url
 
 
 def test_relative_url_made_absolute():
-    with patch("scrapers.materials._shopify.httpx.get", return_value=_mock_resp()):
+    with patch("scrapers.materials._shopify._http.get", return_value=_mock_resp()):
         results = search("cotton")
     assert results[0].url == "https://fabricville.com/products/cotton-poplin"
 
 
 def test_source_is_fabricville():
-    with patch("scrapers.materials._shopify.httpx.get", return_value=_mock_resp()):
+    with patch("scrapers.materials._shopify._http.get", return_value=_mock_resp()):
         results = search("cotton")
     assert results[0].source == "fabricville"
 
 
 def test_empty_suggest_returns_empty_list():
     empty = {"resources": {"results": {"products": []}}}
-    with patch("scrapers.materials._shopify.httpx.get", return_value=_mock_resp(empty)):
+    with patch("scrapers.materials._shopify._http.get", return_value=_mock_resp(empty)):
         results = search("xyzzy")
     assert results == []
@@ -22,25 +22,25 @@ def _mock_resp(html=MOCK_HTML):
 
 
 def test_returns_results():
-    with patch("scrapers.materials._prestashop.httpx.get", return_value=_mock_resp()):
+    with patch("scrapers.materials._prestashop._http.get", return_value=_mock_resp()):
         results = search("silk")
     assert len(results) == 1
 
 
 def test_source_is_fine_fabrics_canada():
-    with patch("scrapers.materials._prestashop.httpx.get", return_value=_mock_resp()):
+    with patch("scrapers.materials._prestashop._http.get", return_value=_mock_resp()):
         results = search("silk")
     assert results[0].source == "fine_fabrics_canada"
 
 
 def test_title_and_price():
-    with patch("scrapers.materials._prestashop.httpx.get", return_value=_mock_resp()):
+    with patch("scrapers.materials._prestashop._http.get", return_value=_mock_resp()):
         results = search("silk")
     assert results[0].title == "Silk Charmeuse"
     assert results[0].price == "$38.00"
 
 
 def test_product_url_is_absolute():
-    with patch("scrapers.materials._prestashop.httpx.get", return_value=_mock_resp()):
+    with patch("scrapers.materials._prestashop._http.get", return_value=_mock_resp()):
         results = search("silk")
     assert results[0].url.startswith("https://")
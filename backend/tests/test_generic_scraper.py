@@ -66,19 +66,19 @@ def _mock_response(html: str, status: int = 200):
 # --- title extraction ---
 
 def test_extracts_h1_as_title():
-    with patch("scrapers.patterns.generic_scraper.httpx.get", return_value=_mock_response(MOCK_FULL_HTML)):
+    with patch("scrapers.patterns.generic_scraper._http.get", return_value=_mock_response(MOCK_FULL_HTML)):
         result = scrape_from_url("https://corsetsrus.com/pattern/corset")
     assert result.title == "Amazing Corset Pattern"
 
 
 def test_falls_back_to_og_title():
-    with patch("scrapers.patterns.generic_scraper.httpx.get", return_value=_mock_response(MOCK_NO_H1_HTML)):
+    with patch("scrapers.patterns.generic_scraper._http.get", return_value=_mock_response(MOCK_NO_H1_HTML)):
         result = scrape_from_url("https://sewingshop.com/mystery")
     assert result.title == "Mystery Pattern"
 
 
 def test_falls_back_to_title_tag():
-    with patch("scrapers.patterns.generic_scraper.httpx.get", return_value=_mock_response(MOCK_MINIMAL_HTML)):
+    with patch("scrapers.patterns.generic_scraper._http.get", return_value=_mock_response(MOCK_MINIMAL_HTML)):
         result = scrape_from_url("https://example.com/page")
     assert result.title == "Just a Page"
 
@@ -86,19 +86,19 @@ def test_falls_back_to_title_tag():
 # --- price extraction ---
 
 def test_extracts_price_from_text():
-    with patch("scrapers.patterns.generic_scraper.httpx.get", return_value=_mock_response(MOCK_FULL_HTML)):
+    with patch("scrapers.patterns.generic_scraper._http.get", return_value=_mock_response(MOCK_FULL_HTML)):
         result = scrape_from_url("https://corsetsrus.com/pattern/corset")
     assert result.price == "$18.00"
 
 
 def test_extracts_price_from_og_meta():
-    with patch("scrapers.patterns.generic_scraper.httpx.get", return_value=_mock_response(MOCK_OG_PRICE_HTML)):
+    with patch("scrapers.patterns.generic_scraper._http.get", return_value=_mock_response(MOCK_OG_PRICE_HTML)):
         result = scrape_from_url("https://example.com/shirt")
     assert "14.99" in result.price
 
 
 def test_no_price_returns_none():
-    with patch("scrapers.patterns.generic_scraper.httpx.get", return_value=_mock_response(MOCK_MINIMAL_HTML)):
+    with patch("scrapers.patterns.generic_scraper._http.get", return_value=_mock_response(MOCK_MINIMAL_HTML)):
         result = scrape_from_url("https://example.com/page")
     assert result.price is None
 
@@ -106,19 +106,19 @@ def test_no_price_returns_none():
 # --- image extraction ---
 
 def test_extracts_og_image():
-    with patch("scrapers.patterns.generic_scraper.httpx.get", return_value=_mock_response(MOCK_FULL_HTML)):
+    with patch("scrapers.patterns.generic_scraper._http.get", return_value=_mock_response(MOCK_FULL_HTML)):
         result = scrape_from_url("https://corsetsrus.com/pattern/corset")
     assert result.image_url == "https://corsetsrus.com/images/corset.jpg"
 
 
 def test_resolves_relative_image_url():
-    with patch("scrapers.patterns.generic_scraper.httpx.get", return_value=_mock_response(MOCK_RELATIVE_IMG_HTML)):
+    with patch("scrapers.patterns.generic_scraper._http.get", return_value=_mock_response(MOCK_RELATIVE_IMG_HTML)):
         result = scrape_from_url("https://example.com/pattern")
     assert result.image_url == "https://example.com/images/blouse.jpg"
 
 
 def test_no_image_returns_none():
-    with patch("scrapers.patterns.generic_scraper.httpx.get", return_value=_mock_response(MOCK_MINIMAL_HTML)):
+    with patch("scrapers.patterns.generic_scraper._http.get", return_value=_mock_response(MOCK_MINIMAL_HTML)):
         result = scrape_from_url("https://example.com/page")
     assert result.image_url is None
 
@@ -126,12 +126,12 @@ def test_no_image_returns_none():
 # --- source and url ---
 
 def test_source_is_custom():
-    with patch("scrapers.patterns.generic_scraper.httpx.get", return_value=_mock_response(MOCK_FULL_HTML)):
+    with patch("scrapers.patterns.generic_scraper._http.get", return_value=_mock_response(MOCK_FULL_HTML)):
         result = scrape_from_url("https://corsetsrus.com/pattern/corset")
     assert result.source == "custom"
 
 
 def test_url_is_preserved():
-    with patch("scrapers.patterns.generic_scraper.httpx.get", return_value=_mock_response(MOCK_FULL_HTML)):
+    with patch("scrapers.patterns.generic_scraper._http.get", return_value=_mock_response(MOCK_FULL_HTML)):
         result = scrape_from_url("https://corsetsrus.com/pattern/corset")
     assert result.url == "https://corsetsrus.com/pattern/corset"
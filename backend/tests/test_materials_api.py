@@ -1,7 +1,11 @@
+import json
+import threading
+from types import SimpleNamespace
 from unittest.mock import patch
 from fastapi.testclient import TestClient
 from main import app
 from models.material import FabricSearchResult
+from services import material_service
 
 client = TestClient(app)
 
@@ -78,3 +82,60 @@ def test_search_result_has_normalized_fields():
     assert "price" in item
     assert "image_url" in item
     assert "url" in item
+
+
+# --- POST /materials/search-all ---
+
+def _search_all(**body) -> list[dict]:
+    resp = client.post("/api/materials/search-all", json={"query": "cotton", **body})
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "application/x-ndjson"
+    return [json.loads(line) for line in resp.text.splitlines()]
+
+
+def test_search_all_streams_each_store_as_it_answers(monkeypatch):
+    fast = threading.Event()
+
+    def fabricville(query):
+        fast.set()
+        return MOCK_RESULTS
+
+    def tonitex(query):
+        fast.wait(5)  # answers only after fabricville did
+        return []
+
+    monkeypatch.setitem(material_service.SCRAPERS, "fabricville", SimpleNamespace(search=fabricville))
+    monkeypatch.setitem(material_service.SCRAPERS, "tonitex", SimpleNamespace(search=tonitex))
+    lines = _search_all(sources=["tonitex", "fabricville"])
+    assert [(line["source"], line["status"]) for line in lines] == [("fabricville", "ok"), ("tonitex", "ok")]
+    assert lines[0]["results"][0]["title"] == "Cotton Poplin Fabric"
+
+
+def test_search_all_reports_failing_and_slow_stores(monkeypatch):
+    release = threading.Event()
+
+    def broken(query):
+        raise RuntimeError("store is down")
+
+    def hangs(query):
+        release.wait(5)
+        raise RuntimeError("too late")  # no results arrive after the test is over
+
+    monkeypatch.setattr(material_service, "SEARCH_ALL_TIMEOUT_S", 0.1)
+    monkeypatch.setitem(material_service.SCRAPERS, "tonitex", SimpleNamespace(search=broken))
+    monkeypatch.setitem(material_service.SCRAPERS, "fabricville", SimpleNamespace(search=hangs))
+    monkeypatch.setitem(material_service.SCRAPERS, "cleanersupply", SimpleNamespace(search=lambda q: MOCK_RESULTS))
+    try:
+        lines = {line["source"]: line for line in _search_all(sources=["tonitex", "fabricville", "cleanersupply"])}
+    finally:
+        release.set()
+    assert lines["tonitex"] == {"source": "tonitex", "status": "error", "error": "store is down"}
+    assert lines["fabricville"]["status"] == "timeout"
+    assert len(lines["cleanersupply"]["results"]) == 2
+
+
+def test_search_all_rejects_bad_requests():
+    assert client.post("/api/materials/search-all", json={"query": " "}).status_code == 400
+    resp = client.post("/api/materials/search-all", json={"query": "cotton", "sources": ["nonexistent"]})
+    assert resp.status_code == 400
+    assert "Unknown source" in resp.json()["detail"]
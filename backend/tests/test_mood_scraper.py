@@ -67,38 +67,38 @@ def _mock_response(html: str, status: int = 200):
 # --- search_patterns ---
 
 def test_search_returns_results():
-    with patch("scrapers.patterns.mood_scraper.httpx.get", return_value=_mock_response(MOCK_SEARCH_HTML)):
+    with patch("scrapers.patterns.mood_scraper._http.get", return_value=_mock_response(MOCK_SEARCH_HTML)):
         results = search_patterns("pencil skirt")
     assert len(results) == 2
     assert results[0].source == "mood"
 
 
 def test_search_extracts_title():
-    with patch("scrapers.patterns.mood_scraper.httpx.get", return_value=_mock_response(MOCK_SEARCH_HTML)):
+    with patch("scrapers.patterns.mood_scraper._http.get", return_value=_mock_response(MOCK_SEARCH_HTML)):
         results = search_patterns("pencil skirt")
     assert results[0].title == "The Peak Pencil Skirt Free Sewing Pattern"
 
 
 def test_search_extracts_url():
-    with patch("scrapers.patterns.mood_scraper.httpx.get", return_value=_mock_response(MOCK_SEARCH_HTML)):
+    with patch("scrapers.patterns.mood_scraper._http.get", return_value=_mock_response(MOCK_SEARCH_HTML)):
         results = search_patterns("pencil skirt")
     assert "peak-pencil-skirt" in results[0].url
 
 
 def test_search_extracts_image():
-    with patch("scrapers.patterns.mood_scraper.httpx.get", return_value=_mock_response(MOCK_SEARCH_HTML)):
+    with patch("scrapers.patterns.mood_scraper._http.get", return_value=_mock_response(MOCK_SEARCH_HTML)):
         results = search_patterns("pencil skirt")
     assert results[0].image_url == "https://blog.moodfabrics.com/wp-content/uploads/2024/skirt.jpg"
 
 
 def test_search_sets_brand():
-    with patch("scrapers.patterns.mood_scraper.httpx.get", return_value=_mock_response(MOCK_SEARCH_HTML)):
+    with patch("scrapers.patterns.mood_scraper._http.get", return_value=_mock_response(MOCK_SEARCH_HTML)):
         results = search_patterns("pencil skirt")
     assert results[0].brand == "Mood Fabrics"
 
 
 def test_search_empty_page_returns_empty():
-    with patch("scrapers.patterns.mood_scraper.httpx.get", return_value=_mock_response("<html></html>")):
+    with patch("scrapers.patterns.mood_scraper._http.get", return_value=_mock_response("<html></html>")):
         results = search_patterns("nothing")
     assert results == []
 
@@ -106,33 +106,33 @@ def test_search_empty_page_returns_empty():
 # --- scrape_pattern_detail ---
 
 def test_detail_extracts_title():
-    with patch("scrapers.patterns.mood_scraper.httpx.get", return_value=_mock_response(MOCK_DETAIL_HTML)):
+    with patch("scrapers.patterns.mood_scraper._http.get", return_value=_mock_response(MOCK_DETAIL_HTML)):
         detail = scrape_pattern_detail("https://blog.moodfabrics.com/peak-pencil-skirt-free-sewing-pattern/")
     assert detail.title == "The Peak Pencil Skirt Free Sewing Pattern"
     assert detail.source == "mood"
 
 
 def test_detail_extracts_image():
-    with patch("scrapers.patterns.mood_scraper.httpx.get", return_value=_mock_response(MOCK_DETAIL_HTML)):
+    with patch("scrapers.patterns.mood_scraper._http.get", return_value=_mock_response(MOCK_DETAIL_HTML)):
         detail = scrape_pattern_detail("https://blog.moodfabrics.com/peak-pencil-skirt-free-sewing-pattern/")
     assert "skirt.jpg" in detail.image_url
 
 
 def test_detail_sets_brand():
-    with patch("scrapers.patterns.mood_scraper.httpx.get", return_value=_mock_response(MOCK_DETAIL_HTML)):
+    with patch("scrapers.patterns.mood_scraper._http.get", return_value=_mock_response(MOCK_DETAIL_HTML)):
         detail = scrape_pattern_detail("https://blog.moodfabrics.com/peak-pencil-skirt-free-sewing-pattern/")
     assert detail.brand == "Mood Fabrics"
 
 
 def test_detail_extracts_fabrics():
-    with patch("scrapers.patterns.mood_scraper.httpx.get", return_value=_mock_response(MOCK_DETAIL_HTML)):
+    with patch("scrapers.patterns.mood_scraper._http.get", return_value=_mock_response(MOCK_DETAIL_HTML)):
         detail = scrape_pattern_detail("https://blog.moodfabrics.com/peak-pencil-skirt-free-sewing-pattern/")
     assert any("wool" in f.lower() for f in detail.fabric_recommendations)
     assert any("zipper" in f.lower() for f in detail.fabric_recommendations)
 
 
 def test_detail_no_json_ld_falls_back_to_h1():
-    with patch("scrapers.patterns.mood_scraper.httpx.get", return_value=_mock_response(MOCK_DETAIL_NO_JSON_LD)):
+    with patch("scrapers.patterns.mood_scraper._http.get", return_value=_mock_response(MOCK_DETAIL_NO_JSON_LD)):
         detail = scrape_pattern_detail("https://blog.moodfabrics.com/some-pattern/")
     assert detail.title == "Some Pattern Without JSON-LD"
 
@@ -0,0 +1,113 @@
+import threading
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+
+from main import app
+from models.pattern import PatternSearchResult
+from services import pattern_search_service
+
+client = TestClient(app)
+
+
+def _result(source: str, title: str, url: str, **fields) -> PatternSearchResult:
+    return PatternSearchResult(source=source, title=title, url=url, **fields)
+
+
+@pytest.fixture
+def sources(monkeypatch):
+    """Replace the real scrapers; returns a setter for each source's search function."""
+    pattern_search_service.latencies.clear()
+    yield lambda name, search: monkeypatch.setitem(
+        pattern_search_service.SCRAPERS, name, SimpleNamespace(search_patterns=search)
+    )
+    pattern_search_service.latencies.clear()
+
+
+def test_federated_search_merges_and_ranks(sources):
+    sources("simplicity", lambda q: [
+        _result("simplicity", "Misses' Dress", "https://simplicity.com/p/s1234", pattern_number="S1234"),
+        _result("simplicity", "Wrap Dress", "https://www.simplicity.com/p/s9999/"),
+    ])
+    sources("mood", lambda q: [
+        _result("mood", "Wrap Dress", "https://simplicity.com/p/s9999", price="$20", image_url="https://img/x.png"),
+        _result("mood", "Tote Bag", "https://moodfabrics.com/tote", price="$0"),
+    ])
+    resp = client.post("/api/patterns/search/federated", json={"query": "wrap dress", "sources": ["simplicity", "mood"]})
+    assert resp.status_code == 200
+    body = resp.json()
+    assert [r["title"] for r in body["results"]] == ["Wrap Dress", "Misses' Dress", "Tote Bag"]
+    # The duplicate filled in what the first copy was missing
+    assert body["results"][0]["source"] == "simplicity"
+    assert body["results"][0]["price"] == "$20"
+    assert [(s["source"], s["status"], s["results"]) for s in body["sources"]] == [("simplicity", "ok", 2), ("mood", "ok", 2)]
+
+
+def test_failing_and_slow_sources_are_reported(sources, monkeypatch):
+    release = threading.Event()
+
+    def broken(query):
+        raise RuntimeError("site is down")
+
+    def hangs(query):
+        release.wait(5)
+        raise RuntimeError("too late")  # no results arrive after the test is over
+
+    monkeypatch.setattr(pattern_search_service, "BUDGET_S", 0.2)
+    sources("simplicity", broken)
+    sources("mood", hangs)
+    sources("black_snail", lambda q: [_result("black_snail", "Bodice", "https://blacksnailpatterns.com/products/b")])
+    try:
+        body = client.post("/api/patterns/search/federated", json={"query": "bodice", "sources": ["simplicity", "mood", "black_snail"]}).json()
+    finally:
+        release.set()
+    statuses = {s["source"]: (s["status"], s.get("error")) for s in body["sources"]}
+    assert statuses == {"simplicity": ("error", "site is down"), "mood": ("timeout", None), "black_snail": ("ok", None)}
+    assert [r["title"] for r in body["results"]] == ["Bodice"]
+    assert all(s["elapsed_ms"] < 2000 for s in body["sources"])
+
+
+async def test_slow_attempt_is_hedged_past_its_p95(sources, monkeypatch):
+    monkeypatch.setattr(pattern_search_service, "HEDGE_MIN_SAMPLES", 3)
+    for _ in range(3):
+        pattern_search_service.latencies.record("mood", 0.01)
+    calls = []
+    lock = threading.Lock()
+    release = threading.Event()
+
+    def first_call_hangs(query):
+        with lock:
+            calls.append(query)
+            first = len(calls) == 1
+        if first:
+            release.wait(5)
+            raise RuntimeError("too late")  # no results arrive after the test is over
+        return [_result("mood", "Coat", "https://moodfabrics.com/coat")]
+
+    sources("mood", first_call_hangs)
+    try:
+        body = await pattern_search_service.search("coat", ["mood"])
+    finally:
+        release.set()
+    assert len(calls) == 2
+    assert body["sources"][0]["hedged"] is True
+    assert body["sources"][0]["elapsed_ms"] < 1500
+    assert [r.title for r in body["results"]] == ["Coat"]
+
+
+def test_latency_window_needs_enough_samples():
+    window = pattern_search_service.LatencyWindow()
+    for seconds in (0.1, 0.2, 0.3, 0.4):
+        window.record("mood", seconds)
+    assert window.p95("mood") is None
+    for seconds in range(16):
+        window.record("mood", 1.0 + seconds)
+    assert window.p95("mood") == 15.0
+
+
+def test_federated_search_rejects_bad_requests():
+    assert client.post("/api/patterns/search/federated", json={"query": ""}).status_code == 400
+    resp = client.post("/api/patterns/search/federated", json={"query": "coat", "sources": ["nope"]})
+    assert resp.status_code == 400
+    assert "Unknown source" in resp.json()["detail"]
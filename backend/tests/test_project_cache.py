@@ -0,0 +1,141 @@
+import json
+import sys
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+import database
+from database import init_db
+from repositories import project_repository
+from services import measurements_service, project_cache, project_service
+from main import app
+from services.project_cache import ProjectCache
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def project_id(temp_db):
+    init_db()
+    return project_repository.create_project("Wool coat", "Silk lining", 250.0)["id"]
+
+
+async def _detail(project_id: int) -> dict | None:
+    raw = await project_service.get_project_detail(project_id)
+    return json.loads(raw) if raw is not None else None
+
+
+async def test_second_read_is_served_from_the_cache(project_id, monkeypatch):
+    await _detail(project_id)
+
+    def fail(*args):
+        raise AssertionError("read the database on a cache hit")
+
+    monkeypatch.setattr(project_repository, "get_project_detail", fail)
+    assert (await _detail(project_id))["name"] == "Wool coat"
+    stats = project_cache.cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+
+
+async def test_service_writes_invalidate_the_aggregate(project_id):
+    await _detail(project_id)
+    await project_service.update_project(project_id, "Linen coat", "", None)
+    item = await project_service.add_checklist_item(project_id, "Cut", "")
+    await project_service.toggle_checklist_item(item["id"], project_id)
+
+    detail = await _detail(project_id)
+    assert detail["name"] == "Linen coat"
+    assert [(i["title"], i["checked"]) for i in detail["checklist"]] == [("Cut", 1)]
+
+
+async def test_deleted_project_is_not_served_from_the_cache(project_id):
+    await project_service.add_material(project_id, "Wool", "3m", "")
+    await _detail(project_id)
+    await project_service.delete_project(project_id)
+    assert await _detail(project_id) is None
+
+
+async def test_global_set_changes_reach_every_linked_project(project_id):
+    other = project_repository.create_project("Skirt", "", None)["id"]
+    global_set = await measurements_service.add_global_set("Me", {"waist": 70.0})
+    for pid in (project_id, other):
+        await project_service.link_global_measurement_sets(pid, [global_set["id"]])
+        await _detail(pid)
+
+    await measurements_service.update_global_set(global_set["id"], "Me", {"waist": 72.0})
+    for pid in (project_id, other):
+        assert (await _detail(pid))["global_measurement_sets"][0]["measurements"]["waist"] == 72.0
+
+    await measurements_service.delete_global_set(global_set["id"])
+    for pid in (project_id, other):
+        assert (await _detail(pid))["global_measurement_sets"] == []
+
+
+async def test_read_racing_an_uncommitted_write_is_not_kept(project_id):
+    with database.unit_of_work():
+        await project_service.update_project(project_id, "Linen coat", "", None)
+        # What a reader outside the transaction would see and cache meanwhile
+        project_cache.cache.put(project_cache.cache.key(project_id), json.dumps({"name": "Wool coat"}))
+    assert (await _detail(project_id))["name"] == "Linen coat"
+
+
+async def test_rolled_back_write_leaves_no_trace_in_the_cache(project_id):
+    await _detail(project_id)
+    with pytest.raises(RuntimeError):
+        with database.unit_of_work():
+            await project_service.update_project(project_id, "Linen coat", "", None)
+            assert (await _detail(project_id))["name"] == "Linen coat"
+            raise RuntimeError
+    assert (await _detail(project_id))["name"] == "Wool coat"
+
+
+def test_put_after_a_concurrent_write_is_dropped():
+    cache = ProjectCache(max_bytes=1024)
+    key = cache.key(1)
+    cache.bump(1)
+    cache.put(key, "stale")
+    assert cache.get(key) is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_least_recently_used_entry_is_evicted_past_the_byte_bound():
+    value = "x" * 100
+    cache = ProjectCache(max_bytes=2 * sys.getsizeof(value))
+    first, second, third = (cache.key(pid) for pid in range(1, 4))
+    cache.put(first, value)
+    cache.put(second, value)
+    cache.get(first)  # now the most recently used
+    cache.put(third, value)
+
+    stats = cache.stats()
+    assert stats["bytes"] <= stats["max_bytes"]
+    assert stats["evictions"] == 1
+    assert cache.get(first) == value
+    assert cache.get(second) is None
+
+
+def test_unchanged_project_revalidates_without_building_the_aggregate(project_id):
+    first = client.get(f"/api/projects/{project_id}")
+    etag = first.headers["ETag"]
+    assert first.status_code == 200 and first.headers["Cache-Control"] == "no-cache"
+
+    with patch("services.project_service.get_project_detail") as build:
+        resp = client.get(f"/api/projects/{project_id}", headers={"If-None-Match": etag})
+    assert resp.status_code == 304
+    assert resp.content == b""
+    assert resp.headers["ETag"] == etag
+    build.assert_not_called()
+
+
+@pytest.mark.parametrize("resource", ["checklist", "materials", "patterns"])
+def test_child_lists_revalidate_until_the_project_changes(project_id, resource):
+    url = f"/api/projects/{project_id}/{resource}"
+    etag = client.get(url).headers["ETag"]
+    assert etag != client.get(f"/api/projects/{project_id}").headers["ETag"]
+    assert client.get(url, headers={"If-None-Match": f'"other", W/{etag}'}).status_code == 304
+
+    client.post(f"/api/projects/{project_id}/checklist", json={"title": "Cut", "notes": ""})
+    resp = client.get(url, headers={"If-None-Match": etag})
+    assert resp.status_code == 200
+    assert resp.headers["ETag"] != etag
@@ -0,0 +1,88 @@
+import asyncio
+import json
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+
+import database
+from database import init_db
+from main import app
+from repositories import project_repository
+from services import project_events, project_service
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def project_id(temp_db):
+    init_db()
+    return project_repository.create_project("Coat", "", None)["id"]
+
+
+@pytest.fixture
+async def subscription(project_id):
+    subscription = project_events.events.subscribe(project_id)
+    yield subscription
+    project_events.events.unsubscribe(subscription)
+
+
+async def _next(subscription) -> tuple[str, dict]:
+    name, data = await asyncio.wait_for(subscription.get(), 1)
+    return name, json.loads(data)
+
+
+async def test_write_is_pushed_to_subscribers(project_id, subscription):
+    item = await project_service.add_checklist_item(project_id, "Cut", "")
+    await project_service.toggle_checklist_item(item["id"], project_id)
+
+    assert await _next(subscription) == ("change", {"op": "add_checklist_item", "project_id": project_id, "id": item["id"]})
+    assert await _next(subscription) == ("change", {"op": "toggle_checklist_item", "project_id": project_id, "id": item["id"]})
+    assert subscription.queue.empty()
+
+
+async def test_events_wait_for_the_commit(project_id, subscription):
+    with pytest.raises(RuntimeError):
+        with database.unit_of_work():
+            await project_service.add_material(project_id, "Wool", "3m", "")
+            raise RuntimeError("boom")
+    assert subscription.queue.empty()
+
+    with database.unit_of_work():
+        await project_service.add_material(project_id, "Wool", "3m", "")
+        assert subscription.queue.empty()
+    assert (await _next(subscription))[1]["op"] == "add_material"
+
+
+async def test_publish_from_another_thread(project_id, subscription):
+    thread = threading.Thread(target=project_events.events.publish, args=(project_id, {"op": "x"}))
+    thread.start()
+    thread.join()
+    assert await _next(subscription) == ("change", {"op": "x"})
+
+
+async def test_slow_subscriber_gets_one_resync(project_id):
+    slow = project_events.Subscription(project_id, size=2)
+    project_events.events._subscribers[project_id].add(slow)
+    try:
+        for i in range(4):
+            project_events.events.publish(project_id, {"op": "x", "id": i})
+        assert await _next(slow) == ("resync", {"project_id": project_id})
+        assert await _next(slow) == ("change", {"op": "x", "id": 3})
+    finally:
+        project_events.events.unsubscribe(slow)
+
+
+async def test_stream_formats_server_sent_events(project_id, monkeypatch):
+    monkeypatch.setattr(project_events, "HEARTBEAT_S", 0.01)
+    stream = project_events.stream(project_id)
+    assert await anext(stream) == ": subscribed\n\n"
+    assert await anext(stream) == ": keep-alive\n\n"
+    project_events.events.publish(project_id, {"op": "x"})
+    assert await anext(stream) == 'event: change\ndata: {"op": "x"}\n\n'
+    await stream.aclose()
+    assert not project_events.events.has_subscribers(project_id)
+
+
+def test_events_for_missing_project(project_id):
+    assert client.get(f"/api/projects/{project_id + 1}/events").status_code == 404
@@ -0,0 +1,322 @@
+import inspect
+import json
+
+import pytest
+
+import database
+from database import init_db, get_connection
+from models.project import MeasurementsUpdate, ProjectDetail
+from repositories import project_repository, measurements_repository
+from repositories import async_project_repository, async_measurements_repository
+from services import project_service, measurements_service
+
+
+@pytest.fixture
+def project_id(temp_db):
+    init_db()
+    return project_repository.create_project("Wool coat", "Silk lining", 250.0)["id"]
+
+
+def test_get_project_detail_missing_project(project_id):
+    assert project_repository.get_project_detail(project_id + 1) is None
+
+
+async def test_get_project_detail_matches_per_table_reads(project_id):
+    project_repository.add_checklist_item(project_id, "Cut", "")
+    second = project_repository.add_checklist_item(project_id, "Sew", "notes")
+    project_repository.update_checklist_item(second["id"], project_id, "Sew", "notes", '["/uploads/a.png"]')
+    project_repository.add_material(project_id, "Wool", "3m", "", price=90.0, pre_wash=1)
+    project_repository.save_pattern(project_id, "simplicity", "S9898", "https://example.com", None, "$14.99")
+    project_repository.add_measurement_set(project_id, "Me", {"waist": 70.0})
+    project_repository.add_progress_image(project_id, "/uploads/b.png")
+    global_set = measurements_repository.add("Everyday", {"hips": 96.0})
+    measurements_repository.link_to_project(project_id, [global_set["id"]])
+
+    detail = json.loads(project_repository.get_project_detail(project_id))
+
+    expected = ProjectDetail.model_validate({
+        **(await project_service.get_project(project_id)),
+        "patterns": await project_service.get_saved_patterns(project_id),
+        "materials": await project_service.get_materials(project_id),
+        "checklist": await project_service.get_checklist(project_id),
+        "measurement_sets": await project_service.get_measurement_sets(project_id),
+        "global_measurement_sets": await measurements_service.get_for_project(project_id),
+        "progress_images": await project_service.get_progress_images(project_id),
+    })
+    assert detail == expected.model_dump()
+    assert detail["checklist"][1]["image_urls"] == ["/uploads/a.png"]
+
+
+@pytest.mark.parametrize("stored, expected", [
+    (None, []),
+    ("", []),
+    ('["/a.png", "/b.png"]', ["/a.png", "/b.png"]),
+    ('"/a.png"', ["/a.png"]),
+    ("/uploads/legacy.png", ["/uploads/legacy.png"]),
+])
+def test_get_project_detail_checklist_image_urls(project_id, stored, expected):
+    item = project_repository.add_checklist_item(project_id, "Cut", "")
+    project_repository.update_checklist_item(item["id"], project_id, "Cut", "", stored)
+    detail = json.loads(project_repository.get_project_detail(project_id))
+    assert detail["checklist"][0]["image_urls"] == expected
+
+
+def test_total_spent_follows_material_and_pattern_writes(project_id):
+    linen = project_repository.add_material(project_id, "Linen", "2m", "", price=20.0)
+    project_repository.add_material(project_id, "Thread", "1", "", price=3.5)
+    project_repository.toggle_material_purchased(linen["id"], project_id)
+    pattern = project_repository.save_pattern(project_id, "mood", "Coat", "https://example.com", None, None, price_paid=12.0)
+    assert project_repository.get_project(project_id)["total_spent"] == 32.0
+
+    project_repository.update_material(linen["id"], project_id, 1, 25.0, None)
+    project_repository.update_pattern(pattern["id"], project_id, "Coat", None, None)
+    assert project_repository.get_project(project_id)["total_spent"] == 25.0
+
+    project_repository.delete_material(linen["id"], project_id)
+    assert project_repository.get_project(project_id)["total_spent"] == 0.0
+    assert project_repository.verify_project_totals() == []
+
+
+def test_verify_project_totals_reports_and_repairs_drift(project_id):
+    project_repository.save_pattern(project_id, "mood", "Coat", "https://example.com", None, None, price_paid=12.0)
+    with get_connection() as conn:
+        conn.execute("UPDATE projects SET total_spent = 99 WHERE id = ?", (project_id,))
+
+    assert project_repository.verify_project_totals(repair=True) == [
+        {"id": project_id, "stored": 99.0, "actual": 12.0}
+    ]
+    assert project_repository.verify_project_totals() == []
+    assert project_repository.get_project(project_id)["total_spent"] == 12.0
+
+
+async def test_list_projects_keyset_pages_cover_every_project_once(temp_db):
+    init_db()
+    ids = [project_repository.create_project(f"P{i}", "", 100.0)["id"] for i in range(7)]
+    # Same-second timestamps: ordering must fall back to id
+    project_repository.update_project_status(ids[2], "completed")
+
+    seen, cursor = [], None
+    while True:
+        page = await project_service.list_projects(limit=3, cursor=cursor)
+        assert page["total"] == 7
+        seen += [p["id"] for p in page["items"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert seen == sorted(ids, reverse=True)
+
+    completed = await project_service.list_projects(limit=3, status="completed")
+    assert [p["id"] for p in completed["items"]] == [ids[2]]
+    assert completed["total"] == 1 and completed["next_cursor"] is None
+
+
+async def test_list_projects_over_budget_filter(temp_db):
+    init_db()
+    over = project_repository.create_project("Over", "", 10.0)["id"]
+    under = project_repository.create_project("Under", "", 100.0)["id"]
+    project_repository.create_project("No budget", "", None)
+    for pid in (over, under):
+        project_repository.save_pattern(pid, "mood", "Coat", "https://example.com", None, None, price_paid=20.0)
+
+    over_page = await project_service.list_projects(over_budget=True)
+    under_page = await project_service.list_projects(over_budget=False)
+    assert [p["id"] for p in over_page["items"]] == [over]
+    assert [p["id"] for p in under_page["items"]] == [under]
+
+
+async def test_list_projects_rejects_bad_cursor():
+    with pytest.raises(ValueError):
+        await project_service.list_projects(limit=3, cursor="not-a-cursor")
+
+
+def _checklist_order(project_id):
+    return [item["title"] for item in project_repository.get_checklist(project_id)]
+
+
+def test_move_checklist_item_touches_one_row(project_id):
+    ids = [project_repository.add_checklist_item(project_id, t, "")["id"] for t in "ABCD"]
+    before = {i["id"]: i["position"] for i in project_repository.get_checklist(project_id)}
+
+    moved = project_repository.move_checklist_item(ids[3], project_id, ids[0])
+    assert _checklist_order(project_id) == ["A", "D", "B", "C"]
+    after = {i["id"]: i["position"] for i in project_repository.get_checklist(project_id)}
+    assert {k for k in after if after[k] != before[k]} == {moved["id"]}
+
+    project_repository.move_checklist_item(ids[2], project_id, None)
+    assert _checklist_order(project_id) == ["C", "A", "D", "B"]
+    assert project_repository.move_checklist_item(ids[0], project_id, 9999) is None
+
+
+def test_move_checklist_item_respaces_when_gap_is_used_up(project_id):
+    ids = [project_repository.add_checklist_item(project_id, t, "")["id"] for t in "ABC"]
+    # Repeatedly moving into the same gap halves it until it runs out
+    for _ in range(12):
+        project_repository.move_checklist_item(ids[2], project_id, ids[0])
+        project_repository.move_checklist_item(ids[1], project_id, ids[0])
+    assert _checklist_order(project_id) == ["A", "B", "C"]
+
+
+def test_reorder_checklist_sets_spaced_positions(project_id):
+    ids = [project_repository.add_checklist_item(project_id, t, "")["id"] for t in "ABC"]
+    project_repository.reorder_checklist(project_id, [ids[2], ids[0], ids[1]])
+    items = project_repository.get_checklist(project_id)
+    assert [i["title"] for i in items] == ["C", "A", "B"]
+    assert [i["position"] for i in items] == [1024, 2048, 3072]
+
+
+def test_child_inserts_for_missing_project_return_none(project_id):
+    missing = project_id + 1
+    assert project_repository.add_checklist_item(missing, "Cut", "") is None
+    assert project_repository.add_material(missing, "Linen", "2m", "") is None
+    assert project_repository.save_pattern(missing, "mood", "Coat", "https://example.com", None, None) is None
+    assert project_repository.add_progress_image(missing, "/uploads/a.png") is None
+    assert project_repository.add_measurement_set(missing, "Me", {}) is None
+
+
+def test_toggle_checklist_item_is_one_statement(project_id):
+    item = project_repository.add_checklist_item(project_id, "Cut", "")
+    statements = []
+    with get_connection() as conn:
+        conn.set_trace_callback(statements.append)
+    toggled = project_repository.toggle_checklist_item(item["id"], project_id)
+    with get_connection() as conn:
+        conn.set_trace_callback(None)
+    assert toggled["checked"] == 1
+    # Trigger bodies (sync log) are traced under the statement that fired them
+    assert {s for s in statements if not s.startswith(("BEGIN", "COMMIT"))} == {
+        f"UPDATE checklist_items SET checked = NOT checked WHERE id = {item['id']} AND project_id = {project_id} RETURNING *"
+    }
+
+
+@pytest.mark.parametrize("sync_module, async_module", [
+    (project_repository, async_project_repository),
+    (measurements_repository, async_measurements_repository),
+])
+def test_async_repository_mirrors_sync_signatures(sync_module, async_module):
+    for name, func in inspect.getmembers(sync_module, inspect.isfunction):
+        if func.__module__ != sync_module.__name__ or name.startswith("_"):
+            continue
+        wrapped = getattr(async_module, name)
+        assert inspect.iscoroutinefunction(wrapped), name
+        assert inspect.signature(wrapped) == inspect.signature(func), name
+
+
+async def test_async_repository_shares_the_unit_of_work(project_id):
+    with database.unit_of_work():
+        item = await async_project_repository.add_checklist_item(project_id, "Cut", "")
+        # Not committed yet, but visible to the unit of work's own reads
+        assert [row["id"] for row in await async_project_repository.get_checklist(project_id)] == [item["id"]]
+    assert [row["id"] for row in project_repository.get_checklist(project_id)] == [item["id"]]
+
+
+def test_measurement_fields_match_the_model():
+    assert database.MEASUREMENT_FIELDS == tuple(MeasurementsUpdate.model_fields)
+
+
+def test_measurement_sets_round_trip_and_filter_by_range(project_id):
+    small = project_repository.add_measurement_set(project_id, "Small", {"waist": 66.0, "hips": 90.0})
+    medium = project_repository.add_measurement_set(project_id, "Medium", {"waist": 70.0})
+    project_repository.add_measurement_set(project_id, "Unknown", {"hips": 100.0})
+    assert small["measurements"] == {"waist": 66.0, "hips": 90.0}
+
+    in_range = project_repository.get_measurement_sets(project_id, "waist", 68.0, 72.0)
+    assert [s["id"] for s in in_range] == [medium["id"]]
+    with_waist = project_repository.get_measurement_sets(project_id, "waist")
+    assert [s["name"] for s in with_waist] == ["Small", "Medium"]
+
+    updated = project_repository.update_measurement_set(small["id"], project_id, "Small", {"waist": 69.5})
+    assert updated["measurements"] == {"waist": 69.5}  # a PATCH replaces the whole set
+    assert len(project_repository.get_measurement_sets(project_id, "waist", 68.0, 72.0)) == 2
+
+    with pytest.raises(ValueError):
+        project_repository.get_measurement_sets(project_id, "waist; DROP TABLE projects", 0, 1)
+
+
+def test_global_sets_filter_by_range(temp_db):
+    init_db()
+    measurements_repository.add("Narrow", {"waist": 64.0})
+    wide = measurements_repository.add("Wide", {"waist": 71.0, "wrist": 16.0})
+    assert [s["id"] for s in measurements_repository.get_all("waist", 68.0, 72.0)] == [wide["id"]]
+    assert [s["name"] for s in measurements_repository.get_all("waist", max_value=65.0)] == ["Narrow"]
+    assert wide["measurements"] == {"waist": 71.0, "wrist": 16.0}
+
+
+async def test_apply_batch_runs_each_kind_of_operation_in_order(project_id):
+    existing = project_repository.add_material(project_id, "Wool", "3m", "", price=90.0)
+    item = project_repository.add_checklist_item(project_id, "Cut", "")
+    operations = [
+        {"type": "add_material", "data": {"name": "Lining", "quantity": "2m", "notes": "", "price": 20.0}},
+        {"type": "add_material", "data": {"name": "Buttons", "quantity": "6", "notes": "", "price": 6.0}},
+        {"type": "edit_material", "id": existing["id"], "data": {"name": "Wool", "quantity": "4m", "notes": "", "price": 120.0}},
+        {"type": "add_checklist_item", "data": {"title": "Sew", "notes": ""}},
+        {"type": "add_checklist_item", "data": {"title": "Press", "notes": ""}},
+        {"type": "edit_checklist_item", "id": item["id"], "data": {"title": "Cut", "notes": "", "image_urls": ["/uploads/a.png"]}},
+        {"type": "add_pattern", "data": {"source": "mood", "title": "Coat", "url": "https://example.com", "price_paid": 15.0}},
+        {"type": "add_measurement_set", "data": {"name": "Me", "measurements": {"waist": 70.0}}},
+        {"type": "delete_material", "id": existing["id"]},
+    ]
+    results = await project_service.apply_batch(project_id, operations)
+
+    assert [r.get("name") or r.get("title") for r in results[:8]] == [
+        "Lining", "Buttons", "Wool", "Sew", "Press", "Cut", "Coat", "Me",
+    ]
+    assert results[2]["quantity"] == "4m"
+    assert results[5]["image_urls"] == ["/uploads/a.png"]
+    assert results[7]["measurements"] == {"waist": 70.0}
+    assert results[8] == {"id": existing["id"], "deleted": True}
+    assert [i["title"] for i in project_repository.get_checklist(project_id)] == ["Cut", "Sew", "Press"]
+    assert sorted(m["name"] for m in project_repository.get_materials(project_id)) == ["Buttons", "Lining"]
+    assert project_repository.get_project(project_id)["total_spent"] == 15.0  # the pattern; nothing purchased yet
+
+
+async def test_apply_batch_reports_missing_project_and_rows(project_id):
+    add = {"type": "add_checklist_item", "data": {"title": "Cut", "notes": ""}}
+    assert await project_service.apply_batch(project_id + 1, [add]) is None
+    edit = {"type": "edit_pattern", "id": 999, "data": {"title": "Gone"}}
+    with pytest.raises(LookupError, match="Pattern 999"):
+        await project_service.apply_batch(project_id, [add, edit])
+
+
+def test_batch_rejects_columns_outside_the_table(project_id):
+    with pytest.raises(ValueError):
+        project_repository.batch_insert("material", project_id, [{"name": "x", "project_id": 2}])
+
+
+@pytest.mark.parametrize("reset", [False, True])
+def test_clone_project_copies_every_child(project_id, reset):
+    global_set = measurements_repository.add("Me", {"waist": 70.0})
+    measurements_repository.link_to_project(project_id, [global_set["id"]])
+    project_repository.update_project_status(project_id, "in_progress")
+    for title in ("Cut", "Sew", "Press"):
+        project_repository.add_checklist_item(project_id, title, "")
+    first, second, _ = project_repository.get_checklist(project_id)
+    project_repository.move_checklist_item(first["id"], project_id, second["id"])
+    project_repository.update_checklist_item(second["id"], project_id, "Sew", "", '["/uploads/a.png"]')
+    project_repository.toggle_checklist_item(second["id"], project_id)
+    material = project_repository.add_material(project_id, "Wool", "3m", "", price=90.0)
+    project_repository.toggle_material_purchased(material["id"], project_id)
+    project_repository.save_pattern(project_id, "mood", "Coat", "https://example.com", None, None, price_paid=15.0)
+    project_repository.add_measurement_set(project_id, "Fitting", {"waist": 71.0})
+    project_repository.add_progress_image(project_id, "/uploads/progress.png")
+
+    clone = project_repository.clone_project(project_id, reset_progress=reset)
+    original = json.loads(project_repository.get_project_detail(project_id))
+    copy = json.loads(project_repository.get_project_detail(clone["id"]))
+
+    assert clone["name"] == "Wool coat (copy)"
+    assert clone["status"] == ("to_start" if reset else "in_progress")
+    assert clone["total_spent"] == (15.0 if reset else 105.0)
+    assert [(i["title"], i["position"], i["image_urls"]) for i in copy["checklist"]] == [
+        (i["title"], i["position"], i["image_urls"]) for i in original["checklist"]
+    ]
+    assert [i["checked"] for i in copy["checklist"]] == ([0, 0, 0] if reset else [1, 0, 0])
+    assert [m["purchased"] for m in copy["materials"]] == [0 if reset else 1]
+    assert [p["price_paid"] for p in copy["patterns"]] == [15.0]
+    assert [s["measurements"] for s in copy["measurement_sets"]] == [{"waist": 71.0}]
+    assert [g["id"] for g in copy["global_measurement_sets"]] == [global_set["id"]]
+    assert copy["progress_images"] == []
+    assert len(project_repository.get_checklist(project_id)) == 3  # the original is untouched
+
+
+def test_clone_missing_project(project_id):
+    assert project_repository.clone_project(project_id + 1, "Copy") is None
@@ -1,3 +1,4 @@
+import json
 from unittest.mock import patch
 from fastapi.testclient import TestClient
 from main import app
@@ -36,20 +37,33 @@ PROJECT_DETAIL = {
 # --- Projects ---
 
 def test_list_projects():
-    with patch("services.project_service.list_projects", return_value=[PROJECT]):
+    page = {"items": [PROJECT], "next_cursor": None, "total": 1}
+    with patch("services.project_service.list_projects", return_value=page):
         resp = client.get("/api/projects/")
     assert resp.status_code == 200
     assert resp.json()[0]["name"] == "Summer Dress"
+    assert resp.headers["X-Total-Count"] == "1"
+    assert "X-Next-Cursor" not in resp.headers
+
+
+def test_list_projects_paginated():
+    page = {"items": [PROJECT], "next_cursor": "abc", "total": 40}
+    with patch("services.project_service.list_projects", return_value=page) as mock_list:
+        resp = client.get("/api/projects/?limit=1&status=in_progress&over_budget=true")
+    assert resp.status_code == 200
+    assert resp.headers["X-Next-Cursor"] == "abc"
+    assert resp.headers["X-Total-Count"] == "40"
+    mock_list.assert_called_once_with(1, None, False, "in_progress", True, None, None)
+
+
+def test_list_projects_bad_cursor():
+    with patch("services.project_service.list_projects", side_effect=ValueError("Invalid cursor")):
+        resp = client.get("/api/projects/?limit=10&cursor=zzz")
+    assert resp.status_code == 400
 
 
 def test_get_project_detail():
-    with patch("services.project_service.get_project", return_value=PROJECT), \
-         patch("services.project_service.get_saved_patterns", return_value=[PATTERN]), \
-         patch("services.project_service.get_materials", return_value=[MATERIAL]), \
-         patch("services.project_service.get_checklist", return_value=[CHECKLIST_ITEM]), \
-         patch("services.project_service.get_measurement_sets", return_value=[]), \
-         patch("services.project_service.get_progress_images", return_value=[]), \
-         patch("services.measurements_service.get_for_project", return_value=[]):
+    with patch("services.project_service.get_project_detail", return_value=json.dumps(PROJECT_DETAIL)):
         resp = client.get("/api/projects/1")
     assert resp.status_code == 200
     data = resp.json()
@@ -60,7 +74,7 @@ def test_get_project_detail():
 
 
 def test_get_project_not_found():
-    with patch("services.project_service.get_project", return_value=None):
+    with patch("services.project_service.get_project_detail", return_value=None):
         resp = client.get("/api/projects/999")
     assert resp.status_code == 404
 
@@ -105,6 +119,21 @@ def test_delete_project():
     assert resp.json()["deleted"] == 1
 
 
+def test_clone_project_defaults_to_a_plain_copy():
+    clone = {**PROJECT, "id": 2, "name": "Summer Dress (copy)"}
+    with patch("services.project_service.clone_project", return_value=clone) as mock:
+        resp = client.post("/api/projects/1/clone")
+    assert resp.status_code == 201
+    assert resp.json()["name"] == "Summer Dress (copy)"
+    mock.assert_called_once_with(1, None, False)
+
+
+def test_clone_project_not_found():
+    with patch("services.project_service.clone_project", return_value=None):
+        resp = client.post("/api/projects/999/clone", json={"reset_progress": True})
+    assert resp.status_code == 404
+
+
 # --- Checklist ---
 
 def test_get_checklist():
@@ -129,6 +158,12 @@ def test_add_checklist_item_minimal():
     assert resp.status_code == 200
 
 
+def test_add_checklist_item_project_not_found():
+    with patch("services.project_service.add_checklist_item", return_value=None):
+        resp = client.post("/api/projects/999/checklist", json={"title": "Press seams"})
+    assert resp.status_code == 404
+
+
 def test_add_checklist_item_missing_title():
     resp = client.post("/api/projects/1/checklist", json={})
     assert resp.status_code == 422
@@ -148,6 +183,21 @@ def test_toggle_checklist_item_not_found():
     assert resp.status_code == 404
 
 
+def test_move_checklist_item():
+    moved = {**CHECKLIST_ITEM, "position": 1536}
+    with patch("services.project_service.move_checklist_item", return_value=moved) as mock_move:
+        resp = client.patch("/api/projects/1/checklist/1/move", json={"after_id": 3})
+    assert resp.status_code == 200
+    assert resp.json()["position"] == 1536
+    mock_move.assert_called_once_with(1, 1, 3)
+
+
+def test_move_checklist_item_not_found():
+    with patch("services.project_service.move_checklist_item", return_value=None):
+        resp = client.patch("/api/projects/1/checklist/999/move", json={})
+    assert resp.status_code == 404
+
+
 def test_delete_checklist_item():
     with patch("services.project_service.delete_checklist_item"):
         resp = client.delete("/api/projects/1/checklist/1")
@@ -184,6 +234,12 @@ def test_save_pattern_url_only():
     assert resp.status_code == 200
 
 
+def test_save_pattern_project_not_found():
+    with patch("services.project_service.save_pattern", return_value=None):
+        resp = client.post("/api/projects/9999/patterns", json={"url": "https://example.com/pattern"})
+    assert resp.status_code == 404
+
+
 def test_save_pattern_missing_url():
     resp = client.post("/api/projects/1/patterns", json={"title": "No URL"})
     assert resp.status_code == 422
@@ -221,6 +277,12 @@ def test_add_material_minimal():
     assert resp.status_code == 200
 
 
+def test_add_material_project_not_found():
+    with patch("services.project_service.add_material", return_value=None):
+        resp = client.post("/api/projects/999/materials", json={"name": "Thread"})
+    assert resp.status_code == 404
+
+
 def test_add_material_missing_name():
     resp = client.post("/api/projects/1/materials", json={})
     assert resp.status_code == 422
@@ -231,3 +293,21 @@ def test_delete_material():
         resp = client.delete("/api/projects/1/materials/1")
     assert resp.status_code == 200
     assert resp.json()["deleted"] == 1
+
+
+# --- Measurement sets ---
+
+
+def test_list_measurement_sets_by_range():
+    sets = [{"id": 1, "project_id": 1, "name": "Me", "measurements": {"waist": 70.0}, "created_at": "2024-01-01"}]
+    with patch("services.project_service.get_project", return_value=PROJECT), \
+         patch("services.project_service.get_measurement_sets", return_value=sets) as mock:
+        resp = client.get("/api/projects/1/measurement-sets?field=waist&min_value=68&max_value=72")
+    assert resp.status_code == 200
+    assert resp.json() == sets
+    mock.assert_called_once_with(1, "waist", 68.0, 72.0)
+
+
+def test_list_measurement_sets_unknown_field():
+    resp = client.get("/api/projects/1/measurement-sets?field=shoeSize")
+    assert resp.status_code == 422
@@ -0,0 +1,210 @@
+"""
+Run EXPLAIN QUERY PLAN on every statement the repositories issue against a seeded
+database, and fail on full scans of tables that grow with usage.
+
+Adding a repository function? Add a call for it to CALLS below — the coverage test
+fails until you do.
+"""
+import inspect
+import re
+import sqlite3
+
+import pytest
+
+import database
+from database import init_db
+from repositories import (
+    project_repository, measurements_repository, search_repository, sync_repository, workspace_repository,
+)
+
+LARGE_TABLES = {
+    "projects",
+    "saved_patterns",
+    "checklist_items",
+    "project_materials",
+    "project_progress_images",
+    "project_measurement_sets",
+    "project_global_measurements",
+    "sync_log",
+}
+
+# (function, table) pairs where reading the whole table is the point of the query
+ALLOWED_SCANS = {
+    # consistency check recomputes every project's totals
+    ("verify_project_totals", "projects"),
+    ("verify_project_totals", "project_materials"),
+    ("verify_project_totals", "saved_patterns"),
+    # export walks every project
+    ("iter_workspace", "projects"),
+}
+
+# Allowed only while they read an index, never the table itself
+ALLOWED_INDEX_SCANS = {
+    ("get_projects_page", "projects"),  # unfiltered COUNT(*) reads the smallest index
+}
+
+PROJECT_ID = 2
+ITEM_ID = 12
+GLOBAL_ID = 1
+
+CALLS = [
+    (project_repository.get_projects_page, (10, ("2100-01-01", 0))),
+    (project_repository.get_projects_page, (10, ("2100-01-01", 0), False, "in_progress")),
+    (project_repository.get_projects_page, (10, ("2000-01-01", 0), True, None, True)),
+    (project_repository.get_projects_page, (10, ("2100-01-01", 0), False, None, None, 50.0, 150.0)),
+    (project_repository.verify_project_totals, (True,)),
+    (project_repository.get_project, (PROJECT_ID,)),
+    (project_repository.get_project_detail, (PROJECT_ID,)),
+    (project_repository.create_project, ("New", "", None)),
+    (project_repository.update_project, (PROJECT_ID, "Renamed", "", 50.0)),
+    (project_repository.update_project_status, (PROJECT_ID, "in_progress")),
+    (project_repository.save_measurements, (PROJECT_ID, "{}")),
+    (project_repository.get_checklist, (PROJECT_ID,)),
+    (project_repository.add_checklist_item, (PROJECT_ID, "Hem", "")),
+    (project_repository.reorder_checklist, (PROJECT_ID, [ITEM_ID, ITEM_ID + 1])),
+    (project_repository.move_checklist_item, (ITEM_ID, PROJECT_ID, ITEM_ID + 3)),
+    (project_repository.move_checklist_item, (ITEM_ID + 4, PROJECT_ID, None)),
+    (project_repository.toggle_checklist_item, (ITEM_ID, PROJECT_ID)),
+    (project_repository.update_checklist_item, (ITEM_ID, PROJECT_ID, "Cut", "", "[]")),
+    (project_repository.delete_checklist_item, (ITEM_ID + 2, PROJECT_ID)),
+    (project_repository.get_progress_images, (PROJECT_ID,)),
+    (project_repository.add_progress_image, (PROJECT_ID, "/uploads/x.png")),
+    (project_repository.delete_progress_image, (ITEM_ID, PROJECT_ID)),
+    (project_repository.get_saved_patterns, (PROJECT_ID,)),
+    (project_repository.save_pattern, (PROJECT_ID, "test", "Dress", "https://example.com", None, None)),
+    (project_repository.update_pattern, (ITEM_ID, PROJECT_ID, "Dress", None, 10.0)),
+    (project_repository.delete_saved_pattern, (ITEM_ID + 1, PROJECT_ID)),
+    (project_repository.get_materials, (PROJECT_ID,)),
+    (project_repository.add_material, (PROJECT_ID, "Linen", "2m", "")),
+    (project_repository.update_material, (ITEM_ID, PROJECT_ID, 1, 12.0, "3m")),
+    (project_repository.toggle_material_purchased, (ITEM_ID, PROJECT_ID)),
+    (project_repository.edit_material, (ITEM_ID, PROJECT_ID, "Linen", "2m", "", None, 10.0)),
+    (project_repository.delete_material, (ITEM_ID + 1, PROJECT_ID)),
+    (project_repository.get_measurement_sets, (PROJECT_ID,)),
+    (project_repository.get_measurement_sets, (PROJECT_ID, "waist", 68.0, 72.0)),
+    (project_repository.add_measurement_set, (PROJECT_ID, "Me", {"waist": 70.0})),
+    (project_repository.update_measurement_set, (ITEM_ID, PROJECT_ID, "Me", {"waist": 71.0})),
+    (project_repository.delete_measurement_set, (ITEM_ID + 1, PROJECT_ID)),
+    (project_repository.batch_insert, ("checklist_item", PROJECT_ID, [{"title": "Cut"}, {"title": "Sew"}])),
+    (project_repository.batch_insert, ("material", PROJECT_ID, [{"name": "Wool", "price": 5.0}])),
+    (project_repository.batch_update, ("material", PROJECT_ID, [{"id": ITEM_ID, "name": "Silk", "price": 9.0}])),
+    (project_repository.batch_delete, ("pattern", PROJECT_ID, [ITEM_ID + 5, ITEM_ID + 6])),
+    (project_repository.clone_project, (PROJECT_ID, None, True)),
+    (project_repository.delete_project, (PROJECT_ID + 1,)),
+    (measurements_repository.get_all, ()),
+    (measurements_repository.get_all, ("waist", 68.0, 72.0)),
+    (measurements_repository.add, ("Me", {"waist": 70.0})),
+    (measurements_repository.update, (GLOBAL_ID, "Me", {"waist": 71.0})),
+    (measurements_repository.get_for_project, (PROJECT_ID,)),
+    (measurements_repository.link_to_project, (PROJECT_ID, [GLOBAL_ID])),
+    (measurements_repository.unlink_from_project, (PROJECT_ID, GLOBAL_ID)),
+    (measurements_repository.delete, (GLOBAL_ID + 1,)),
+    (search_repository.search, ('"step"*', 10)),
+    (search_repository.search, ('"step"*', 10, (-1.0, 0), "checklist_item")),
+    (sync_repository.get_changes, (0, 100)),
+    (workspace_repository.iter_workspace, ()),
+    (workspace_repository.insert_global_measurement_sets, ([{"name": "Imported", "waist": 70.0}],)),
+    (workspace_repository.insert_projects, ([{
+        "name": "Imported", "checklist": [{"title": "Cut"}], "materials": [{"name": "Wool"}],
+        "patterns": [{"url": "u"}], "progress_images": [{"url": "u"}], "measurement_sets": [{"name": "ms"}],
+        "global_measurement_set_ids": [GLOBAL_ID],
+    }],)),
+]
+
+# "--" lines are statements SQLite runs itself, e.g. FTS5 reading its shadow tables
+_SKIP = re.compile(r"^\s*(PRAGMA|BEGIN|COMMIT|ROLLBACK|SAVEPOINT|RELEASE|--)", re.IGNORECASE)
+_TABLE_REF = re.compile(r"\b(?:FROM|JOIN|UPDATE|INTO)\s+(\w+)(?:\s+(?:AS\s+)?(\w+))?", re.IGNORECASE)
+# A bare "SEARCH t" (no USING ...) is a scan the planner could only cut short, e.g. MAX()
+_SCAN = re.compile(r"^(?:SCAN (\w+)|SEARCH (\w+)$)")
+
+
+def _seed(conn: sqlite3.Connection, projects: int = 20, children: int = 30) -> None:
+    conn.executemany(
+        "INSERT INTO projects (name, budget) VALUES (?, 100)", [(f"P{i}",) for i in range(projects)]
+    )
+    for pid in range(1, projects + 1):
+        conn.executemany(
+            "INSERT INTO checklist_items (project_id, title, position) VALUES (?, ?, ?)",
+            [(pid, f"Step {i}", i) for i in range(children)],
+        )
+        conn.executemany(
+            "INSERT INTO project_materials (project_id, name, price, purchased) VALUES (?, 'M', 5, 1)",
+            [(pid,)] * children,
+        )
+        conn.executemany(
+            "INSERT INTO saved_patterns (project_id, url, price_paid) VALUES (?, 'u', 3)", [(pid,)] * children
+        )
+        conn.executemany("INSERT INTO project_progress_images (project_id, url) VALUES (?, 'u')", [(pid,)] * children)
+        conn.executemany(
+            "INSERT INTO project_measurement_sets (project_id, name) VALUES (?, 'ms')", [(pid,)] * children
+        )
+    conn.executemany("INSERT INTO global_measurement_sets (name) VALUES (?)", [("g1",), ("g2",)])
+    conn.execute("INSERT INTO project_global_measurements VALUES (?, ?)", (PROJECT_ID, GLOBAL_ID + 1))
+
+
+def _aliases(sql: str) -> dict[str, str]:
+    """Map every table name and alias in a statement to its table."""
+    aliases = {}
+    for table, alias in _TABLE_REF.findall(sql):
+        aliases[table] = table
+        if alias and alias.upper() not in {"WHERE", "SET", "ON", "VALUES", "ORDER", "GROUP", "JOIN", "SELECT"}:
+            aliases[alias] = table
+    return aliases
+
+
+@pytest.fixture
+def traced_statements(temp_db, monkeypatch):
+    init_db()
+    with database.get_connection() as conn:
+        _seed(conn)
+    database.close_pool()
+
+    captured: list[str] = []
+    connect = database._connect
+
+    def traced_connect():
+        conn = connect()
+        conn.set_trace_callback(captured.append)
+        return conn
+
+    monkeypatch.setattr(database, "_connect", traced_connect)
+
+    statements: list[tuple[str, str]] = []
+    for func, args in CALLS:
+        captured.clear()
+        result = func(*args)
+        if inspect.isgenerator(result):
+            list(result)
+        statements += [(func.__name__, sql) for sql in captured if not _SKIP.match(sql)]
+    return statements
+
+
+def test_every_repository_function_is_audited():
+    audited = {func for func, _ in CALLS}
+    for module in (project_repository, measurements_repository, search_repository, sync_repository, workspace_repository):
+        for name, func in inspect.getmembers(module, inspect.isfunction):
+            if func.__module__ == module.__name__ and not name.startswith("_"):
+                assert func in audited, f"{module.__name__}.{name} is missing from CALLS"
+
+
+def test_no_full_scans_of_large_tables(traced_statements):
+    assert traced_statements
+    failures = []
+    conn = sqlite3.connect(database.DB_PATH)
+    try:
+        for func_name, sql in traced_statements:
+            aliases = _aliases(sql)
+            for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}"):
+                match = _SCAN.match(row[3])
+                if not match:
+                    continue
+                name = match.group(1) or match.group(2)
+                table = aliases.get(name, name)
+                if table not in LARGE_TABLES or (func_name, table) in ALLOWED_SCANS:
+                    continue
+                if (func_name, table) in ALLOWED_INDEX_SCANS and "INDEX" in row[3]:
+                    continue
+                failures.append(f"{func_name}: {row[3]}\n    {' '.join(sql.split())}")
+    finally:
+        conn.close()
+    assert not failures, "Full table scans:\n" + "\n".join(failures)
@@ -0,0 +1,107 @@
+import threading
+import time
+
+import pytest
+
+from models.material import FabricSearchResult
+from services import scraper_cache
+
+
+class Store:
+    """A fake scraper counting its round trips."""
+
+    def __init__(self, title: str = "Taffeta"):
+        self.title = title
+        self.calls: list[str] = []
+        self.fetched = threading.Event()
+
+    def search(self, query: str) -> list[FabricSearchResult]:
+        self.calls.append(query)
+        self.fetched.set()
+        return [FabricSearchResult(source="fabricville", title=self.title, url="https://fabricville.com/p/1")]
+
+
+def _search(store: Store, query: str = "taffeta", source: str = "fabricville") -> list[FabricSearchResult]:
+    return scraper_cache.cached(source, query, store.search, FabricSearchResult)
+
+
+def test_repeat_searches_are_served_from_the_cache():
+    store = Store()
+    assert _search(store, "Silk  TAFFETA")[0].title == "Taffeta"
+    assert _search(store, " silk taffeta ") == _search(store, "silk taffeta")
+    assert store.calls == ["Silk  TAFFETA"]
+    _search(store, "silk taffeta", source="tonitex")
+    assert len(store.calls) == 2
+
+
+def test_scraper_gets_the_query_as_given(monkeypatch):
+    store = Store()
+    _search(store, "Silk  TAFFETA")
+    monkeypatch.setitem(scraper_cache.TTLS, "fabricville", 0)
+    _search(store, "SILK taffeta")  # stale: served while it refreshes
+    deadline = time.monotonic() + 5
+    while scraper_cache._refreshing and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert store.calls == ["Silk  TAFFETA", "SILK taffeta"]
+
+
+def test_entries_survive_a_restart():
+    _search(Store())
+    scraper_cache.close()
+    store = Store()
+    _search(store)
+    assert store.calls == []
+
+
+def test_expired_entry_is_served_while_it_refreshes(monkeypatch):
+    _search(Store("Old"))
+    monkeypatch.setitem(scraper_cache.TTLS, "fabricville", 0)
+    store = Store("New")
+    assert _search(store)[0].title == "Old"
+    assert store.fetched.wait(5)
+    deadline = time.monotonic() + 5
+    while scraper_cache._refreshing and time.monotonic() < deadline:
+        time.sleep(0.01)  # the refresh stores its results after fetching
+    monkeypatch.setitem(scraper_cache.TTLS, "fabricville", 3600)
+    assert _search(Store())[0].title == "New"
+
+
+def test_entry_too_old_to_serve_is_fetched_again(monkeypatch):
+    _search(Store("Old"))
+    monkeypatch.setitem(scraper_cache.TTLS, "fabricville", 0)
+    monkeypatch.setattr(scraper_cache, "STALE_S", 0)
+    assert _search(Store("New"))[0].title == "New"
+
+
+def test_least_recently_used_entries_are_evicted(monkeypatch):
+    monkeypatch.setattr(scraper_cache, "MAX_ENTRIES", 2)
+    store = Store()
+    _search(store, "a")
+    _search(store, "b")
+    _search(store, "a")
+    _search(store, "c")
+    store.calls.clear()
+    _search(store, "a")
+    _search(store, "c")
+    assert store.calls == []
+    _search(store, "b")
+    assert store.calls == ["b"]
+
+
+def test_unusable_cache_file_falls_back_to_the_scraper(tmp_path, monkeypatch):
+    monkeypatch.setattr(scraper_cache, "CACHE_PATH", str(tmp_path))  # a directory
+    store = Store()
+    assert _search(store)[0].title == "Taffeta"
+    assert _search(store)[0].title == "Taffeta"
+    assert len(store.calls) == 2
+
+
+def test_scraper_errors_are_not_cached():
+    def broken(query):
+        raise RuntimeError("blocked")
+
+    with pytest.raises(RuntimeError):
+        scraper_cache.cached("fabricville", "taffeta", broken, FabricSearchResult)
+    store = Store()
+    _search(store)
+    assert store.calls == ["taffeta"]
@@ -0,0 +1,31 @@
+from unittest.mock import patch
+
+import httpx
+
+from scrapers import _http
+
+
+async def test_clients_are_shared_per_host():
+    try:
+        shop = _http.client("https://shop.example.com/search?q=wool")
+        assert _http.client("https://SHOP.example.com/products.json") is shop
+        assert _http.client("https://other.example.com/") is not shop
+        assert _http.async_client("https://overpass.example.com/a") is _http.async_client("https://overpass.example.com/b")
+    finally:
+        await _http.close_clients()
+    assert shop.is_closed
+    assert _http.client("https://shop.example.com/") is not shop
+    await _http.close_clients()
+
+
+async def test_arbitrary_hosts_share_one_client():
+    try:
+        with patch.object(httpx.Client, "get") as get:
+            for i in range(3):
+                _http.get(f"https://site{i}.example.com/pattern", per_host=False)
+        assert _http._clients == {}
+        assert {call.args[0] for call in get.call_args_list} == {f"https://site{i}.example.com/pattern" for i in range(3)}
+        shared = _http.any_host_client()
+    finally:
+        await _http.close_clients()
+    assert shared.is_closed
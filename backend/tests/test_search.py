@@ -0,0 +1,120 @@
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from database import get_connection, init_db
+from main import app
+from repositories import project_repository
+from services import search_service
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def coat(temp_db):
+    init_db()
+    project_id = project_repository.create_project("Wool coat", "With a silk lining", 250.0)["id"]
+    project_repository.add_checklist_item(project_id, "Cut the wool", "Mind the grain line")
+    project_repository.add_material(project_id, "Silk charmeuse", "2m", "For the lining", care_instructions="Dry clean")
+    project_repository.save_pattern(project_id, "mood", "Coat pattern", "https://example.com", None, None, notes="Size 12")
+    return project_id
+
+
+async def test_search_covers_every_kind(coat):
+    page = await search_service.search("silk")
+    assert {(r["kind"], r["project_id"]) for r in page["items"]} == {("project", coat), ("material", coat)}
+
+    kinds = {r["kind"] for r in (await search_service.search("coat"))["items"]}
+    assert kinds == {"project", "pattern"}
+    assert [r["kind"] for r in (await search_service.search("dry clean"))["items"]] == ["material"]
+    assert [r["kind"] for r in (await search_service.search("grain"))["items"]] == ["checklist_item"]
+
+
+async def test_search_ranks_title_hits_first_and_highlights(coat):
+    first = (await search_service.search("silk"))["items"][0]
+    assert first["kind"] == "material"  # title hit beats the project's description hit
+    assert first["title"] == "<mark>Silk</mark> charmeuse"
+
+
+async def test_search_escapes_stored_text(coat):
+    project_repository.add_checklist_item(coat, "<b>Press</b> seams", "")
+    item = (await search_service.search("press"))["items"][0]
+    assert item["title"] == "&lt;b&gt;<mark>Press</mark>&lt;/b&gt; seams"
+
+
+async def test_search_matches_word_prefixes_and_ignores_syntax(coat):
+    assert (await search_service.search("charm"))["total"] == 1
+    # FTS5 operators and quotes in user input are searched as plain words
+    assert (await search_service.search('silk" -(*'))["total"] == 2
+    assert (await search_service.search("silk NEAR"))["total"] == 0
+    with pytest.raises(ValueError):
+        await search_service.search("**")
+
+
+async def test_search_pages_cover_every_match_once(coat):
+    for i in range(7):
+        project_repository.add_checklist_item(coat, f"Hem step {i}", "")
+    seen, cursor = [], None
+    while True:
+        page = await search_service.search("hem", limit=3, cursor=cursor)
+        assert page["total"] == 7
+        seen += [r["id"] for r in page["items"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert len(seen) == len(set(seen)) == 7
+
+    checklist = await search_service.search("wool", kind="checklist_item")
+    assert [r["kind"] for r in checklist["items"]] == ["checklist_item"]
+
+
+async def test_search_index_follows_writes(coat):
+    item = project_repository.add_checklist_item(coat, "Baste sleeves", "")
+    assert (await search_service.search("baste"))["total"] == 1
+
+    project_repository.update_checklist_item(item["id"], coat, "Set sleeves", "", "[]")
+    assert (await search_service.search("baste"))["total"] == 0
+    assert (await search_service.search("sleeves"))["items"][0]["id"] == item["id"]
+
+    project_repository.delete_checklist_item(item["id"], coat)
+    assert (await search_service.search("sleeves"))["total"] == 0
+
+    project_repository.delete_project(coat)  # children go through ON DELETE CASCADE
+    assert (await search_service.search("silk coat grain"))["total"] == 0
+    assert (await search_service.search("coat"))["total"] == 0
+
+
+async def test_material_without_notes_indexes_an_empty_body(coat):
+    material = project_repository.add_material(coat, "Buttons", "6", "")
+    project_repository.add_material(coat, "Thread", "1", "Grey")
+    with get_connection() as conn:
+        bodies = [r[0] for r in conn.execute("SELECT body FROM search_index WHERE title IN ('Buttons', 'Thread')")]
+    assert sorted(bodies) == ["", "Grey"]
+    assert (await search_service.search("buttons"))["items"][0]["id"] == material["id"]
+
+
+def test_search_endpoint_returns_page_with_headers():
+    page = {
+        "items": [{
+            "kind": "material", "id": 3, "project_id": 1, "project_name": "Wool coat",
+            "title": "<mark>Silk</mark> charmeuse", "snippet": "",
+        }],
+        "next_cursor": "abc",
+        "total": 4,
+    }
+    with patch("services.search_service.search", return_value=page) as mock:
+        res = client.get("/api/search?q=silk&limit=1&kind=material")
+    assert res.status_code == 200
+    assert res.json() == page["items"]
+    assert res.headers["X-Total-Count"] == "4"
+    assert res.headers["X-Next-Cursor"] == "abc"
+    mock.assert_called_once_with("silk", 1, None, "material")
+
+
+def test_search_endpoint_rejects_bad_query():
+    with patch("services.search_service.search", side_effect=ValueError("Search query has no words")):
+        res = client.get("/api/search?q=**")
+    assert res.status_code == 400
+    assert client.get("/api/search").status_code == 422
+    assert client.get("/api/search?q=silk&kind=bogus").status_code == 422
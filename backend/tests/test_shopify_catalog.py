@@ -0,0 +1,109 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from services import material_service, pattern_search_service, shopify_catalog
+
+
+def _product(id: int, title: str, updated_at: str = "2026-01-01T10:00:00-05:00", **fields) -> dict:
+    return {
+        "id": id, "title": title, "handle": f"p{id}", "product_type": "PDF", "tags": [],
+        "variants": [{"price": "12.50"}], "images": [{"src": f"https://cdn.shopify.com/{id}.jpg"}],
+        "updated_at": updated_at, **fields,
+    }
+
+
+@pytest.fixture
+def catalog(tmp_path, monkeypatch):
+    """A fake store; set `catalog.products` and every request pages through them."""
+    monkeypatch.setattr(shopify_catalog, "CATALOG_PATH", str(tmp_path / "catalog.db"))
+    monkeypatch.setattr(shopify_catalog, "PAGE_SIZE", 2)
+    shopify_catalog.clear()
+    requests = []
+
+    def get(url, params, **kwargs):
+        requests.append(params)
+        since = shopify_catalog._utc(params.get("updated_at_min")) if params.get("updated_at_min") else ""
+        products = [p for p in fake.products if shopify_catalog._utc(p["updated_at"]) >= since]
+        start = (params["page"] - 1) * params["limit"]
+        resp = MagicMock()
+        resp.json.return_value = {"products": products[start:start + params["limit"]]}
+        return resp
+
+    fake = MagicMock(products=[], requests=requests)
+    monkeypatch.setattr(shopify_catalog._http, "get", get)
+    yield fake
+    shopify_catalog.clear()
+
+
+def test_unmirrored_store_falls_back_to_live_search(catalog):
+    assert shopify_catalog.search("black_snail", "dress") is None
+
+
+def test_first_sync_pages_through_the_whole_catalog(catalog):
+    catalog.products = [_product(i, f"Pattern {i}") for i in range(1, 6)]
+    catalog.products.append(_product(6, "Visiting Dress 1872", tags=["victorian", "bustle"]))
+    assert shopify_catalog.sync_store("black_snail") == 6
+    assert [r["page"] for r in catalog.requests] == [1, 2, 3, 4]
+
+    results = shopify_catalog.search("black_snail", "victorian dress")
+    assert [(r.title, r.price, r.url) for r in results] == [
+        ("Visiting Dress 1872", "12.50", "https://blacksnailpatterns.com/products/p6"),
+    ]
+    assert [r.title for r in shopify_catalog.search("black_snail", "bust")] == ["Visiting Dress 1872"]
+    assert shopify_catalog.search("black_snail", "corset") == []
+
+
+def test_later_syncs_fetch_only_updated_products(catalog, monkeypatch):
+    catalog.products = [_product(1, "Bodice"), _product(2, "Skirt")]
+    shopify_catalog.sync_store("fabricville")
+    catalog.requests.clear()
+
+    catalog.products[1] = _product(2, "Bustle Skirt", updated_at="2026-02-01T00:00:00Z")
+    assert shopify_catalog.sync_store("fabricville") == 1
+    assert catalog.requests[0]["updated_at_min"] == "2026-01-01T15:00:00+00:00"
+    [skirt] = shopify_catalog.search("fabricville", "bustle")
+    assert (skirt.source, skirt.price) == ("fabricville", "CAD $12.50")
+
+    # A full pass drops what the store removed
+    catalog.products = catalog.products[1:]
+    monkeypatch.setattr(shopify_catalog, "FULL_SYNC_S", 0)
+    assert shopify_catalog.sync_store("fabricville") == 1
+    assert shopify_catalog.search("fabricville", "bodice") == []
+
+
+def test_pass_cut_off_at_max_pages_removes_nothing(catalog, monkeypatch):
+    monkeypatch.setattr(shopify_catalog, "MAX_PAGES", 2)
+    catalog.products = [_product(i, f"Pattern {i}") for i in range(1, 7)]
+    shopify_catalog.sync_store("fabricville")
+
+    catalog.products = catalog.products[1:]
+    catalog.requests.clear()
+    shopify_catalog.sync_store("fabricville")
+    assert "updated_at_min" not in catalog.requests[0]  # still owes a full pass
+    assert [r.title for r in shopify_catalog.search("fabricville", "pattern 1")] == ["Pattern 1"]
+
+
+def test_mirror_survives_a_restart(catalog):
+    catalog.products = [_product(1, "Chemise", tags="underwear, regency")]
+    shopify_catalog.sync_store("spool_of_thread")
+    shopify_catalog.clear()
+    shopify_catalog.load()
+    assert [r.title for r in shopify_catalog.search("spool_of_thread", "regency")] == ["Chemise"]
+
+
+def test_products_without_variants_have_no_price(catalog):
+    catalog.products = [_product(1, "Gift Card", variants=[])]
+    shopify_catalog.sync_store("fabricville")
+    shopify_catalog.sync_store("black_snail")
+    assert [r.price for r in shopify_catalog.search("fabricville", "gift")] == [None]
+    assert [r.price for r in shopify_catalog.search("black_snail", "gift")] == [None]
+
+
+def test_services_search_the_mirror(catalog, monkeypatch):
+    catalog.products = [_product(1, "Silk Taffeta")]
+    shopify_catalog.sync_store("fabricville")
+    shopify_catalog.sync_store("black_snail")
+    monkeypatch.setattr(material_service.SCRAPERS["fabricville"], "search", None)
+    assert [r.title for r in material_service.search_fabrics("taffeta", "fabricville")] == ["Silk Taffeta"]
+    assert [r.source for r in pattern_search_service.search_source("black_snail", "silk")] == ["black_snail"]
@@ -25,25 +25,25 @@ def _mock_resp(data=MOCK_SUGGEST):
 
 
 def test_returns_results():
-    with patch("scrapers.materials._shopify.httpx.get", return_value=_mock_resp()):
+    with patch("scrapers.materials._shopify._http.get", return_value=_mock_resp()):
         results = search("jersey")
     assert len(results) == 1
 
 
 def test_source_is_spool_of_thread():
-    with patch("scrapers.materials._shopify.httpx.get", return_value=_mock_resp()):
+    with patch("scrapers.materials._shopify._http.get", return_value=_mock_resp()):
         results = search("jersey")
     assert results[0].source == "spool_of_thread"
 
 
 def test_title_and_price():
-    with patch("scrapers.materials._shopify.httpx.get", return_value=_mock_resp()):
+    with patch("scrapers.materials._shopify._http.get", return_value=_mock_resp()):
         results = search("jersey")
     assert results[0].title == "Organic Cotton Jersey"
     assert results[0].price == "CAD $8.50"
 
 
 def test_url_is_absolute():
-    with patch("scrapers.materials._shopify.httpx.get", return_value=_mock_resp()):
+    with patch("scrapers.materials._shopify._http.get", return_value=_mock_resp()):
         results = search("jersey")
     assert results[0].url == "https://spoolofthread.com/products/organic-cotton-jersey"
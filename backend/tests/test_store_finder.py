@@ -28,8 +28,8 @@ def _make_mock_response(elements):
 
 @pytest.mark.asyncio
 async def test_find_nearby_stores_returns_formatted_results():
-    with patch("services.store_finder.httpx.AsyncClient") as mock_client:
-        mock_client.return_value.__aenter__.return_value.post = AsyncMock(
+    with patch("services.store_finder._http.async_client") as mock_client:
+        mock_client.return_value.post = AsyncMock(
             return_value=_make_mock_response(MOCK_ELEMENTS)
         )
         results = await find_nearby_stores(51.5, -0.1)
@@ -44,8 +44,8 @@ async def test_find_nearby_stores_returns_formatted_results():
 
 @pytest.mark.asyncio
 async def test_find_nearby_stores_builds_address():
-    with patch("services.store_finder.httpx.AsyncClient") as mock_client:
-        mock_client.return_value.__aenter__.return_value.post = AsyncMock(
+    with patch("services.store_finder._http.async_client") as mock_client:
+        mock_client.return_value.post = AsyncMock(
             return_value=_make_mock_response(MOCK_ELEMENTS)
         )
         results = await find_nearby_stores(51.5, -0.1)
@@ -56,8 +56,8 @@ async def test_find_nearby_stores_builds_address():
 
 @pytest.mark.asyncio
 async def test_find_nearby_stores_empty_response():
-    with patch("services.store_finder.httpx.AsyncClient") as mock_client:
-        mock_client.return_value.__aenter__.return_value.post = AsyncMock(
+    with patch("services.store_finder._http.async_client") as mock_client:
+        mock_client.return_value.post = AsyncMock(
             return_value=_make_mock_response([])
         )
         results = await find_nearby_stores(51.5, -0.1)
@@ -68,8 +68,8 @@ async def test_find_nearby_stores_empty_response():
 @pytest.mark.asyncio
 async def test_find_nearby_stores_missing_name_fallback():
     elements = [{"tags": {}, "lat": 51.5, "lon": -0.1}]
-    with patch("services.store_finder.httpx.AsyncClient") as mock_client:
-        mock_client.return_value.__aenter__.return_value.post = AsyncMock(
+    with patch("services.store_finder._http.async_client") as mock_client:
+        mock_client.return_value.post = AsyncMock(
             return_value=_make_mock_response(elements)
         )
         results = await find_nearby_stores(51.5, -0.1)
@@ -0,0 +1,105 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from database import init_db
+from main import app
+from repositories import measurements_repository, project_repository
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def coat(temp_db):
+    init_db()
+    project_id = project_repository.create_project("Wool coat", "", 250.0)["id"]
+    project_repository.add_checklist_item(project_id, "Cut", "")
+    project_repository.add_material(project_id, "Wool", "3m", "")
+    return project_id
+
+
+def _sync(since: str | None = None, **params) -> dict:
+    resp = client.get("/api/sync", params={"since": since, **params} if since else params)
+    assert resp.status_code == 200
+    return resp.json()
+
+
+def _changed(page: dict) -> list[tuple[str, str, bool]]:
+    return [(c["table"], (c["row"] or {}).get("name") or (c["row"] or {}).get("title"), c["deleted"]) for c in page]
+
+
+def test_full_sync_then_nothing_new(coat):
+    page = _sync()
+    assert sorted(_changed(page["changes"])) == [
+        ("checklist_items", "Cut", False),
+        ("project_materials", "Wool", False),
+        ("projects", "Wool coat", False),
+    ]
+    assert page["has_more"] is False
+    assert _sync(page["cursor"])["changes"] == []
+
+
+def test_only_rows_changed_after_the_cursor_come_back(coat):
+    cursor = _sync()["cursor"]
+    item = project_repository.get_checklist(coat)[0]
+    project_repository.toggle_checklist_item(item["id"], coat)
+    project_repository.toggle_checklist_item(item["id"], coat)
+    project_repository.update_checklist_item(item["id"], coat, "Cut", "", '["/uploads/a.png"]')
+    material = project_repository.get_materials(coat)[0]
+    project_repository.delete_material(material["id"], coat)
+
+    page = _sync(cursor)
+    # Recomputing the project's total_spent alone doesn't report the project
+    assert _changed(page["changes"]) == [("checklist_items", "Cut", False), ("project_materials", None, True)]
+    assert page["changes"][0]["row"]["image_urls"] == ["/uploads/a.png"]
+    assert page["changes"][1]["id"] == material["id"]
+    assert page["changes"][1]["project_id"] == coat
+
+
+def test_project_comes_back_for_its_own_columns_only(coat):
+    cursor = _sync()["cursor"]
+    project_repository.add_material(coat, "Lining", "2m", "", price=30.0)
+    assert _changed(_sync(cursor)["changes"]) == [("project_materials", "Lining", False)]
+
+    project_repository.update_project_status(coat, "in_progress")
+    assert _changed(_sync(cursor)["changes"])[-1] == ("projects", "Wool coat", False)
+
+
+def test_deleted_project_is_one_tombstone(coat):
+    cursor = _sync()["cursor"]
+    project_repository.delete_project(coat)
+    changes = _sync(cursor)["changes"]
+    assert [(c["table"], c["id"], c["deleted"]) for c in changes] == [("projects", coat, True)]
+    assert [c["table"] for c in _sync()["changes"]] == ["projects"]
+
+
+def test_global_set_links_are_reported_with_the_project(coat):
+    global_set = measurements_repository.add("Me", {"waist": 70.0})
+    cursor = _sync()["cursor"]
+    measurements_repository.link_to_project(coat, [global_set["id"]])
+    project = _sync(cursor)["changes"][0]
+    assert project["table"] == "projects"
+    assert project["row"]["global_measurement_set_ids"] == [global_set["id"]]
+
+    cursor = _sync()["cursor"]
+    measurements_repository.delete(global_set["id"])
+    changes = _sync(cursor)["changes"]
+    assert {(c["table"], c["deleted"]) for c in changes} == {("global_measurement_sets", True), ("projects", False)}
+
+
+def test_pages_follow_the_cursor(coat):
+    for title in ("Sew", "Press", "Hem"):
+        project_repository.add_checklist_item(coat, title, "")
+    seen, cursor = [], None
+    while True:
+        page = _sync(cursor, limit=2)
+        seen += page["changes"]
+        cursor = page["cursor"]
+        if not page["has_more"]:
+            break
+    assert len(seen) == 6
+    assert len({(c["table"], c["id"]) for c in seen}) == 6
+
+
+@pytest.mark.parametrize("cursor", ["abc", "-1", "999999"])
+def test_bad_cursor_is_rejected(coat, cursor):
+    assert client.get("/api/sync", params={"since": cursor}).status_code == 400
@@ -43,42 +43,42 @@ def _mock_resp(html=MOCK_HTML):
 
 
 def test_returns_results():
-    with patch("scrapers.materials.the_fabric_club_scraper.httpx.get", return_value=_mock_resp()):
+    with patch("scrapers.materials.the_fabric_club_scraper._http.get", return_value=_mock_resp()):
         results = search("wool")
     assert len(results) == 2
 
 
 def test_title_extracted():
-    with patch("scrapers.materials.the_fabric_club_scraper.httpx.get", return_value=_mock_resp()):
+    with patch("scrapers.materials.the_fabric_club_scraper._http.get", return_value=_mock_resp()):
         results = search("wool")
     assert results[0].title == "Wool Tweed Fabric"
 
 
 def test_price_extracted():
-    with patch("scrapers.materials.the_fabric_club_scraper.httpx.get", return_value=_mock_resp()):
+    with patch("scrapers.materials.the_fabric_club_scraper._http.get", return_value=_mock_resp()):
         results = search("wool")
     assert results[0].price == "$28.00"
 
 
 def test_image_url_extracted():
-    with patch("scrapers.materials.the_fabric_club_scraper.httpx.get", return_value=_mock_resp()):
+    with patch("scrapers.materials.the_fabric_club_scraper._http.get", return_value=_mock_resp()):
         results = search("wool")
     assert "wool-tweed.jpg" in results[0].image_url
 
 
 def test_product_url_extracted():
-    with patch("scrapers.materials.the_fabric_club_scraper.httpx.get", return_value=_mock_resp()):
+    with patch("scrapers.materials.the_fabric_club_scraper._http.get", return_value=_mock_resp()):
         results = search("wool")
     assert results[0].url == "https://www.thefabricclub.ca/en/wool-tweed-fabric.html"
 
 
 def test_source_is_the_fabric_club():
-    with patch("scrapers.materials.the_fabric_club_scraper.httpx.get", return_value=_mock_resp()):
+    with patch("scrapers.materials.the_fabric_club_scraper._http.get", return_value=_mock_resp()):
         results = search("wool")
     assert results[0].source == "the_fabric_club"
 
 
 def test_empty_results():
-    with patch("scrapers.materials.the_fabric_club_scraper.httpx.get", return_value=_mock_resp("<html><body></body></html>")):
+    with patch("scrapers.materials.the_fabric_club_scraper._http.get", return_value=_mock_resp("<html><body></body></html>")):
         results = search("xyzzy")
     assert results == []
@@ -29,42 +29,42 @@ def _mock_resp(html=MOCK_HTML, status=200):
 
 
 def test_returns_results():
-    with patch("scrapers.materials._prestashop.httpx.get", return_value=_mock_resp()):
+    with patch("scrapers.materials._prestashop._http.get", return_value=_mock_resp()):
         results = search("cotton")
     assert len(results) == 2
 
 
 def test_title_extracted():
-    with patch("scrapers.materials._prestashop.httpx.get", return_value=_mock_resp()):
+    with patch("scrapers.materials._prestashop._http.get", return_value=_mock_resp()):
         results = search("cotton")
     assert results[0].title == "Cotton Lawn Fabric"
 
 
 def test_price_extracted():
-    with patch("scrapers.materials._prestashop.httpx.get", return_value=_mock_resp()):
+    with patch("scrapers.materials._prestashop._http.get", return_value=_mock_resp()):
         results = search("cotton")
     assert results[0].price == "$8.95"
 
 
 def test_image_url_extracted():
-    with patch("scrapers.materials._prestashop.httpx.get", return_value=_mock_resp()):
+    with patch("scrapers.materials._prestashop._http.get", return_value=_mock_resp()):
         results = search("cotton")
     assert "cotton-lawn.jpg" in results[0].image_url
 
 
 def test_product_url_extracted():
-    with patch("scrapers.materials._prestashop.httpx.get", return_value=_mock_resp()):
+    with patch("scrapers.materials._prestashop._http.get", return_value=_mock_resp()):
         results = search("cotton")
     assert results[0].url == "https://tonitex.com/en/fabric/12-cotton-lawn.html"
 
 
 def test_source_is_tonitex():
-    with patch("scrapers.materials._prestashop.httpx.get", return_value=_mock_resp()):
+    with patch("scrapers.materials._prestashop._http.get", return_value=_mock_resp()):
         results = search("cotton")
     assert results[0].source == "tonitex"
 
 
 def test_empty_results():
-    with patch("scrapers.materials._prestashop.httpx.get", return_value=_mock_resp("<html><body></body></html>")):
+    with patch("scrapers.materials._prestashop._http.get", return_value=_mock_resp("<html><body></body></html>")):
         results = search("xyzzy")
     assert results == []
@@ -75,38 +75,38 @@ def _mock_response(html: str, status: int = 200):
 # --- search_patterns ---
 
 def test_search_returns_results():
-    with patch("scrapers.patterns.truly_victorian_scraper.httpx.get", return_value=_mock_response(MOCK_SEARCH_HTML)):
+    with patch("scrapers.patterns.truly_victorian_scraper._http.get", return_value=_mock_response(MOCK_SEARCH_HTML)):
         results = search_patterns("bustle skirt")
     assert len(results) == 2
     assert results[0].source == "truly_victorian"
 
 
 def test_search_extracts_title():
-    with patch("scrapers.patterns.truly_victorian_scraper.httpx.get", return_value=_mock_response(MOCK_SEARCH_HTML)):
+    with patch("scrapers.patterns.truly_victorian_scraper._http.get", return_value=_mock_response(MOCK_SEARCH_HTML)):
         results = search_patterns("bustle skirt")
     assert results[0].title == "TV100 1880s Bustle Skirt"
 
 
 def test_search_extracts_price():
-    with patch("scrapers.patterns.truly_victorian_scraper.httpx.get", return_value=_mock_response(MOCK_SEARCH_HTML)):
+    with patch("scrapers.patterns.truly_victorian_scraper._http.get", return_value=_mock_response(MOCK_SEARCH_HTML)):
         results = search_patterns("bustle skirt")
     assert results[0].price == "$16.00"
 
 
 def test_search_extracts_image():
-    with patch("scrapers.patterns.truly_victorian_scraper.httpx.get", return_value=_mock_response(MOCK_SEARCH_HTML)):
+    with patch("scrapers.patterns.truly_victorian_scraper._http.get", return_value=_mock_response(MOCK_SEARCH_HTML)):
         results = search_patterns("bustle skirt")
     assert "tv100.jpg" in results[0].image_url
 
 
 def test_search_sets_brand():
-    with patch("scrapers.patterns.truly_victorian_scraper.httpx.get", return_value=_mock_response(MOCK_SEARCH_HTML)):
+    with patch("scrapers.patterns.truly_victorian_scraper._http.get", return_value=_mock_response(MOCK_SEARCH_HTML)):
         results = search_patterns("bustle skirt")
     assert results[0].brand == "Truly Victorian"
 
 
 def test_search_empty_page_returns_empty():
-    with patch("scrapers.patterns.truly_victorian_scraper.httpx.get", return_value=_mock_response("<html></html>")):
+    with patch("scrapers.patterns.truly_victorian_scraper._http.get", return_value=_mock_response("<html></html>")):
         results = search_patterns("nothing")
     assert results == []
 
@@ -114,38 +114,38 @@ def test_search_empty_page_returns_empty():
 # --- scrape_pattern_detail ---
 
 def test_detail_extracts_title():
-    with patch("scrapers.patterns.truly_victorian_scraper.httpx.get", return_value=_mock_response(MOCK_DETAIL_HTML)):
+    with patch("scrapers.patterns.truly_victorian_scraper._http.get", return_value=_mock_response(MOCK_DETAIL_HTML)):
         detail = scrape_pattern_detail("https://trulyvictorian.info/shop/tv100/")
     assert detail.title == "TV100 1880s Bustle Skirt"
     assert detail.source == "truly_victorian"
 
 
 def test_detail_extracts_sku():
-    with patch("scrapers.patterns.truly_victorian_scraper.httpx.get", return_value=_mock_response(MOCK_DETAIL_HTML)):
+    with patch("scrapers.patterns.truly_victorian_scraper._http.get", return_value=_mock_response(MOCK_DETAIL_HTML)):
         detail = scrape_pattern_detail("https://trulyvictorian.info/shop/tv100/")
     assert detail.pattern_number == "TV100"
 
 
 def test_detail_extracts_price():
-    with patch("scrapers.patterns.truly_victorian_scraper.httpx.get", return_value=_mock_response(MOCK_DETAIL_HTML)):
+    with patch("scrapers.patterns.truly_victorian_scraper._http.get", return_value=_mock_response(MOCK_DETAIL_HTML)):
         detail = scrape_pattern_detail("https://trulyvictorian.info/shop/tv100/")
     assert detail.price == "$16.00"
 
 
 def test_detail_extracts_image():
-    with patch("scrapers.patterns.truly_victorian_scraper.httpx.get", return_value=_mock_response(MOCK_DETAIL_HTML)):
+    with patch("scrapers.patterns.truly_victorian_scraper._http.get", return_value=_mock_response(MOCK_DETAIL_HTML)):
         detail = scrape_pattern_detail("https://trulyvictorian.info/shop/tv100/")
     assert "tv100-main.jpg" in detail.image_url
 
 
 def test_detail_extracts_fabrics():
-    with patch("scrapers.patterns.truly_victorian_scraper.httpx.get", return_value=_mock_response(MOCK_DETAIL_HTML)):
+    with patch("scrapers.patterns.truly_victorian_scraper._http.get", return_value=_mock_response(MOCK_DETAIL_HTML)):
         detail = scrape_pattern_detail("https://trulyvictorian.info/shop/tv100/")
     assert any("wool" in f.lower() for f in detail.fabric_recommendations)
 
 
 def test_detail_sets_brand():
-    with patch("scrapers.patterns.truly_victorian_scraper.httpx.get", return_value=_mock_response(MOCK_DETAIL_HTML)):
+    with patch("scrapers.patterns.truly_victorian_scraper._http.get", return_value=_mock_response(MOCK_DETAIL_HTML)):
         detail = scrape_pattern_detail("https://trulyvictorian.info/shop/tv100/")
     assert detail.brand == "Truly Victorian"
 
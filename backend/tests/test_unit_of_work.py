@@ -0,0 +1,206 @@
+import sqlite3
+import threading
+import time
+from unittest.mock import patch
+
+import anyio
+import httpx
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+import database
+from api.dependencies import unit_of_work
+from database import init_db
+from main import app
+from repositories import project_repository
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def db(temp_db):
+    init_db()
+    return temp_db
+
+
+def _project_names(db) -> list[str]:
+    # Separate connection: sees only committed data
+    conn = sqlite3.connect(db.DB_PATH)
+    try:
+        return [row[0] for row in conn.execute("SELECT name FROM projects ORDER BY id")]
+    finally:
+        conn.close()
+
+
+def test_unit_of_work_shares_one_connection_and_commits_once(db, monkeypatch):
+    connections = []
+    connect = database._connect
+
+    def counted_connect():
+        connections.append(connect())
+        return connections[-1]
+
+    db.close_pool()
+    monkeypatch.setattr(database, "_connect", counted_connect)
+
+    with database.unit_of_work() as uow:
+        created = project_repository.create_project("Coat", "", None)
+        project_repository.add_material(created["id"], "Wool", "3m", "")
+        assert uow.connection().in_transaction
+        assert _project_names(db) == []
+
+    assert len(connections) == 1
+    assert _project_names(db) == ["Coat"]
+
+
+def test_unit_of_work_rolls_back_on_error(db):
+    with pytest.raises(RuntimeError):
+        with database.unit_of_work():
+            project_repository.create_project("Coat", "", None)
+            raise RuntimeError("boom")
+    assert _project_names(db) == []
+
+
+def test_unit_of_work_never_touches_the_pool_when_unused(db, monkeypatch):
+    monkeypatch.setattr(database, "_acquire", lambda: pytest.fail("connection borrowed"))
+    with database.unit_of_work():
+        pass
+
+
+@pytest.fixture
+def commits(db, monkeypatch):
+    """Count the COMMIT statements issued by every connection opened from here on."""
+    statements: list[str] = []
+    connect = database._connect
+
+    def traced_connect():
+        conn = connect()
+        conn.set_trace_callback(statements.append)
+        return conn
+
+    db.close_pool()
+    monkeypatch.setattr(database, "_connect", traced_connect)
+    return lambda: statements.count("COMMIT")
+
+
+def test_concurrent_writers_share_one_commit(db, commits, monkeypatch):
+    monkeypatch.setattr(database, "GROUP_COMMIT_MAX_WAIT_MS", 5000)
+
+    def write(name):
+        with database.unit_of_work():
+            project_repository.create_project(name, "", None)
+
+    with database.unit_of_work():
+        project_repository.create_project("P0", "", None)
+        threads = [threading.Thread(target=write, args=(f"P{i}",)) for i in range(1, 8)]
+        for thread in threads:
+            thread.start()
+        # Hold the writer until the other seven are queued behind it
+        while database._writer._writers < 8:
+            time.sleep(0.001)
+    for thread in threads:
+        thread.join()
+
+    assert sorted(_project_names(db)) == [f"P{i}" for i in range(8)]
+    assert commits() == 1
+
+
+def test_failed_writer_does_not_undo_its_batch(db, commits):
+    with database.unit_of_work():
+        project_repository.create_project("Kept", "", None)
+    with pytest.raises(RuntimeError):
+        with database.unit_of_work():
+            project_repository.create_project("Dropped", "", None)
+            raise RuntimeError("boom")
+    with database.unit_of_work():
+        project_repository.create_project("Also kept", "", None)
+
+    assert _project_names(db) == ["Kept", "Also kept"]
+    assert not database._writer._conn.in_transaction
+
+
+def test_request_commits_once_handler_returns(db):
+    res = client.post("/api/projects", json={"name": "Coat"})
+    assert res.status_code == 200
+    assert _project_names(db) == ["Coat"]
+    assert database.current_unit_of_work.get() is None
+
+
+def test_request_rolls_back_every_write_when_handler_fails(db):
+    failing_client = TestClient(app, raise_server_exceptions=False)
+    with patch("services.project_service.link_global_measurement_sets", side_effect=RuntimeError("boom")):
+        res = failing_client.post("/api/projects", json={"name": "Coat", "global_measurement_set_ids": [1]})
+    assert res.status_code == 500
+    assert _project_names(db) == []
+
+
+async def test_project_routes_do_not_wait_for_the_default_threadpool(db):
+    project = project_repository.create_project("Coat", "", None)
+    limiter = anyio.to_thread.current_default_thread_limiter()
+    tokens = limiter.total_tokens
+    limiter.total_tokens = 1
+    release = threading.Event()
+    try:
+        async with anyio.create_task_group() as tg:
+            # Hold the only default threadpool token for the whole request
+            tg.start_soon(anyio.to_thread.run_sync, release.wait)
+            try:
+                transport = httpx.ASGITransport(app=app)
+                async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+                    with anyio.fail_after(5):
+                        res = await http.patch(f"/api/projects/{project['id']}", json={"name": "Jacket", "description": ""})
+            finally:
+                release.set()
+        assert res.status_code == 200
+        assert _project_names(db) == ["Jacket"]
+    finally:
+        limiter.total_tokens = tokens
+
+
+async def test_blocking_route_can_commit_while_async_writers_wait(db):
+    project = project_repository.create_project("Coat", "", None)
+    writers = database.DB_CONCURRENCY + 1
+    blocking_app = FastAPI()
+
+    @blocking_app.post("/blocking", dependencies=[Depends(unit_of_work, scope="function")])
+    def blocking_write():
+        project_repository.create_project("Blocking", "", None)
+        # Hold the writer until async writers have taken every DB slot waiting for it
+        while database._writer._writers < 1 + database.DB_CONCURRENCY:
+            time.sleep(0.001)
+
+    transport = httpx.ASGITransport(app=app)
+    blocking_transport = httpx.ASGITransport(app=blocking_app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as http, \
+            httpx.AsyncClient(transport=blocking_transport, base_url="http://test") as blocking_http:
+        responses = []
+
+        async def send(request):
+            responses.append(await request)
+
+        with anyio.fail_after(10):
+            async with anyio.create_task_group() as tg:
+                tg.start_soon(send, blocking_http.post("/blocking"))
+                while not database._writer._writers:
+                    await anyio.sleep(0.001)
+                for i in range(writers):
+                    tg.start_soon(send, http.patch(f"/api/projects/{project['id']}", json={"name": f"P{i}", "description": ""}))
+                tg.start_soon(send, http.post("/api/measurements/", json={"name": "Mine"}))
+
+    assert sorted(res.status_code for res in responses) == [200] * (writers + 1) + [201]
+
+
+def test_batch_request_is_all_or_nothing(db):
+    project = project_repository.create_project("Coat", "", None)
+    operations = [
+        {"type": "add_material", "data": {"name": "Wool"}},
+        {"type": "edit_material", "id": 999, "data": {"name": "Gone"}},
+    ]
+    res = client.post(f"/api/projects/{project['id']}/batch", json={"operations": operations})
+    assert res.status_code == 404
+    assert project_repository.get_materials(project["id"]) == []
+
+    res = client.post(f"/api/projects/{project['id']}/batch", json={"operations": operations[:1]})
+    assert res.status_code == 200
+    assert [r["name"] for r in res.json()["results"]] == ["Wool"]
@@ -0,0 +1,63 @@
+import pytest
+from fastapi.testclient import TestClient
+
+import database
+from database import init_db
+from main import app
+from api import uploads
+from repositories import project_repository
+
+client = TestClient(app)
+
+PNG = ("front.png", b"\x89PNG not really", "image/png")
+
+
+@pytest.fixture
+def project_id(temp_db, tmp_path, monkeypatch):
+    init_db()
+    monkeypatch.setattr(uploads, "UPLOADS_DIR", str(tmp_path))
+    return project_repository.create_project("Coat", "", None)["id"]
+
+
+@pytest.fixture
+def stored(tmp_path, monkeypatch):
+    """Names of the files written, checking no database connection is open meanwhile."""
+    names = []
+    write = uploads._write
+
+    def checked_write(path, content):
+        uow = database.current_unit_of_work.get()
+        assert uow is None or uow._conn is None, "the upload was written while holding the database"
+        names.append(path)
+        write(path, content)
+
+    monkeypatch.setattr(uploads, "_write", checked_write)
+    return names
+
+
+@pytest.mark.parametrize("path", [
+    "progress-images", "checklist/1/upload-image", "materials/upload-image", "patterns/upload",
+])
+def test_upload_is_stored_before_the_database_is_touched(project_id, stored, tmp_path, path):
+    resp = client.post(f"/api/projects/{project_id}/{path}", files={"file": PNG})
+    assert resp.status_code in (200, 201)
+    assert len(stored) == 1
+    assert [p.name for p in tmp_path.iterdir() if p.suffix == ".png"] == [stored[0].rsplit("/", 1)[-1]]
+
+
+@pytest.mark.parametrize("path", [
+    "progress-images", "checklist/1/upload-image", "materials/upload-image", "patterns/upload",
+])
+def test_upload_to_missing_project_leaves_no_file(project_id, stored, tmp_path, path):
+    resp = client.post(f"/api/projects/{project_id + 1}/{path}", files={"file": PNG})
+    assert resp.status_code == 404
+    assert len(stored) == 1
+    assert not [p for p in tmp_path.iterdir() if p.suffix == ".png"]
+
+
+def test_upload_type_and_size_are_checked(project_id, stored, monkeypatch):
+    resp = client.post(f"/api/projects/{project_id}/progress-images", files={"file": ("a.exe", b"x")})
+    assert resp.status_code == 400
+    resp = client.post(f"/api/projects/{project_id}/materials/upload-image", files={"file": ("a.png", b"x" * (10 * 1024 * 1024 + 1))})
+    assert resp.status_code == 413
+    assert stored == []
@@ -0,0 +1,164 @@
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+import database
+from database import init_db
+from main import app
+from repositories import measurements_repository, project_repository
+from services import workspace_service
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def uploads(tmp_path, monkeypatch):
+    path = tmp_path / "uploads"
+    path.mkdir()
+    monkeypatch.setattr(workspace_service, "UPLOADS_DIR", str(path))
+    return path
+
+
+@pytest.fixture
+def workspace(temp_db, uploads):
+    init_db()
+    (uploads / "front.png").write_bytes(b"front view")
+    global_set = measurements_repository.add("Me", {"waist": 70.0})
+    coat = project_repository.create_project("Wool coat", "Silk lining", 250.0)["id"]
+    project_repository.update_project_status(coat, "in_progress")
+    for title in ("Cut", "Sew", "Press"):
+        project_repository.add_checklist_item(coat, title, "")
+    first = project_repository.get_checklist(coat)[0]
+    project_repository.update_checklist_item(first["id"], coat, "Cut", "", '["/uploads/front.png"]')
+    project_repository.toggle_checklist_item(first["id"], coat)
+    project_repository.add_material(coat, "Wool", "3m", "", image_url="/uploads/front.png", price=90.0)
+    project_repository.save_pattern(coat, "mood", "Coat", "https://example.com", None, "$20", price_paid=20.0)
+    project_repository.add_progress_image(coat, "/uploads/front.png")
+    project_repository.add_measurement_set(coat, "Fitting", {"waist": 71.0})
+    measurements_repository.link_to_project(coat, [global_set["id"]])
+    project_repository.create_project("Skirt", "", None)
+    return coat
+
+
+def _export(**params) -> list[dict]:
+    resp = client.get("/api/workspace/export", params=params)
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "application/x-ndjson"
+    return [json.loads(line) for line in resp.text.splitlines()]
+
+
+def _import(lines: list[dict]):
+    return client.post("/api/workspace/import", content="\n".join(json.dumps(line) for line in lines))
+
+
+def _comparable(detail: str) -> dict:
+    """A project aggregate without the ids an import renumbers."""
+    def strip(value):
+        if isinstance(value, dict):
+            return {k: strip(v) for k, v in value.items() if k not in {"id", "project_id"}}
+        if isinstance(value, list):
+            return [strip(v) for v in value]
+        return value
+    return strip(json.loads(detail))
+
+
+def _fresh_database(tmp_path, monkeypatch, name: str) -> None:
+    database.close_pool()
+    monkeypatch.setattr(database, "DB_PATH", str(tmp_path / name))
+    init_db()
+
+
+def test_export_streams_one_line_per_record(workspace):
+    lines = _export()
+    assert lines[0] == {"type": "header", "format": workspace_service.FORMAT, "version": workspace_service.VERSION}
+    assert [line["type"] for line in lines[1:]] == ["global_measurement_set", "file", "project", "project"]
+    # Each upload is written once, before the first project that uses it
+    assert lines[2]["url"] == "/uploads/front.png" and "data" in lines[2]
+    assert [item["title"] for item in lines[3]["checklist"]] == ["Cut", "Sew", "Press"]
+
+
+def test_round_trip_into_an_empty_workspace(workspace, tmp_path, monkeypatch, uploads):
+    before = [_comparable(project_repository.get_project_detail(pid)) for pid in (workspace, workspace + 1)]
+    totals = project_repository.get_project(workspace)["total_spent"]
+    lines = _export()
+
+    _fresh_database(tmp_path, monkeypatch, "restored.db")
+    (uploads / "front.png").unlink()
+    resp = _import(lines)
+    assert resp.status_code == 200
+    assert resp.json() == {"projects": 2, "global_measurement_sets": 1, "files": 1, "missing_files": 0}
+
+    after = [_comparable(project_repository.get_project_detail(pid)) for pid in (1, 2)]
+    stored = lines[2]["sha256"] + ".png"
+    assert (uploads / stored).read_bytes() == b"front view"
+    restored = json.loads(json.dumps(after).replace(stored, "front.png"))
+    assert restored == before
+    assert project_repository.get_project(1)["status"] == "in_progress"
+    assert project_repository.get_project(1)["total_spent"] == totals
+
+
+def test_export_without_files_links_uploads_by_hash(workspace):
+    lines = _export(files="false")
+    assert "data" not in lines[2]
+
+    resp = _import(lines)
+    assert resp.json()["missing_files"] == 0
+    imported = json.loads(project_repository.get_project_detail(workspace + 2))
+    assert imported["progress_images"][0]["url"] == "/uploads/front.png"
+
+
+def test_import_batches_and_keeps_links_across_batches(workspace, tmp_path, monkeypatch):
+    monkeypatch.setattr(workspace_service, "IMPORT_BATCH_ROWS", 2)
+    lines = _export()
+    _fresh_database(tmp_path, monkeypatch, "restored.db")
+    lines += [dict(lines[3], name=f"Copy {i}") for i in range(3)]
+
+    assert _import(lines).json()["projects"] == 5
+    details = [json.loads(project_repository.get_project_detail(pid)) for pid in range(1, 6)]
+    assert [d["name"] for d in details] == ["Wool coat", "Skirt", "Copy 0", "Copy 1", "Copy 2"]
+    assert all(len(d["checklist"]) == 3 for d in details if d["name"] != "Skirt")
+    assert [len(d["global_measurement_sets"]) for d in details] == [1, 0, 1, 1, 1]
+
+
+_HEADER = {"type": "header", "format": workspace_service.FORMAT, "version": workspace_service.VERSION}
+
+
+@pytest.mark.parametrize("body", [
+    [{"type": "project", "name": "No header"}],
+    [dict(_HEADER, format="other")],
+    [_HEADER, {"type": "project", "name": "Valid"}, {"type": "unknown"}],
+    [_HEADER, {"type": "project", "name": "Valid"}, {"type": "project", "name": None}],
+])
+def test_bad_import_is_rejected_without_side_effects(workspace, monkeypatch, body):
+    monkeypatch.setattr(workspace_service, "IMPORT_BATCH_ROWS", 1)  # flush before failing
+    resp = _import(body)
+    assert resp.status_code == 400
+    assert len(project_repository.get_projects_page(None)[0]) == 2
+
+
+def test_bad_upload_is_rejected(workspace):
+    lines = _export()
+    lines[2]["data"] = "bm90IHRoZSBmaWxl"
+    resp = _import(lines)
+    assert resp.status_code == 400
+    assert "sha256" in resp.json()["detail"]
+
+
+def test_uploads_are_stored_before_the_import_takes_the_writer(workspace, tmp_path, monkeypatch, uploads):
+    lines = _export()
+    _fresh_database(tmp_path, monkeypatch, "restored.db")
+    store_file = workspace_service._store_file
+
+    def checked_store_file(record, counts, created):
+        uow = database.current_unit_of_work.get()
+        assert uow is None or uow._conn is None, "the upload was stored while holding the database"
+        return store_file(record, counts, created)
+
+    monkeypatch.setattr(workspace_service, "_store_file", checked_store_file)
+    stored = uploads / (lines[2]["sha256"] + ".png")
+    # A failed import takes back the files it wrote
+    assert _import(lines + [{"type": "project", "name": None}]).status_code == 400
+    assert not stored.exists()
+    assert _import(lines).status_code == 200
+    assert stored.read_bytes() == b"front view"